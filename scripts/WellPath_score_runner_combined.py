@@ -2,6 +2,30 @@ import os
 import pandas as pd
 import numpy as np
 
+from survey_kernels import (
+    resolve_as_of_date,
+    load_screening_rules,
+    screening_windows,
+    aligned_profiles,
+    score_screening_dates_population,
+)
+
+# Screening recency is measured against one date for the whole run
+# (WELLPATH_AS_OF_DATE=YYYY-MM-DD pins it; defaults to today)
+AS_OF_DATE = resolve_as_of_date()
+
+# Fallback screening windows in months, for patients no compliance rule covers
+SCREEN_GUIDELINES = {
+    '10.01': 6,    # Dental exam: 6 months
+    '10.02': 12,   # Skin check: 12 months
+    '10.03': 12,   # Vision: 12 months
+    '10.04': 120,  # Colon: 120 months (10 years)
+    '10.05': 12,   # Mammogram: 12 months
+    '10.06': 36,   # PAP: 36 months
+    '10.07': 36,   # DEXA: 36 months
+    '10.08': 36,   # PSA: 36 months
+}
+
 def create_comprehensive_patient_file():
     """
     Complete combined scoring that creates a comprehensive patient file with:
@@ -69,6 +93,19 @@ def create_comprehensive_patient_file():
         print(f"❌ Unexpected error loading files: {e}")
         return None
     
+    # Score every screening date column once, with per-patient windows from the compliance rules
+    screening_rules_file = os.path.join(base_dir, "src", "ref_csv_files_airtable", "screening_compliance_rules.csv")
+    screening_ages, screening_sexes = aligned_profiles(raw_survey_df, raw_lab_df)
+    screening_scores_df = pd.DataFrame(
+        score_screening_dates_population(
+            raw_survey_df,
+            screening_windows(load_screening_rules(screening_rules_file), SCREEN_GUIDELINES, screening_ages, screening_sexes),
+            as_of=AS_OF_DATE,
+        ),
+        index=raw_survey_df['patient_id']
+    )
+    screening_scores_df = screening_scores_df[~screening_scores_df.index.duplicated()]
+
     # Find common patients across all datasets
     marker_patients = set(marker_detailed_df['patient_id'])
     survey_patients = set(survey_detailed_df['patient_id']) 
@@ -252,7 +289,10 @@ def create_comprehensive_patient_file():
                             patient_record[f"survey_{question_id}_{full_pillar_name}_improvement_potential"] = max_score - weighted_score
         
         # PROCESS COMPLEX SURVEY CALCULATIONS - INTEGRATED INTO PIPELINE
-        process_complex_survey_calculations(patient_record, survey_raw_row, pillar_names, pillar_weights)
+        process_complex_survey_calculations(
+            patient_record, survey_raw_row, pillar_names, pillar_weights,
+            screening_scores=screening_scores_df.loc[patient_id].to_dict()
+        )
         
         # === Calculate pillar totals, normalization, and per-item normalized impact ===
         # Get patient sex for gender-specific max calculations
@@ -452,7 +492,7 @@ def create_comprehensive_patient_file():
     
     return comprehensive_df, markers_df
 
-def process_complex_survey_calculations(patient_record, survey_raw_row, pillar_names, pillar_weights):
+def process_complex_survey_calculations(patient_record, survey_raw_row, pillar_names, pillar_weights, screening_scores):
     """Process ALL complex survey calculations using the exact logic from your source survey runner."""
     
     # Get patient demographics with safe defaults
@@ -739,41 +779,28 @@ def process_complex_survey_calculations(patient_record, survey_raw_row, pillar_n
             f"{prefix}_improvement_potential": max_weight - weighted_score
         })
 
-    # 10. SCREENING GUIDELINES (Questions 10.01-10.08) - Using your exact screen_guidelines logic
-    screen_guidelines = {
-        '10.01': 6,    # Dental exam: 6 months
-        '10.02': 12,   # Skin check: 12 months
-        '10.03': 12,   # Vision: 12 months
-        '10.04': 120,  # Colon: 120 months (10 years)
-        '10.05': 12,   # Mammogram: 12 months
-        '10.06': 36,   # PAP: 36 months
-        '10.07': 36,   # DEXA: 36 months
-        '10.08': 36,   # PSA: 36 months
-    }
-    
-    for question_id, window_months in screen_guidelines.items():
+    # 10. SCREENING GUIDELINES (Questions 10.01-10.08)
+    # screening_scores holds this patient's precomputed column-wise scores
+    for question_id in SCREEN_GUIDELINES:
         date_response = survey_raw_row.get(question_id, '')
         if date_response and str(date_response) not in ['', 'nan', 'No response']:
-            try:
-                raw_score = score_date_response_exact(date_response, window_months)
-                
-                # Apply to Core Care pillar
-                pillar = 'Core Care'
-                weight = 8.0 if question_id in ['10.04', '10.05'] else 5.0  # Higher weight for major screenings
-                weighted_score = raw_score * weight
-                max_weighted = weight
-                
-                prefix = f"survey_{question_id}_{pillar}"
-                patient_record.update({
-                    f"{prefix}_response": date_response,
-                    f"{prefix}_score": raw_score,
-                    f"{prefix}_weight": weight,
-                    f"{prefix}_weighted_score": weighted_score,
-                    f"{prefix}_max_weighted": max_weighted,
-                    f"{prefix}_improvement_potential": max_weighted - weighted_score
-                })
-            except:
-                pass
+            raw_score = screening_scores[question_id]
+            
+            # Apply to Core Care pillar
+            pillar = 'Core Care'
+            weight = 8.0 if question_id in ['10.04', '10.05'] else 5.0  # Higher weight for major screenings
+            weighted_score = raw_score * weight
+            max_weighted = weight
+            
+            prefix = f"survey_{question_id}_{pillar}"
+            patient_record.update({
+                f"{prefix}_response": date_response,
+                f"{prefix}_score": raw_score,
+                f"{prefix}_weight": weight,
+                f"{prefix}_weighted_score": weighted_score,
+                f"{prefix}_max_weighted": max_weighted,
+                f"{prefix}_improvement_potential": max_weighted - weighted_score
+            })
 
 # Exact implementations of your source functions with proper imports
 
@@ -1126,26 +1153,6 @@ def get_substance_score_exact(patient_answers):
     
     return substance_scores
 
-def score_date_response_exact(date_str, window_months):
-    """Your exact score_date_response logic."""
-    import pandas as pd
-    from datetime import datetime
-    
-    if not date_str or pd.isnull(date_str):
-        return 0
-    try:
-        exam_date = datetime.strptime(date_str, "%Y-%m-%d")
-    except Exception:
-        return 0
-    today = datetime.today()
-    months_ago = (today.year - exam_date.year) * 12 + (today.month - exam_date.month)
-    if months_ago <= window_months:
-        return 1.0
-    elif months_ago <= int(window_months * 1.5):
-        return 0.6
-    else:
-        return 0.2
-
 def calculate_education_score(patient_id, pillar):
     """Calculate education score for a given patient and pillar."""
     import random
@@ -0,0 +1,462 @@
+"""
+Vectorized survey scoring kernels.
+
+Population-wide versions of the survey runner's custom scorers. Answers are
+encoded once per survey (multi-select questions become option bitsets) and
+each kernel scores every patient at once with array operations, instead of
+re-parsing strings row by row.
+
+Each kernel reproduces the per-row scorer it replaces in
+wellpath_score_runner_survey_v2.py.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# --- Multi-select encoding ---
+
+def split_options(answer):
+    """Selected options of one pipe-delimited answer (missing answers select nothing)."""
+    if answer is None or (not isinstance(answer, str) and pd.isnull(answer)):
+        return []
+    return [x.strip() for x in str(answer).split("|") if x.strip()]
+
+
+def popcount64(bits):
+    """Number of set bits in each element of a uint64 array."""
+    bits = np.ascontiguousarray(bits, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(bits).astype(np.int64)
+    return np.unpackbits(bits.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1).astype(np.int64)
+
+
+class MultiSelectColumn:
+    """
+    One multi-select question encoded over a fixed option vocabulary.
+
+    Vocabularies of up to 64 options are stored as one uint64 bitset per
+    patient; larger ones fall back to a boolean (patients x options) matrix.
+    """
+
+    def __init__(self, vocabulary, selected, missing):
+        self.vocabulary = tuple(vocabulary)
+        self.index = {option: i for i, option in enumerate(self.vocabulary)}
+        self.missing = missing
+        if len(self.vocabulary) <= 64:
+            shifts = np.arange(len(self.vocabulary), dtype=np.uint64)
+            self.bits = np.bitwise_or.reduce(
+                selected.astype(np.uint64) << shifts, axis=1, initial=np.uint64(0)
+            ) if len(self.vocabulary) else np.zeros(len(selected), dtype=np.uint64)
+            self._matrix = None
+        else:
+            self.bits = None
+            self._matrix = selected
+
+    def __len__(self):
+        return len(self.missing)
+
+    @property
+    def matrix(self):
+        """Boolean (patients x options) selection matrix."""
+        if self._matrix is not None:
+            return self._matrix
+        shifts = np.arange(len(self.vocabulary), dtype=np.uint64)
+        return ((self.bits[:, None] >> shifts) & np.uint64(1)).astype(bool)
+
+    def counts(self):
+        """Number of options selected by each patient."""
+        if self.bits is not None:
+            return popcount64(self.bits)
+        return self._matrix.sum(axis=1)
+
+    def option_mask(self, predicate):
+        """Vocabulary positions whose option text satisfies predicate."""
+        return np.array([bool(predicate(option)) for option in self.vocabulary], dtype=bool)
+
+    def any_selected(self, positions):
+        """Whether each patient selected any of the given vocabulary positions."""
+        if self.bits is not None:
+            mask = np.uint64(0)
+            for i in np.flatnonzero(positions):
+                mask |= np.uint64(1) << np.uint64(i)
+            return (self.bits & mask) != 0
+        return self._matrix[:, positions].any(axis=1)
+
+    def selected(self, option):
+        """Whether each patient selected one specific option."""
+        if option not in self.index:
+            return np.zeros(len(self), dtype=bool)
+        positions = np.zeros(len(self.vocabulary), dtype=bool)
+        positions[self.index[option]] = True
+        return self.any_selected(positions)
+
+    def weighted_sum(self, weights, default=0.0):
+        """Sum of per-option weights over each patient's selections."""
+        vector = np.array([weights.get(option, default) for option in self.vocabulary], dtype=float)
+        return self.matrix @ vector if len(vector) else np.zeros(len(self))
+
+
+def encode_multi_select(answers, vocabulary=()):
+    """
+    Encode a column of pipe-delimited answers.
+
+    Args:
+        answers: Series of raw answers
+        vocabulary: Known options, kept first and in order; options seen in
+            the data but not listed are appended in first-seen order
+
+    Returns:
+        MultiSelectColumn aligned with answers
+    """
+    parsed = [split_options(answer) for answer in answers]
+    options = list(dict.fromkeys(vocabulary))
+    index = {option: i for i, option in enumerate(options)}
+    for selections in parsed:
+        for option in selections:
+            if option not in index:
+                index[option] = len(options)
+                options.append(option)
+
+    selected = np.zeros((len(parsed), len(options)), dtype=bool)
+    for row, selections in enumerate(parsed):
+        for option in selections:
+            selected[row, index[option]] = True
+    missing = np.asarray(pd.isnull(pd.Series(answers, dtype=object)), dtype=bool)
+    return MultiSelectColumn(options, selected, missing)
+
+
+def encode_survey(survey_df, vocabularies):
+    """Encode every multi-select question present in survey_df."""
+    return {
+        qid: encode_multi_select(survey_df[qid] if qid in survey_df else pd.Series([None] * len(survey_df)), vocabulary)
+        for qid, vocabulary in vocabularies.items()
+    }
+
+
+# --- Multi-select scorers ---
+
+def _stripped(survey_df, qid):
+    """Answers as str(answer).strip(), the way the row scorers read them."""
+    if qid not in survey_df:
+        return pd.Series([""] * len(survey_df), index=survey_df.index)
+    return survey_df[qid].astype(str).str.strip()
+
+
+def sleep_issue_full_credit(sleep_issues):
+    """Pillar totals awarded when no sleep issue is reported."""
+    pillar_totals = {}
+    for _, _, pillar_wts in sleep_issues:
+        for pillar, weight in pillar_wts.items():
+            pillar_totals[pillar] = pillar_totals.get(pillar, 0.0) + weight
+    return pillar_totals
+
+
+def score_sleep_issues_population(survey_df, issues_column, sleep_issues, freq_map):
+    """
+    Vectorized score_sleep_issues: pillar -> array of scores.
+
+    Reporting "None" (or nothing) earns full credit; otherwise each reported
+    issue is scaled by its frequency answer and unreported issues earn full credit.
+    """
+    full_credit = sleep_issue_full_credit(sleep_issues)
+    reports_none = issues_column.any_selected(issues_column.option_mask(lambda o: "none" in o.lower()))
+    full = reports_none | (issues_column.counts() == 0)
+
+    pillar_scores = {pillar: np.zeros(len(issues_column)) for pillar in full_credit}
+    for issue, freq_qid, pillar_wts in sleep_issues:
+        freq = _stripped(survey_df, freq_qid).map(freq_map).fillna(0.2).to_numpy(dtype=float)
+        mult = np.where(issues_column.selected(issue), freq, 1.0)
+        for pillar, weight in pillar_wts.items():
+            pillar_scores[pillar] += weight * mult
+
+    return {
+        pillar: np.where(full, full_credit[pillar], scores)
+        for pillar, scores in pillar_scores.items()
+    }
+
+
+def _count_score_table(thresholds, weight, max_count):
+    """Score for each selection count 0..max_count, rounded like the row scorers."""
+    table = []
+    for n in range(max_count + 1):
+        fraction = next(score for minimum, score in thresholds if n >= minimum)
+        table.append(round(fraction * weight, 2))
+    return np.array(table)
+
+
+# (minimum selections, fraction of weight), checked in order
+SLEEP_PROTOCOL_LEVELS = ((7, 1.0), (5, 0.8), (3, 0.6), (1, 0.4), (0, 0.2))
+COGNITIVE_ACTIVITY_LEVELS = ((5, 1.0), (4, 0.8), (3, 0.6), (2, 0.4), (1, 0.2), (0, 0.0))
+
+
+def score_sleep_protocols_population(protocols_column, weight=9.0):
+    """Vectorized score_sleep_protocols (4.07)."""
+    table = _count_score_table(SLEEP_PROTOCOL_LEVELS, weight, 7)
+    return table[np.minimum(protocols_column.counts(), 7)]
+
+
+def score_cognitive_activities_population(activities_column, weight=8.0):
+    """Vectorized score_cognitive_activities (5.08)."""
+    table = _count_score_table(COGNITIVE_ACTIVITY_LEVELS, weight, 5)
+    return table[np.minimum(activities_column.counts(), 5)]
+
+
+def coping_score_population(coping_column, coping_weights, stress_level, stress_freq):
+    """
+    Vectorized coping_score (6.07).
+
+    Args:
+        coping_column: Encoded 6.07 answers
+        coping_weights: Option -> weight (unlisted options weigh 0.5)
+        stress_level: 6.01 answers
+        stress_freq: 6.02 answers
+    """
+    has_none = coping_column.any_selected(coping_column.option_mask(lambda o: "none" in o.lower()))
+    total_weight = coping_column.weighted_sum(coping_weights, default=0.5)
+    # The row scorer reads a missing answer as the single response "nan"
+    total_weight = np.where(coping_column.missing, 0.5, total_weight)
+    no_coping = has_none | ((coping_column.counts() == 0) & ~coping_column.missing)
+
+    level = pd.Series(stress_level).astype(str).str.strip()
+    freq = pd.Series(stress_freq).astype(str).str.strip()
+    high_stress = (
+        level.isin(["High stress", "Extreme stress"]).to_numpy()
+        | freq.isin(["Frequently", "Always"]).to_numpy()
+    )
+
+    return np.where(
+        no_coping,
+        np.where(high_stress, 0.0, 5.5),
+        np.where(high_stress, np.minimum(total_weight * 3.5, 7.0), np.minimum(5.5 + total_weight, 7.0))
+    )
+
+
+# --- Screening dates ---
+
+AS_OF_DATE_ENV = "WELLPATH_AS_OF_DATE"
+
+# Survey question -> screening_type prefix in screening_compliance_rules.csv
+SCREENING_QUESTION_TYPES = {
+    "10.01": "dental",
+    "10.02": "skin_check",
+    "10.03": "vision_check",
+    "10.04": "colonoscopy",
+    "10.05": "mammogram",
+    "10.06": "cervical_pap",
+    "10.08": "psa",
+}
+
+
+def resolve_as_of_date(as_of=None):
+    """
+    Reference date screening recency is measured against.
+
+    Explicit as_of wins, then the WELLPATH_AS_OF_DATE environment variable
+    (YYYY-MM-DD), then today, so a whole pipeline run can be pinned to one date.
+    """
+    if as_of is None:
+        as_of = os.environ.get(AS_OF_DATE_ENV) or None
+    if as_of is None:
+        return pd.Timestamp.today().normalize()
+    return pd.Timestamp(as_of).normalize()
+
+
+def load_screening_rules(csv_path, risk_level="average"):
+    """Active rules of one risk level from screening_compliance_rules.csv."""
+    rules = pd.read_csv(csv_path, encoding="utf-8-sig", dtype=str).fillna("")
+    active = rules["is_active"].str.strip().str.lower() == "checked"
+    return rules[active & (rules["risk_level"].str.strip() == risk_level)].reset_index(drop=True)
+
+
+def _age_range_mask(age_range, ages):
+    """Which ages fall in an age_range token (all_adults, over_50, under_50, 21_to_65, ...)."""
+    if age_range.startswith("all"):
+        return np.ones(len(ages), dtype=bool)
+    if age_range.startswith("over_"):
+        return ages >= float(age_range[5:])
+    if age_range.startswith("under_"):
+        return ages < float(age_range[6:])
+    low, sep, high = age_range.partition("_to_")
+    if sep:
+        return (ages >= float(low)) & (ages <= float(high))
+    raise ValueError(f"Unknown age_range: {age_range}")
+
+
+def screening_windows(rules, default_windows, ages, sexes, question_types=SCREENING_QUESTION_TYPES):
+    """
+    Per-patient screening windows in months: qid -> int array.
+
+    Each question starts from its default window; rules whose screening_type
+    matches the question and whose age_range and gender cover the patient
+    replace it (later rows win). Patients no rule covers keep the default.
+    """
+    ages = np.asarray(pd.to_numeric(pd.Series(ages), errors="coerce"), dtype=float)
+    sex_initial = pd.Series(sexes).astype(str).str.strip().str.lower().str[:1].to_numpy()
+
+    windows = {}
+    for qid, default in default_windows.items():
+        window = np.full(len(ages), int(default), dtype=np.int64)
+        prefix = question_types.get(qid)
+        if prefix is not None:
+            for rule in rules.itertuples(index=False):
+                if not rule.screening_type.startswith(prefix + "_"):
+                    continue
+                applies = _age_range_mask(rule.age_range.strip(), ages)
+                gender = rule.gender.strip().lower()
+                if gender != "all":
+                    applies &= sex_initial == gender[:1]
+                window[applies] = int(rule.interval_months)
+        windows[qid] = window
+    return windows
+
+
+def aligned_profiles(survey_df, profile_df, default_sex="male"):
+    """(ages, sexes) arrays aligned with survey_df rows, first profile row per patient."""
+    columns = [c for c in ("patient_id", "age", "sex") if c in profile_df]
+    profiles = survey_df[["patient_id"]].merge(
+        profile_df[columns].drop_duplicates("patient_id"), on="patient_id", how="left"
+    )
+    ages = profiles["age"].to_numpy() if "age" in profiles else np.full(len(profiles), np.nan)
+    sexes = profiles["sex"].fillna(default_sex).to_numpy() if "sex" in profiles else np.full(len(profiles), default_sex)
+    return ages, sexes
+
+
+def score_screening_dates_population(survey_df, windows, as_of=None):
+    """
+    Vectorized score_date_response: qid -> array of scores.
+
+    Each date column is parsed once (YYYY-MM-DD; anything else scores 0) and
+    compared with as_of in whole calendar months: within the window scores
+    1.0, within 1.5x the window 0.6, older 0.2.
+
+    Args:
+        survey_df: Raw survey answers
+        windows: qid -> window in months (scalar or per-patient array)
+        as_of: Reference date (see resolve_as_of_date)
+    """
+    as_of = resolve_as_of_date(as_of)
+    scores = {}
+    for qid, window in windows.items():
+        if qid in survey_df:
+            answers = survey_df[qid].astype(str)
+        else:
+            answers = pd.Series([""] * len(survey_df), index=survey_df.index)
+        dates = pd.to_datetime(answers, format="%Y-%m-%d", errors="coerce")
+        valid = dates.notna().to_numpy()
+        years = dates.dt.year.fillna(0).to_numpy(dtype=np.int64)
+        months = dates.dt.month.fillna(0).to_numpy(dtype=np.int64)
+        months_ago = (as_of.year - years) * 12 + (as_of.month - months)
+
+        window = np.broadcast_to(np.asarray(window, dtype=np.int64), months_ago.shape)
+        scores[qid] = np.select(
+            [~valid, months_ago <= window, months_ago <= window * 3 // 2],
+            [0.0, 1.0, 0.6],
+            default=0.2
+        )
+    return scores
+
+
+# --- Categorical lookups ---
+
+def lookup_scores(answers, score_map, default=0.0):
+    """
+    Score each answer by exact lookup in score_map.
+
+    Answers are mapped to categorical codes once (unknown and missing answers
+    get code -1) and scores gathered from a small table whose last slot holds
+    the default, so -1 lands on it.
+    """
+    codes = pd.Index(list(score_map), dtype=object).get_indexer(pd.Series(answers, dtype=object))
+    table = np.array(list(score_map.values()) + [default], dtype=float)
+    return table[codes]
+
+
+def _answers(survey_df, qid):
+    """Raw answers for qid, or an all-missing column if it was not asked."""
+    if qid in survey_df:
+        return survey_df[qid]
+    return pd.Series([None] * len(survey_df), index=survey_df.index, dtype=object)
+
+
+# --- Movement ---
+
+def score_movement_population(survey_df, movement_questions, freq_scores, dur_scores):
+    """
+    Vectorized score_movement_pillar: (move_type, pillar) -> array of scores.
+
+    Frequency plus duration of 1.6 or more earns the full weight, anything
+    else earns (freq + dur) * weight / 2; no answer to either earns 0.
+    """
+    movement_scores = {}
+    for move_type, cfg in movement_questions.items():
+        total = (
+            lookup_scores(_answers(survey_df, cfg["freq_q"]), freq_scores)
+            + lookup_scores(_answers(survey_df, cfg["dur_q"]), dur_scores)
+        )
+        for pillar, weight in cfg["pillar_weights"].items():
+            movement_scores[(move_type, pillar)] = np.where(
+                total >= 1.6, float(weight), total * (weight / 2)
+            )
+    return movement_scores
+
+
+# --- Substance use ---
+
+# usage_trend answer -> adjustment for current users
+USAGE_TREND_ADJUSTMENTS = {
+    "I currently use more than I used to": -0.1,
+    "I currently use less than I used to": 0.1,
+}
+
+
+def score_substances_population(survey_df, current_column, former_column, substance_questions,
+                                substance_weights, use_band_scores, duration_scores,
+                                quit_time_bonus, default_quit_bonus=0.15):
+    """
+    Vectorized get_substance_score: substance -> array of weighted scores.
+
+    A substance selected in 8.01 is scored as current use (band and duration,
+    adjusted by usage trend), one selected only in 8.20 as former use (plus a
+    bonus by time since quit) and one never selected scores 1.0.
+
+    Args:
+        survey_df: Raw survey answers
+        current_column: Encoded 8.01 answers
+        former_column: Encoded 8.20 answers
+        substance_questions: Substance -> question ids and option text
+        substance_weights: Substance -> weight
+        use_band_scores, duration_scores, quit_time_bonus: Answer score tables
+        default_quit_bonus: Bonus when time since quit is missing or unknown
+    """
+    def base_score(band_qid, years_qid):
+        # A missing band reads as "Heavy"; otherwise the level before any ":"
+        bands = _answers(survey_df, band_qid)
+        levels = bands.astype(str).str.split(":").str[0].str.strip().where(
+            bands.notna() & (bands.astype(str) != ""), "Heavy"
+        )
+        return np.minimum(
+            lookup_scores(levels, use_band_scores),
+            lookup_scores(_answers(survey_df, years_qid), duration_scores)
+        )
+
+    substance_scores = {}
+    for sub, qmap in substance_questions.items():
+        is_current = current_column.selected(qmap["current_in_which"])
+        is_former = ~is_current & former_column.selected(qmap["former_in_which"])
+
+        current = np.clip(
+            base_score(qmap["current_band"], qmap["current_years"])
+            + lookup_scores(_answers(survey_df, qmap["current_trend"]), USAGE_TREND_ADJUSTMENTS),
+            0.0, 1.0
+        )
+        former = np.minimum(
+            base_score(qmap["former_band"], qmap["former_years"])
+            + lookup_scores(_answers(survey_df, qmap["time_since_quit"]), quit_time_bonus, default_quit_bonus),
+            1.0
+        )
+        score = np.select([is_current, is_former], [current, former], default=1.0)
+        substance_scores[sub] = score * substance_weights[sub]
+    return substance_scores
@@ -1,6 +1,20 @@
 import os
 import pandas as pd
-from datetime import datetime
+
+from survey_kernels import (
+    encode_survey,
+    score_sleep_issues_population,
+    score_sleep_protocols_population,
+    score_cognitive_activities_population,
+    coping_score_population,
+    resolve_as_of_date,
+    load_screening_rules,
+    screening_windows,
+    aligned_profiles,
+    score_screening_dates_population,
+    score_movement_population,
+    score_substances_population,
+)
 
 # --- Load Data ---
 base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -112,25 +126,6 @@ movement_questions = {
     }
 }
 
-def score_movement_pillar(row, movement_questions):
-    movement_scores = {}
-    for move_type, cfg in movement_questions.items():
-        freq_ans = row.get(cfg["freq_q"], "")
-        dur_ans = row.get(cfg["dur_q"], "")
-        freq = FREQ_SCORES.get(freq_ans, 0.0)
-        dur = DUR_SCORES.get(dur_ans, 0.0)
-        # Each pillar_weights is a dict, e.g. {"Movement": 16}
-        for pillar, weight in cfg["pillar_weights"].items():
-            if freq == 0 and dur == 0:
-                movement_scores[(move_type, pillar)] = 0
-            else:
-                total = freq + dur
-                if total >= 1.6:
-                    movement_scores[(move_type, pillar)] = weight
-                else:
-                    movement_scores[(move_type, pillar)] = total * (weight / 2)
-    return movement_scores
-
 # --- Sleep Issue Config with Pillar Weights (modular for multi-pillar mapping) ---
 SLEEP_ISSUES = [
     # (issue_text, frequency_qid, {"Sleep": weight, ...})
@@ -151,66 +146,6 @@ SLEEP_FREQ_MAP = {
     "": 1.0,  # Not selected/frequency – full credit
 }
 
-def score_sleep_issues(patient_answers):
-    # patient_answers is a dict-like row from patient_survey
-    sleep_issues_reported = [x.strip() for x in str(patient_answers.get("4.12", "")).split("|") if x.strip()]
-    # Full credit if none reported or "None" selected
-    if not sleep_issues_reported or any("none" in s.lower() for s in sleep_issues_reported):
-        # Return a dict by pillar with full credit
-        pillar_totals = {}
-        for _, _, pillar_wts in SLEEP_ISSUES:
-            for p, w in pillar_wts.items():
-                pillar_totals[p] = pillar_totals.get(p, 0.0) + w
-        return pillar_totals
-
-    # Otherwise, score each reported issue
-    pillar_scores = {}
-    for issue, freq_qid, pillar_wts in SLEEP_ISSUES:
-        if issue in sleep_issues_reported:
-            freq_ans = str(patient_answers.get(freq_qid, "")).strip()
-            mult = SLEEP_FREQ_MAP.get(freq_ans, 0.2)
-        else:
-            mult = 1.0  # Not selected = full credit
-        for p, w in pillar_wts.items():
-            pillar_scores[p] = pillar_scores.get(p, 0.0) + (w * mult)
-    return pillar_scores
-
-# --- Sleep Hygiene Protocols (4.07) ---
-def score_sleep_protocols(answer_str):
-    WEIGHT = 9.0  # Assign to pillar(s) below in config
-    protocols = [x.strip() for x in (answer_str or "").split("|") if x.strip()]
-    n = len(protocols)
-    if n >= 7:
-        score = 1.0
-    elif n >= 5:
-        score = 0.8
-    elif n >= 3:
-        score = 0.6
-    elif n >= 1:
-        score = 0.4
-    else:
-        score = 0.2
-    return round(score * WEIGHT, 2)
-
-# --- Cognitive activity count (5.08) ---
-def score_cognitive_activities(answer_str):
-    WEIGHT = 8.0
-    activities = [x.strip() for x in (answer_str or "").split("|") if x.strip()]
-    n = len(activities)
-    if n >= 5:
-        score = 1.0
-    elif n == 4:
-        score = 0.8
-    elif n == 3:
-        score = 0.6
-    elif n == 2:
-        score = 0.4
-    elif n == 1:
-        score = 0.2
-    else:
-        score = 0.0
-    return round(score * WEIGHT, 2)
-
 # --- 6.01 / 6.02 Stress score ---
 def stress_score(stress_level_ans, freq_ans):
     level_map = {
@@ -248,25 +183,6 @@ COPING_WEIGHTS_6_07 = {
     "None": 0.0,
 }
 
-def coping_score(answer_str, coping_weights, stress_level_ans, freq_ans):
-    responses = [r.strip() for r in str(answer_str or "").split("|") if r.strip()]
-    has_none = any("none" in r.lower() for r in responses)
-    high_stress = (str(stress_level_ans).strip() in ["High stress", "Extreme stress"] or
-                   str(freq_ans).strip() in ["Frequently", "Always"])
-    
-    if has_none or not responses:
-        return 0.0 if high_stress else 5.5  # No coping strategies
-    
-    # Calculate weighted score
-    total_weight = sum(coping_weights.get(response, 0.5) for response in responses)
-    weighted_score = min(total_weight * 3.5, 7.0)
-    
-    # Adjust scoring based on stress level
-    if not high_stress:
-        return min(5.5 + total_weight, 7.0)  # Low stress: base 5.5 + bonus for coping
-    else:
-        return weighted_score  # High-stress people need good coping
-
 # --- Custom logic for Substances ---
 
 USE_BAND_SCORES = {
@@ -367,55 +283,7 @@ SUBSTANCE_QUESTIONS = {
     }
 }
 
-# UPDATED: Enhanced substance scoring with time since quit
-def score_substance_use(use_band, years_band, is_current, usage_trend=None, time_since_quit=None):
-    band_level = use_band.split(":")[0].strip() if use_band else "Heavy"
-    band_score = USE_BAND_SCORES.get(band_level, 0.0)
-    duration_score = DURATION_SCORES.get(years_band, 0.0)
-    base_score = min(band_score, duration_score)
-    
-    if not is_current:
-        # NEW: Use graduated quit bonus based on time since quit
-        if time_since_quit:
-            quit_bonus = QUIT_TIME_BONUS.get(time_since_quit, 0.15)  # Default to old bonus if not found
-        else:
-            quit_bonus = 0.15  # Fallback to old bonus if no time data
-        base_score = min(base_score + quit_bonus, 1.0)
-    
-    if is_current and usage_trend:
-        if usage_trend == "I currently use more than I used to":
-            base_score = max(base_score - 0.1, 0.0)  # Penalty for increasing use
-        elif usage_trend == "I currently use less than I used to":
-            base_score = min(base_score + 0.1, 1.0)  # Adjustment for past heavier use
-    
-    return base_score
-
-# UPDATED: Get substance score with time since quit logic
-def get_substance_score(patient_answers):
-    substance_scores = {}
-    for sub, qmap in SUBSTANCE_QUESTIONS.items():
-        current_list = [x.strip() for x in str(patient_answers.get('8.01', '')).split('|')]
-        former_list = [x.strip() for x in str(patient_answers.get('8.20', '')).split('|')]
-        is_current = qmap['current_in_which'] in current_list
-        is_former = (not is_current) and (qmap['former_in_which'] in former_list)
-        score = 1.0  # default (never used = perfect)
-        
-        if is_current:
-            use_band = patient_answers.get(qmap['current_band'], "")
-            years_band = patient_answers.get(qmap['current_years'], "")
-            usage_trend = patient_answers.get(qmap['current_trend'], "")
-            score = score_substance_use(use_band, years_band, True, usage_trend)
-        elif is_former:
-            use_band = patient_answers.get(qmap['former_band'], "")
-            years_band = patient_answers.get(qmap['former_years'], "")
-            time_since_quit = patient_answers.get(qmap['time_since_quit'], "")  # NEW
-            score = score_substance_use(use_band, years_band, False, time_since_quit=time_since_quit)
-        
-        weighted = score * SUBSTANCE_WEIGHTS[sub]
-        substance_scores[sub] = weighted
-    return substance_scores
-
-# --- Screening Guidelines and Date Scoring Logic ---
+# --- Screening Guidelines: default windows, scored with the compliance rules below ---
 screen_guidelines = {
     '10.01': 6,    # Dental exam: 6 months
     '10.02': 12,   # Skin check: 12 months
@@ -427,21 +295,10 @@ screen_guidelines = {
     '10.08': 36,   # PSA: 36 months
 }
 
-def score_date_response(date_str, window_months):
-    if not date_str or pd.isnull(date_str):
-        return 0
-    try:
-        exam_date = datetime.strptime(date_str, "%Y-%m-%d")
-    except Exception:
-        return 0
-    today = datetime.today()
-    months_ago = (today.year - exam_date.year) * 12 + (today.month - exam_date.month)
-    if months_ago <= window_months:
-        return 1.0
-    elif months_ago <= int(window_months * 1.5):
-        return 0.6
-    else:
-        return 0.2
+# Screening recency is measured against one date for the whole run
+# (WELLPATH_AS_OF_DATE=YYYY-MM-DD pins it; defaults to today)
+AS_OF_DATE = resolve_as_of_date()
+SCREENING_RULES_FILE = os.path.join(base_dir, "src", "ref_csv_files_airtable", "screening_compliance_rules.csv")
 
 # --- Pillars ---
 PILLARS = [
@@ -452,6 +309,7 @@ PILLARS = [
 # --- Centralized Question Map ---
 # For each QID: define (score_map OR scoring_fn, pillar_weight_dict)
 # If scoring_fn, it must accept the answer and return a score
+# population_scored QIDs are scored for every patient at once (population_scores below)
 
 QUESTION_CONFIG = {
     # --- Overview (Section 1) ---
@@ -1485,7 +1343,7 @@ QUESTION_CONFIG = {
     "5.08": {
     "question": "...",
     "pillar_weights": {"Cognitive": 8},
-    "score_fn": lambda answer, *a, **k: score_cognitive_activities(answer),
+    "population_scored": True,
     "multi_select": True,
     },
     "5.09": {
@@ -1553,8 +1411,7 @@ QUESTION_CONFIG = {
     "6.07": {
         "question": "What methods do you currently use to manage your stress?",
         "pillar_weights": {"Stress": 7},
-        "score_fn": lambda ans, _, __, row=None: coping_score(
-            ans, COPING_WEIGHTS_6_07, row.get("6.01", ""), row.get("6.02", "")),
+        "population_scored": True,
         "multi_select": True,
     },
     "6.08": {
@@ -2413,49 +2270,49 @@ QUESTION_CONFIG = {
     "10.01": {
         "question": "Please indicate when you last had a routine dental exam",
         "pillar_weights": {"CoreCare": 8},
-        "score_fn": lambda x, *_: score_date_response(x, screen_guidelines['10.01']),
+        "population_scored": True,
         "multi_select": False,
     },
     "10.02": {
         "question": "Please indicate when you last had a routine skin check",
         "pillar_weights": {"CoreCare": 7},
-        "score_fn": lambda x, *_: score_date_response(x, screen_guidelines['10.02']),
+        "population_scored": True,
         "multi_select": False,
     },
     "10.03": {
         "question": "Please indicate when you last had a routine vision check",
         "pillar_weights": {"CoreCare": 5},
-        "score_fn": lambda x, *_: score_date_response(x, screen_guidelines['10.03']),
+        "population_scored": True,
         "multi_select": False,
     },
     "10.04": {
         "question": "Please indicate when you last had a colon cancer screening",
         "pillar_weights": {"CoreCare": 10},
-        "score_fn": lambda x, *_: score_date_response(x, screen_guidelines['10.04']),
+        "population_scored": True,
         "multi_select": False,
     },
     "10.05": {
         "question": "Please indicate when you last had a mammogram",
         "pillar_weights": {"CoreCare": 10},
-        "score_fn": lambda x, *_: score_date_response(x, screen_guidelines['10.05']),
+        "population_scored": True,
         "multi_select": False,
     },
     "10.06": {
         "question": "Please indicate when you last had a PAP smear",
         "pillar_weights": {"CoreCare": 10},
-        "score_fn": lambda x, *_: score_date_response(x, screen_guidelines['10.06']),
+        "population_scored": True,
         "multi_select": False,
     },
     "10.07": {
         "question": "Please indicate when you last had a DEXA scan",
         "pillar_weights": {"CoreCare": 0},
-        "score_fn": lambda x, *_: score_date_response(x, screen_guidelines['10.07']),
+        "population_scored": True,
         "multi_select": False,
     },
     "10.08": {
         "question": "Please indicate when you last had a PSA screening",
         "pillar_weights": {"CoreCare": 10},
-        "score_fn": lambda x, *_: score_date_response(x, screen_guidelines['10.08']),
+        "population_scored": True,
         "multi_select": False,
     },
     "10.09": {
@@ -2739,8 +2596,51 @@ pillar_map = {
 base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 survey_output_dir = os.path.join(base_dir, "WellPath_Score_Survey")
 
+# --- Multi-select questions: encode once, score the whole population ---
+MULTI_SELECT_VOCABULARIES = {
+    "4.07": (),
+    "4.12": tuple(issue for issue, _, _ in SLEEP_ISSUES),
+    "5.08": (),
+    "6.07": tuple(COPING_WEIGHTS_6_07),
+    "8.01": tuple(q["current_in_which"] for q in SUBSTANCE_QUESTIONS.values()),
+    "8.20": tuple(q["former_in_which"] for q in SUBSTANCE_QUESTIONS.values()),
+}
+multi_select = encode_survey(patient_survey, MULTI_SELECT_VOCABULARIES)
+
+sleep_issues_by_pillar = score_sleep_issues_population(
+    patient_survey, multi_select["4.12"], SLEEP_ISSUES, SLEEP_FREQ_MAP
+)
+population_scores = {
+    "4.07": score_sleep_protocols_population(multi_select["4.07"]),
+    "5.08": score_cognitive_activities_population(multi_select["5.08"]),
+    "6.07": coping_score_population(
+        multi_select["6.07"], COPING_WEIGHTS_6_07,
+        patient_survey.get("6.01", pd.Series([""] * len(patient_survey))),
+        patient_survey.get("6.02", pd.Series([""] * len(patient_survey))),
+    ),
+}
+# --- Screening dates: windows from the compliance rules, scored column-wise ---
+screening_ages, screening_sexes = aligned_profiles(patient_survey, biomarker_df)
+population_scores.update(score_screening_dates_population(
+    patient_survey,
+    screening_windows(load_screening_rules(SCREENING_RULES_FILE), screen_guidelines, screening_ages, screening_sexes),
+    as_of=AS_OF_DATE,
+))
+# --- Movement and substance use: answer columns to lookup tables, whole population at once ---
+movement_scores_population = score_movement_population(
+    patient_survey, movement_questions, FREQ_SCORES, DUR_SCORES
+)
+substance_scores_population = score_substances_population(
+    patient_survey, multi_select["8.01"], multi_select["8.20"], SUBSTANCE_QUESTIONS,
+    SUBSTANCE_WEIGHTS, USE_BAND_SCORES, DURATION_SCORES, QUIT_TIME_BONUS
+)
+max_sleep_issues_by_pillar = {
+    pillar: sum(pillar_wts.get(pillar, 0) for _, _, pillar_wts in SLEEP_ISSUES)
+    for pillar in sleep_issues_by_pillar
+}
+
 all_scores = []
-for idx, row in patient_survey.iterrows():
+for pos, (idx, row) in enumerate(patient_survey.iterrows()):
     patient_id = row['patient_id']
     profile = biomarker_df[biomarker_df['patient_id'] == patient_id].iloc[0]
     weight_lb = profile['weight_lb']
@@ -2756,15 +2656,15 @@ for idx, row in patient_survey.iterrows():
         max_possible_score = 0
         if "response_scores" in config and config["response_scores"]:
             max_possible_score = max(config["response_scores"].values())
-        elif "score_fn" in config:
+        elif "score_fn" in config or config.get("population_scored"):
             max_possible_score = 10  # assume max raw for custom scoring fn
         
         # Scale max score same way as actual score
         max_score_scaled = max_possible_score / 10 if max_possible_score > 1 else max_possible_score
         
-        # Custom date screening logic
-        if qid in screen_guidelines:
-            score = score_date_response(answer, screen_guidelines[qid])
+        # Multi-select and screening-date questions scored for the whole population up front
+        if qid in population_scores:
+            score = population_scores[qid][pos]
         # Custom scoring functions
         elif "score_fn" in config:
             fn_args = inspect.signature(config["score_fn"]).parameters
@@ -2787,8 +2687,8 @@ for idx, row in patient_survey.iterrows():
                 patient_result[f"{qid}_{pillar}_max"] = max_score_scaled * wt
 
     # Movement scoring (custom logic)
-    move_scores = score_movement_pillar(row, movement_questions)
-    for (move_type, pillar), score in move_scores.items():
+    for (move_type, pillar), scores in movement_scores_population.items():
+        score = scores[pos]
         if score:
             patient_result[f"{move_type}_{pillar}_weighted"] = score
             patient_result[f"{move_type}_{pillar}_raw"] = score
@@ -2796,24 +2696,22 @@ for idx, row in patient_survey.iterrows():
             patient_result[f"{move_type}_{pillar}_max"] = movement_questions[move_type]["pillar_weights"][pillar]
 
     # Sleep issues scoring
-    sleep_issues_scores = score_sleep_issues(row)
-    for pillar, score in sleep_issues_scores.items():
-        patient_result[f"4.12_{pillar}_weighted"] = score
-        patient_result[f"4.12_{pillar}_raw"] = score
+    for pillar, scores in sleep_issues_by_pillar.items():
+        patient_result[f"4.12_{pillar}_weighted"] = scores[pos]
+        patient_result[f"4.12_{pillar}_raw"] = scores[pos]
         # Max for sleep issues is the sum of all weights for that pillar
-        max_sleep_issues_for_pillar = sum(pillar_wts.get(pillar, 0) for _, _, pillar_wts in SLEEP_ISSUES)
-        patient_result[f"4.12_{pillar}_max"] = max_sleep_issues_for_pillar
+        patient_result[f"4.12_{pillar}_max"] = max_sleep_issues_by_pillar[pillar]
 
     # Sleep hygiene protocols scoring
-    sleep_proto_score = score_sleep_protocols(row.get("4.07", ""))
+    sleep_proto_score = population_scores["4.07"][pos]
     if sleep_proto_score:
         patient_result["4.07_Sleep_weighted"] = sleep_proto_score
         patient_result["4.07_Sleep_raw"] = sleep_proto_score
         patient_result["4.07_Sleep_max"] = 9.0  # Max weight for sleep hygiene
 
     # Substance use scoring
-    sub_scores = get_substance_score(row)
-    for sub, weighted_score in sub_scores.items():
+    for sub, scores in substance_scores_population.items():
+        weighted_score = scores[pos]
         patient_result[f"{sub}_CoreCare_weighted"] = weighted_score
         patient_result[f"{sub}_CoreCare_raw"] = weighted_score
         # Max for substances is the full weight (since scoring returns weighted values)
@@ -2916,7 +2814,7 @@ for qid, config in QUESTION_CONFIG.items():
         max_resp = 0
         if "response_scores" in config and config["response_scores"]:
             max_resp = max(config["response_scores"].values())
-        elif "score_fn" in config:
+        elif "score_fn" in config or config.get("population_scored"):
             max_resp = 10  # assume max raw for custom scoring fn
         # scale max_resp same way as score_scaled above
         max_resp_scaled = max_resp / 10 if max_resp > 1 else max_resp
@@ -2943,21 +2841,9 @@ max_scores_per_pillar["Sleep"] += 9.0
 # Add Substance weights to CoreCare
 max_scores_per_pillar["CoreCare"] += sum(SUBSTANCE_WEIGHTS.values())
 
-# Add substance scores to individual substance columns
-for idx, row_data in df_debug.iterrows():
-    patient_id = row_data['patient_id']
-    
-    # Find the original patient survey row
-    orig_row = patient_survey[patient_survey['patient_id'] == patient_id]
-    if not orig_row.empty:
-        orig_row = orig_row.iloc[0]
-        
-        # Calculate substance scores for this patient
-        sub_scores = get_substance_score(orig_row)
-        
-        # Populate the substance columns
-        for sub, weighted_score in sub_scores.items():
-            df_debug.at[idx, f"Substance: {sub}"] = weighted_score
+# Add substance scores to individual substance columns (df_debug rows follow patient_survey order)
+for sub, scores in substance_scores_population.items():
+    df_debug[f"Substance: {sub}"] = scores
             
 # Add max and percentage columns
 for pillar in PILLARS:
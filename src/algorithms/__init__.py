@@ -7,6 +7,8 @@ Provides implementations for various scoring algorithms:
 - Proportional Frequency Hybrid: Daily proportional with frequency-based weekly scoring
 - Zone-Based: Score based on which zone value falls into
 - Composite Weighted: Weighted average of multiple components
+- Rolling Window: Scores every N-day window of a long daily history
+- Kernels: Vectorized daily, progressive and weekly scoring compiled from configs
 """
 
 from .binary_threshold import (
@@ -37,6 +39,7 @@ from .composite_weighted import (
     CompositeWeightedAlgorithm,
     CompositeWeightedConfig,
     Component,
+    compile_component,
     create_daily_composite,
     create_frequency_composite,
     create_sleep_quality_composite
@@ -45,7 +48,13 @@ from .composite_weighted import (
 from .constrained_weekly_allowance import (
     ConstrainedWeeklyAllowanceAlgorithm,
     ConstrainedWeeklyAllowanceConfig,
-    create_weekly_allowance
+    create_weekly_allowance,
+    evaluate_weekly_allowances
+)
+
+from .weekly_history import (
+    WeeklyHistoryStore,
+    WeekRecord
 )
 
 from .categorical_filter_threshold import (
@@ -76,6 +85,25 @@ from .proportional_frequency_hybrid import (
     create_proportional_frequency_hybrid
 )
 
+from .rolling_window import (
+    calculate_rolling_minimum_frequency_scores,
+    calculate_rolling_elimination_scores,
+    calculate_rolling_limit_scores,
+    calculate_rolling_hybrid_scores,
+    calculate_progressive_scores_by_period
+)
+
+from .kernels import (
+    AdherenceKernel,
+    KernelScores,
+    SumLimitKernel
+)
+
+from .config_compiler import (
+    build_algorithm,
+    compile_kernel
+)
+
 from .binary_threshold import (
     EvaluationPeriod,
     SuccessCriteria,
@@ -108,6 +136,7 @@ __all__ = [
     "CompositeWeightedAlgorithm",
     "CompositeWeightedConfig",
     "Component",
+    "compile_component",
     "create_daily_composite",
     "create_frequency_composite",
     "create_sleep_quality_composite",
@@ -116,6 +145,9 @@ __all__ = [
     "ConstrainedWeeklyAllowanceAlgorithm",
     "ConstrainedWeeklyAllowanceConfig",
     "create_weekly_allowance",
+    "evaluate_weekly_allowances",
+    "WeeklyHistoryStore",
+    "WeekRecord",
     
     # Categorical Filter Threshold
     "CategoricalFilterThresholdAlgorithm",
@@ -144,5 +176,19 @@ __all__ = [
     # Proportional Frequency Hybrid
     "ProportionalFrequencyHybridAlgorithm",
     "ProportionalFrequencyHybridConfig",
-    "create_proportional_frequency_hybrid"
+    "create_proportional_frequency_hybrid",
+    
+    # Rolling Window
+    "calculate_rolling_minimum_frequency_scores",
+    "calculate_rolling_elimination_scores",
+    "calculate_rolling_limit_scores",
+    "calculate_rolling_hybrid_scores",
+    "calculate_progressive_scores_by_period",
+    
+    # Kernels
+    "AdherenceKernel",
+    "KernelScores",
+    "SumLimitKernel",
+    "build_algorithm",
+    "compile_kernel"
 ]
\ No newline at end of file
@@ -9,6 +9,8 @@ from typing import Dict, Any, Union, List
 from dataclasses import dataclass
 from enum import Enum
 
+from .kernels import BinaryThresholdKernel
+
 
 class ComparisonOperator(Enum):
     GTE = ">="
@@ -59,6 +61,14 @@ class BinaryThresholdAlgorithm:
     
     def __init__(self, config: BinaryThresholdConfig):
         self.config = config
+        self.compile_kernel()
+    
+    def compile_kernel(self):
+        """Compile the vectorized scoring kernel for the current config."""
+        config = self.config
+        self.kernel = BinaryThresholdKernel(
+            config.threshold, config.success_value, config.failure_value, config.comparison_operator
+        )
     
     def calculate_score(self, actual_value: Union[float, int, bool]) -> float:
         """
@@ -120,15 +130,9 @@ class BinaryThresholdAlgorithm:
         Returns:
             List of progressive scores (what user sees each day)
         """
-        progressive_scores = []
-        
         # For daily goals, always show that day's actual performance
         # Progressive scoring = that day's binary result (100% or 0%)
-        for value in daily_values:
-            score = self.calculate_score(value)
-            progressive_scores.append(score)
-        
-        return progressive_scores
+        return self.kernel.progressive(daily_values)[0].tolist()
     
     def get_formula(self) -> str:
         """Return the algorithm formula as a string."""
@@ -3,12 +3,19 @@ Categorical Filter Threshold Algorithm
 
 Applies filtering based on categorical criteria before threshold evaluation.
 Supports category-specific thresholds and scoring rules.
+
+Category values are hash-indexed to their filter at construction, and
+batches of items can be scored as arrays of category codes and values.
 """
 
-from typing import Dict, Any, Union, List
+from typing import Dict, Any, Union, List, Optional, Sequence
 from dataclasses import dataclass
 from enum import Enum
+
+import numpy as np
+
 from .binary_threshold import EvaluationPeriod, SuccessCriteria, CalculationMethod, ComparisonOperator
+from .kernels import CategoricalFilterKernel
 
 
 @dataclass
@@ -46,6 +53,41 @@ class CategoricalFilterThresholdAlgorithm:
     def __init__(self, config: CategoricalFilterThresholdConfig):
         self.config = config
         self._validate_categories()
+        self._build_index()
+    
+    def _build_index(self):
+        """
+        Index category values and compile the per-filter scoring kernel.
+        
+        Filter i gets code i; code len(category_filters) is the default
+        (unmatched) category.
+        """
+        filters = self.config.category_filters
+        self._filter_codes: Dict[Any, int] = {}
+        for code, filter_config in enumerate(filters):
+            for value in filter_config.category_values:
+                self._filter_codes.setdefault(value, code)
+        self.default_code = len(filters)
+        
+        # Weights are looked up by matched category name (first filter with the name wins)
+        self._category_weights = {"default": 1.0}
+        for filter_config in filters:
+            self._category_weights.setdefault(filter_config.category_name, filter_config.weight)
+        self._code_weights = np.array(
+            [self._get_category_weight(f.category_name) for f in filters] + [1.0], dtype=float
+        )
+        
+        # Like _calculate_threshold_score, only ComparisonOperator members ever match
+        operators = [
+            f.comparison_operator if isinstance(f.comparison_operator, ComparisonOperator) else None
+            for f in filters
+        ]
+        self.kernel = CategoricalFilterKernel(
+            thresholds=[f.threshold for f in filters] + [self.config.default_threshold],
+            success_values=[f.success_value for f in filters] + [self.config.default_success_value],
+            failure_values=[f.failure_value for f in filters] + [self.config.default_failure_value],
+            comparison_operators=operators + [ComparisonOperator.GTE]
+        )
     
     def calculate_score(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -152,12 +194,100 @@ class CategoricalFilterThresholdAlgorithm:
             "breakdown": breakdown
         }
     
+    def encode_categories(self, category_values: Sequence[Any]) -> np.ndarray:
+        """
+        Map category values to filter codes (default_code when no filter matches).
+        
+        Encode once and reuse the codes when the same items are scored repeatedly.
+        """
+        codes = self._filter_codes
+        default_code = self.default_code
+        return np.fromiter(
+            (codes.get(value, default_code) for value in category_values),
+            dtype=np.int64,
+            count=len(category_values)
+        )
+    
+    def score_codes(self, category_codes: Any, values: Any) -> np.ndarray:
+        """
+        Per-item scores for arrays of category codes and measured values.
+        
+        The arrays may have any (matching) shape; the result has the same shape.
+        """
+        return self.kernel.score_codes(category_codes, values)
+    
+    def calculate_batch_scores(
+        self,
+        category_codes: Sequence[int],
+        values: Sequence[Union[float, int, bool, None]],
+        include_breakdown: bool = False,
+        category_values: Optional[Sequence[Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Score many items at once from category codes and measured values.
+        
+        Args:
+            category_codes: Filter code per item (see encode_categories)
+            values: Measured value per item (None counts as 0)
+            include_breakdown: Add a per-item breakdown like calculate_score's
+            category_values: Raw category values, reported in the breakdown
+            
+        Returns:
+            Dict with the aggregated score, per-item scores and, optionally,
+            the breakdown; aggregation matches calculate_multi_category_score
+            up to floating-point summation order
+        """
+        codes = np.asarray(category_codes, dtype=np.int64)
+        if len(codes) == 0:
+            return {"score": 0, "scores": np.zeros(0), "breakdown": [], "error": "No data provided"}
+        
+        scores = self.score_codes(codes, [0 if v is None else v for v in values])
+        
+        method = self.config.aggregation_method
+        if method == "weighted_average":
+            weights = self._code_weights[codes]
+            total_weight = weights.sum()
+            final_score = float((scores * weights).sum() / total_weight) if total_weight > 0 else 0
+        elif method == "minimum":
+            final_score = float(scores.min())
+        elif method == "maximum":
+            final_score = float(scores.max())
+        else:
+            # simple_average and unknown methods
+            final_score = float(scores.mean())
+        
+        result = {
+            "score": final_score,
+            "scores": scores,
+            "aggregation_method": method,
+            "categories_processed": len(codes)
+        }
+        if include_breakdown:
+            filters = self.config.category_filters
+            result["breakdown"] = [
+                {
+                    "score": float(scores[i]),
+                    "matched_category": filters[code].category_name if code < self.default_code else "default",
+                    "category_value": category_values[i] if category_values is not None else None,
+                    "threshold_used": filters[code].threshold if code < self.default_code else self.config.default_threshold,
+                    "measured_value": values[i],
+                    "filter_applied": bool(code < self.default_code)
+                }
+                for i, code in enumerate(codes.tolist())
+            ]
+        return result
+    
     def _find_matching_filter(self, category_value: str) -> CategoryFilter:
         """Find the filter that matches the given category value."""
-        for filter_config in self.config.category_filters:
-            if category_value in filter_config.category_values:
-                return filter_config
-        return None
+        try:
+            code = self._filter_codes.get(category_value, self.default_code)
+        except TypeError:
+            # Unhashable values can still equal a listed category value
+            for filter_config in self.config.category_filters:
+                if category_value in filter_config.category_values:
+                    return filter_config
+            return None
+        return self.config.category_filters[code] if code < self.default_code else None
     
     def _calculate_threshold_score(
         self, 
@@ -193,14 +323,7 @@ class CategoricalFilterThresholdAlgorithm:
     
     def _get_category_weight(self, category_name: str) -> float:
         """Get weight for a category."""
-        if category_name == "default":
-            return 1.0
-        
-        for filter_config in self.config.category_filters:
-            if filter_config.category_name == category_name:
-                return filter_config.weight
-        
-        return 1.0
+        return self._category_weights.get(category_name, 1.0)
     
     def calculate_progressive_scores(self, daily_data: List[Dict[str, Any]]) -> List[float]:
         """
@@ -249,6 +372,7 @@ class CategoricalFilterThresholdAlgorithm:
                 raise ValueError(f"Missing required field: {field}")
         
         self._validate_categories()
+        self._build_index()
         return True
     
     def get_formula(self) -> str:
@@ -3,11 +3,21 @@ Composite Weighted Scoring Algorithm
 
 Calculates weighted average of multiple components.
 Each component can have its own scoring method and weight.
+
+Components are compiled once per config into a weight vector and one
+prebound scorer per component (parameters read up front, no per-call
+method dispatch), which also score whole columns of values for batch use.
 """
 
-from typing import Dict, Any, Union, List
+import operator
+from typing import Callable, Dict, Any, Sequence, Tuple, Union, List
 from dataclasses import dataclass
+
+import numpy as np
+
 from .binary_threshold import EvaluationPeriod, SuccessCriteria, CalculationMethod
+from .kernels import CompositeKernel
+from .zone_table import ZoneTable
 
 
 @dataclass
@@ -47,19 +57,119 @@ class CompositeWeightedConfig:
             self.calculation_notes = {}
 
 
+_BINARY_OPERATORS = {
+    ">=": operator.ge,
+    ">": operator.gt,
+    "=": operator.eq,
+    "<": operator.lt,
+    "<=": operator.le
+}
+
+ZONE_METHODS = ("zone", "zone_based", "zone_based_5tier")
+
+# (scalar scorer, column scorer) for one component
+ComponentScorer = Tuple[Callable[[Union[float, int]], float], Callable[[np.ndarray], np.ndarray]]
+
+
+def _compile_proportional(component: Component) -> ComponentScorer:
+    target = component.target
+    min_threshold = component.parameters.get("minimum_threshold", 0)
+    max_cap = component.parameters.get("maximum_cap", 100)
+
+    if target <= 0:
+        return (lambda value: 0.0), (lambda values: np.zeros(len(values)))
+
+    def score(value):
+        percentage = (value / target) * 100
+        return max(min_threshold, min(percentage, max_cap))
+
+    def scores(values):
+        return np.maximum(min_threshold, np.minimum((values / target) * 100, max_cap))
+
+    return score, scores
+
+
+def _compile_binary(component: Component) -> ComponentScorer:
+    threshold = component.parameters.get("threshold", component.target)
+    success_value = component.parameters.get("success_value", 100)
+    failure_value = component.parameters.get("failure_value", 0)
+    compare = _BINARY_OPERATORS.get(component.parameters.get("comparison_operator", ">="))
+
+    if compare is None:
+        # Unknown operators never meet the threshold
+        return (lambda value: failure_value), (lambda values: np.full(len(values), failure_value, dtype=float))
+
+    def score(value):
+        return success_value if compare(value, threshold) else failure_value
+
+    def scores(values):
+        return np.where(compare(values, threshold), success_value, failure_value).astype(float)
+
+    return score, scores
+
+
+def _compile_zone(component: Component) -> ComponentScorer:
+    # Zones are matched in listed order
+    table = ZoneTable([
+        (zone_data.get("min", float("-inf")), zone_data.get("max", float("inf")), zone_data.get("score", 0))
+        for zone_data in component.parameters.get("zones", [])
+    ])
+    return table.score, table.scores
+
+
+def compile_component(component: Component) -> ComponentScorer:
+    """
+    Prebind a component's scoring method and parameters
+
+    Returns:
+        (score, scores): score takes one value, scores takes a float array
+    """
+    if component.scoring_method == "binary":
+        return _compile_binary(component)
+    elif component.scoring_method in ZONE_METHODS:
+        return _compile_zone(component)
+    # Default to proportional for unknown methods
+    return _compile_proportional(component)
+
+
 class CompositeWeightedAlgorithm:
     """Composite weighted scoring algorithm implementation."""
     
     def __init__(self, config: CompositeWeightedConfig):
         self.config = config
         self._validate_weights()
+        self.compile_components()
+    
+    def compile_components(self):
+        """Compile the components into field names, scorers and the composite kernel."""
+        components = self.config.components
+        self.field_names = [component.field_name for component in components]
+        scorers = [compile_component(component) for component in components]
+        self._compiled = list(zip(
+            self.field_names,
+            [component.weight for component in components],
+            [score for score, _ in scorers]
+        ))
+        self.kernel = CompositeKernel(
+            self.field_names,
+            [component.weight for component in components],
+            [scores for _, scores in scorers],
+            minimum_threshold=self.config.minimum_threshold,
+            maximum_cap=self.config.maximum_cap
+        )
     
-    def calculate_score(self, component_values: Dict[str, Union[float, int]]) -> float:
+    def calculate_score(
+        self,
+        component_values: Dict[str, Union[float, int]],
+        skip_missing: bool = False
+    ) -> float:
         """
         Calculate weighted composite score.
         
         Args:
             component_values: Dict mapping component field_names to their values
+            skip_missing: Leave out components with no value (absent or None)
+                and average over the rest, instead of raising
             
         Returns:
             Weighted composite score (0-100, or up to maximum_cap)
@@ -67,15 +177,16 @@ class CompositeWeightedAlgorithm:
         total_weighted_score = 0.0
         total_weight = 0.0
         
-        for component in self.config.components:
-            if component.field_name not in component_values:
-                raise ValueError(f"Missing value for component: {component.field_name}")
-            
-            value = component_values[component.field_name]
-            component_score = self._calculate_component_score(component, value)
+        for field_name, weight, score in self._compiled:
+            value = component_values.get(field_name)
+            if value is None:
+                if skip_missing:
+                    continue
+                if field_name not in component_values:
+                    raise ValueError(f"Missing value for component: {field_name}")
             
-            total_weighted_score += component_score * component.weight
-            total_weight += component.weight
+            total_weighted_score += score(value) * weight
+            total_weight += weight
         
         if total_weight == 0:
             return 0.0
@@ -89,65 +200,34 @@ class CompositeWeightedAlgorithm:
         
         return composite_score
     
-    def _calculate_component_score(self, component: Component, value: Union[float, int]) -> float:
-        """Calculate score for a single component."""
-        if component.scoring_method == "proportional":
-            return self._calculate_proportional_score(component, value)
-        elif component.scoring_method == "binary":
-            return self._calculate_binary_score(component, value)
-        elif component.scoring_method in ["zone", "zone_based", "zone_based_5tier"]:
-            return self._calculate_zone_score(component, value)
-        else:
-            # Default to proportional for unknown methods
-            return self._calculate_proportional_score(component, value)
-    
-    def _calculate_proportional_score(self, component: Component, value: Union[float, int]) -> float:
-        """Calculate proportional score for component."""
-        if component.target <= 0:
-            return 0.0
-        
-        percentage = (value / component.target) * 100
-        
-        # Apply component-specific limits if provided
-        min_threshold = component.parameters.get("minimum_threshold", 0)
-        max_cap = component.parameters.get("maximum_cap", 100)
-        
-        return max(min_threshold, min(percentage, max_cap))
-    
-    def _calculate_binary_score(self, component: Component, value: Union[float, int]) -> float:
-        """Calculate binary score for component."""
-        threshold = component.parameters.get("threshold", component.target)
-        success_value = component.parameters.get("success_value", 100)
-        failure_value = component.parameters.get("failure_value", 0)
-        comparison_op = component.parameters.get("comparison_operator", ">=")
-        
-        meets_threshold = False
-        if comparison_op == ">=":
-            meets_threshold = value >= threshold
-        elif comparison_op == ">":
-            meets_threshold = value > threshold
-        elif comparison_op == "=":
-            meets_threshold = value == threshold
-        elif comparison_op == "<":
-            meets_threshold = value < threshold
-        elif comparison_op == "<=":
-            meets_threshold = value <= threshold
+    def component_matrix(self, rows: Sequence[Dict[str, Union[float, int]]]) -> np.ndarray:
+        """
+        Stack component value dicts into a (rows x components) matrix.
         
-        return success_value if meets_threshold else failure_value
+        Columns follow the component order; absent or None values become NaN.
+        """
+        matrix = np.full((len(rows), len(self.field_names)), np.nan)
+        for i, row in enumerate(rows):
+            for j, field_name in enumerate(self.field_names):
+                value = row.get(field_name)
+                if value is not None:
+                    matrix[i, j] = value
+        return matrix
     
-    def _calculate_zone_score(self, component: Component, value: Union[float, int]) -> float:
-        """Calculate zone-based score for component."""
-        zones = component.parameters.get("zones", [])
+    def calculate_batch_scores(self, values: Any, skip_missing: bool = False) -> np.ndarray:
+        """
+        Score a (rows x components) matrix of component values in one pass.
         
-        for zone_data in zones:
-            min_val = zone_data.get("min", float("-inf"))
-            max_val = zone_data.get("max", float("inf"))
-            score = zone_data.get("score", 0)
+        Args:
+            values: Matrix with one column per component, in component order
+                (see component_matrix); NaN marks a missing value
+            skip_missing: Leave out missing components per row and average over
+                the rest, instead of raising
             
-            if min_val <= value <= max_val:
-                return score
-        
-        return 0.0
+        Returns:
+            Composite score per row, matching calculate_score
+        """
+        return self.kernel.batch_scores(values, skip_missing=skip_missing)
     
     def _validate_weights(self):
         """Validate component weights."""
@@ -170,16 +250,7 @@ class CompositeWeightedAlgorithm:
         Returns:
             List of progressive scores (what user sees each day)
         """
-        progressive_scores = []
-        
-        for component_values in daily_component_values:
-            score = self.calculate_score(component_values)
-            progressive_scores.append(score)
-        
-        return progressive_scores
-        
-        # Optionally normalize weights to sum to 1.0
-        # (keeping original weights for transparency)
+        return self.kernel.progressive(self.component_matrix(daily_component_values)).ravel().tolist()
     
     def validate_config(self) -> bool:
         """Validate the configuration parameters."""
@@ -193,6 +264,7 @@ class CompositeWeightedAlgorithm:
                 raise ValueError(f"Missing required field: {field}")
         
         self._validate_weights()
+        self.compile_components()
         return True
     
     def get_formula(self) -> str:
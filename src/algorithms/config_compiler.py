@@ -0,0 +1,329 @@
+"""
+Config Compiler
+
+Builds scoring kernels straight from generated config JSON (the files in
+src/generated_configs). One schema reader per scoring method maps the
+generated schema onto that algorithm's config dataclass, and the algorithm
+compiles its kernel (see kernels), so the test runners, demos and batch
+scoring all read configs the same way.
+
+Schema variants handled:
+- "HH:MM" thresholds are read as decimal hours
+- weekly_elimination with a weekly or monthly sum limit compiles to a
+  SumLimitKernel rather than an elimination algorithm
+- constrained_weekly_allowance accepts weekly_limit for weekly_allowance
+- zone ranges are [min, max] pairs; "N of M" frequency requirements set
+  the zone frequency target
+- sleep_composite variance bounds may be the string "infinity"
+- composite components may name their field as metric, their method as
+  algorithm, and give weights as percentages
+"""
+
+import re
+from typing import Any, Callable, Dict, Optional, Union
+
+from .binary_threshold import (
+    BinaryThresholdAlgorithm,
+    BinaryThresholdConfig,
+    ComparisonOperator,
+    EvaluationPeriod
+)
+from .proportional import ProportionalAlgorithm, ProportionalConfig
+from .minimum_frequency import MinimumFrequencyAlgorithm, MinimumFrequencyConfig
+from .weekly_elimination import WeeklyEliminationAlgorithm, WeeklyEliminationConfig
+from .proportional_frequency_hybrid import ProportionalFrequencyHybridAlgorithm, ProportionalFrequencyHybridConfig
+from .zone_based import ZoneBasedAlgorithm, ZoneBasedConfig, Zone
+from .constrained_weekly_allowance import ConstrainedWeeklyAllowanceAlgorithm, ConstrainedWeeklyAllowanceConfig
+from .categorical_filter_threshold import (
+    CategoricalFilterThresholdAlgorithm,
+    CategoricalFilterThresholdConfig,
+    CategoryFilter
+)
+from .composite_weighted import CompositeWeightedAlgorithm, CompositeWeightedConfig, Component
+from .sleep_composite import SleepCompositeAlgorithm, SleepCompositeConfig
+from .kernels import AdherenceKernel, SumLimitKernel
+
+SUM_LIMIT_METHODS = {
+    "weekly_sum_limit": "weekly_limit",
+    "monthly_sum_limit": "monthly_limit"
+}
+
+_COMPONENT_METHODS = {
+    "binary_threshold": "binary"
+}
+
+
+def schema_number(value: Union[str, float, int]) -> float:
+    """Numeric schema value; "HH:MM" times become decimal hours ("14:30" -> 14.5)"""
+    if isinstance(value, str) and ':' in value:
+        hours, minutes = value.split(':')
+        return float(hours) + float(minutes) / 60.0
+    return value
+
+
+def _evaluation_period(schema: Dict[str, Any]) -> EvaluationPeriod:
+    period = schema.get('evaluation_period', 'daily').lower()
+    if 'weekly' in period or period == EvaluationPeriod.ROLLING_7_DAY.value:
+        return EvaluationPeriod.ROLLING_7_DAY
+    return EvaluationPeriod.DAILY
+
+
+def _build_proportional(schema: Dict[str, Any]) -> ProportionalAlgorithm:
+    config = ProportionalConfig(
+        target=schema.get('target', 1.0),
+        unit=schema.get('unit', 'units'),
+        maximum_cap=schema.get('maximum_cap', 100),
+        minimum_threshold=schema.get('minimum_threshold', 0),
+        partial_credit=schema.get('partial_credit', True),
+        evaluation_period=_evaluation_period(schema),
+        frequency_requirement=schema.get('frequency_requirement') or 'daily',
+        description=schema.get('description', '')
+    )
+    return ProportionalAlgorithm(config)
+
+
+def _build_binary_threshold(schema: Dict[str, Any]) -> BinaryThresholdAlgorithm:
+    operator = schema.get('comparison_operator', '>=')
+    config = BinaryThresholdConfig(
+        threshold=schema_number(schema.get('threshold', 1.0)),
+        success_value=schema.get('success_value', 100),
+        failure_value=schema.get('failure_value', 0),
+        comparison_operator=ComparisonOperator('=' if operator == '==' else operator),
+        evaluation_period=_evaluation_period(schema),
+        frequency_requirement=schema.get('frequency_requirement') or 'daily',
+        description=schema.get('description', '')
+    )
+    return BinaryThresholdAlgorithm(config)
+
+
+def _build_minimum_frequency(schema: Dict[str, Any]) -> MinimumFrequencyAlgorithm:
+    config = MinimumFrequencyConfig(
+        daily_threshold=schema_number(schema.get('daily_threshold', 1.0)),
+        daily_comparison=schema.get('daily_comparison', '>='),
+        required_days=schema.get('required_days', 3),
+        total_days=schema.get('total_days', 7),
+        description=schema.get('description', '')
+    )
+    return MinimumFrequencyAlgorithm(config)
+
+
+def _build_weekly_elimination(schema: Dict[str, Any]) -> WeeklyEliminationAlgorithm:
+    threshold = schema.get('elimination_threshold')
+    if threshold is None:
+        threshold = schema.get('threshold') or 0
+    config = WeeklyEliminationConfig(
+        elimination_threshold=schema_number(threshold),
+        elimination_comparison=schema.get('elimination_comparison') or '==',
+        description=schema.get('description', '')
+    )
+    return WeeklyEliminationAlgorithm(config)
+
+
+def _build_proportional_frequency_hybrid(schema: Dict[str, Any]) -> ProportionalFrequencyHybridAlgorithm:
+    config = ProportionalFrequencyHybridConfig(
+        daily_target=schema.get('daily_target', 1.0),
+        required_qualifying_days=schema.get('required_qualifying_days', 2),
+        unit=schema.get('unit', 'units'),
+        daily_minimum_threshold=schema.get('daily_minimum_threshold', 0),
+        total_days=schema.get('total_days', 7),
+        minimum_threshold=schema.get('minimum_threshold', 0),
+        maximum_cap=schema.get('maximum_cap', 100),
+        partial_credit=schema.get('partial_credit', True),
+        description=schema.get('description', '')
+    )
+    return ProportionalFrequencyHybridAlgorithm(config)
+
+
+def _zone_range(zone_data: Dict[str, Any]) -> tuple:
+    zone_range = zone_data.get('range', [0, 1])
+    min_value = zone_range[0] if len(zone_range) > 0 else 0
+    max_value = zone_range[1] if len(zone_range) > 1 else min_value
+    return min_value, max_value
+
+
+def _frequency_target(frequency_requirement: Optional[str]) -> Optional[int]:
+    # "hit optimal zone 5 of 7 days" -> 5
+    match = re.search(r'(\d+)\s+of\s+\d+', frequency_requirement or '')
+    return int(match.group(1)) if match else None
+
+
+def _build_zone_based(schema: Dict[str, Any]) -> ZoneBasedAlgorithm:
+    zones = []
+    for zone_data in schema.get('zones', []):
+        min_value, max_value = _zone_range(zone_data)
+        zones.append(Zone(
+            min_value=min_value, max_value=max_value,
+            score=zone_data.get('score', 50), label=zone_data.get('label', 'Zone')
+        ))
+    frequency_requirement = schema.get('frequency_requirement') or 'daily'
+    config = ZoneBasedConfig(
+        zones=zones,
+        unit=schema.get('unit', 'units'),
+        frequency_requirement=frequency_requirement,
+        description=schema.get('description', '')
+    )
+    return ZoneBasedAlgorithm(config, frequency_target=_frequency_target(frequency_requirement))
+
+
+def _build_constrained_weekly_allowance(schema: Dict[str, Any]) -> ConstrainedWeeklyAllowanceAlgorithm:
+    allowance = schema.get('weekly_allowance')
+    if allowance is None:
+        allowance = schema.get('weekly_limit', 0)
+    penalty = schema.get('penalty_per_excess')
+    config = ConstrainedWeeklyAllowanceConfig(
+        weekly_allowance=allowance,
+        unit=schema.get('unit') or schema.get('base_unit', 'units'),
+        penalty_for_overage=100.0 if penalty is None else penalty,
+        max_days_per_week=schema.get('max_days_per_week'),
+        description=schema.get('description', '')
+    )
+    return ConstrainedWeeklyAllowanceAlgorithm(config)
+
+
+def _build_categorical_filter_threshold(schema: Dict[str, Any]) -> CategoricalFilterThresholdAlgorithm:
+    filters = [
+        CategoryFilter(
+            category_name=filter_data['category_name'],
+            category_values=filter_data.get('category_values', []),
+            threshold=schema_number(filter_data.get('threshold', 0)),
+            success_value=filter_data.get('success_value', 100),
+            failure_value=filter_data.get('failure_value', 0),
+            comparison_operator=ComparisonOperator(filter_data.get('comparison_operator', '>=')),
+            weight=filter_data.get('weight', 1.0)
+        )
+        for filter_data in schema.get('category_filters', [])
+    ]
+    config = CategoricalFilterThresholdConfig(
+        category_field=schema.get('category_field', 'category'),
+        category_filters=filters,
+        default_threshold=schema.get('default_threshold', 0),
+        default_success_value=schema.get('default_success_value', 50),
+        default_failure_value=schema.get('default_failure_value', 0),
+        aggregation_method=schema.get('aggregation_method', 'weighted_average'),
+        frequency_requirement=schema.get('frequency_requirement') or 'daily',
+        description=schema.get('description', '')
+    )
+    return CategoricalFilterThresholdAlgorithm(config)
+
+
+def _component(component_data: Dict[str, Any], name: Optional[str] = None) -> Component:
+    field_name = component_data.get('field_name') or component_data.get('metric') or name or 'value'
+
+    # Weights above 10 are percentages
+    weight = component_data.get('weight', 1.0)
+    if isinstance(weight, (int, float)) and weight > 10:
+        weight = weight / 100.0
+
+    method = component_data.get('scoring_method', component_data.get('algorithm', 'proportional'))
+    parameters = dict(component_data.get('parameters', {}))
+    if 'zones' in component_data and 'zones' not in parameters:
+        parameters['zones'] = [
+            dict(zip(('min', 'max'), _zone_range(zone_data)), score=zone_data.get('score', 0))
+            for zone_data in component_data['zones']
+        ]
+    if 'comparison_operator' in component_data:
+        parameters.setdefault('comparison_operator', component_data['comparison_operator'])
+
+    return Component(
+        name=component_data.get('name', name or field_name),
+        weight=weight,
+        target=schema_number(component_data.get('target', component_data.get('threshold', 100))),
+        unit=component_data.get('unit', 'units'),
+        scoring_method=_COMPONENT_METHODS.get(method, method),
+        field_name=field_name,
+        parameters=parameters
+    )
+
+
+def _build_composite_weighted(schema: Dict[str, Any]) -> CompositeWeightedAlgorithm:
+    components_data = schema.get('components', [])
+    if isinstance(components_data, dict):
+        components = [_component(data, name) for name, data in components_data.items()]
+    else:
+        components = [_component(data) for data in components_data]
+
+    config = CompositeWeightedConfig(
+        components=components,
+        minimum_threshold=schema.get('minimum_threshold', 0),
+        maximum_cap=schema.get('maximum_cap', 100),
+        frequency_requirement=schema.get('frequency_requirement') or 'daily',
+        description=schema.get('description', '')
+    )
+    return CompositeWeightedAlgorithm(config)
+
+
+def _build_sleep_composite(schema: Dict[str, Any]) -> SleepCompositeAlgorithm:
+    components = schema.get('components', {})
+    duration = components.get('sleep_duration', {})
+    sleep_time = components.get('sleep_time_consistency', {})
+    wake_time = components.get('wake_time_consistency', {})
+
+    # Generated schemas spell the open-ended bound "infinity"
+    variance_thresholds = sleep_time.get('variance_thresholds')
+    if variance_thresholds is not None:
+        variance_thresholds = [
+            dict(threshold, max_variance=float(threshold['max_variance']))
+            for threshold in variance_thresholds
+        ]
+
+    config = SleepCompositeConfig(
+        duration_weight=duration.get('weight', 0.55),
+        sleep_consistency_weight=sleep_time.get('weight', 0.225),
+        wake_consistency_weight=wake_time.get('weight', 0.225),
+        duration_zones=duration.get('zones'),
+        variance_thresholds=variance_thresholds,
+        description=schema.get('description', '')
+    )
+    return SleepCompositeAlgorithm(config)
+
+
+ALGORITHM_BUILDERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "proportional": _build_proportional,
+    "binary_threshold": _build_binary_threshold,
+    "minimum_frequency": _build_minimum_frequency,
+    "weekly_elimination": _build_weekly_elimination,
+    "proportional_frequency_hybrid": _build_proportional_frequency_hybrid,
+    "zone_based": _build_zone_based,
+    "constrained_weekly_allowance": _build_constrained_weekly_allowance,
+    "categorical_filter_threshold": _build_categorical_filter_threshold,
+    "composite_weighted": _build_composite_weighted,
+    "sleep_composite": _build_sleep_composite
+}
+
+
+def build_algorithm(method: str, schema: Dict[str, Any]) -> Any:
+    """
+    Build the algorithm instance for a generated config schema
+
+    Args:
+        method: Scoring method (e.g. "minimum_frequency")
+        schema: configuration_json.schema of a generated config
+
+    Returns:
+        Algorithm instance with its kernel compiled
+    """
+    builder = ALGORITHM_BUILDERS.get(method)
+    if builder is None:
+        raise ValueError(f"Unsupported algorithm type: {method}")
+    return builder(schema)
+
+
+def compile_kernel(config: Dict[str, Any]) -> AdherenceKernel:
+    """
+    Compile a generated config into its scoring kernel
+
+    Args:
+        config: Full generated config (with configuration_json and scoring_method)
+
+    Returns:
+        Kernel scoring (users x days) matrices of daily values
+    """
+    configuration = config.get('configuration_json', {})
+    method = configuration.get('method') or config.get('scoring_method')
+    schema = configuration.get('schema', {})
+
+    limit_field = SUM_LIMIT_METHODS.get(schema.get('calculation_method'))
+    if method == "weekly_elimination" and limit_field:
+        return SumLimitKernel(schema_number(schema[limit_field]))
+
+    return build_algorithm(method, schema).kernel
@@ -3,12 +3,18 @@ Constrained Weekly Allowance Algorithm
 
 Manages weekly allowances with constraints and rollover rules.
 Tracks weekly budgets and spending patterns.
+
+The allowance logic is stateless; weekly outcomes (needed for rollover and
+trends) live in a WeeklyHistoryStore that many users and algorithm
+instances can share.
 """
 
-from typing import Dict, Any, Union, List
+from typing import Dict, Any, Union, List, Hashable, Mapping, Optional, Tuple
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime
 from .binary_threshold import EvaluationPeriod, SuccessCriteria, CalculationMethod
+from .kernels import ConstrainedWeeklyAllowanceKernel
+from .weekly_history import WeeklyHistoryStore, WeekRecord, iso_week_number, iso_week_identifier
 
 
 @dataclass
@@ -28,12 +34,183 @@ class ConstrainedWeeklyAllowanceConfig:
     description: str = ""
 
 
+def calculate_available_allowance(
+    config: ConstrainedWeeklyAllowanceConfig,
+    previous_week: Optional[WeekRecord] = None
+) -> float:
+    """
+    Allowance available for a week, including rollover from the previous week.
+    
+    Args:
+        config: Allowance configuration
+        previous_week: The user's record for the previous week, if any
+    """
+    base_allowance = config.weekly_allowance
+    
+    if not config.rollover_enabled or previous_week is None:
+        return base_allowance
+    
+    unused_amount = max(0.0, previous_week.allowance - previous_week.usage)
+    
+    # Apply rollover limits
+    max_rollover = base_allowance * (config.max_rollover_percentage / 100.0)
+    rollover_amount = min(unused_amount, max_rollover)
+    
+    return base_allowance + rollover_amount
+
+
+def evaluate_weekly_allowance(
+    config: ConstrainedWeeklyAllowanceConfig,
+    available_allowance: float,
+    daily_values: List[Union[float, int]] = None,
+    weekly_usage: float = None
+) -> Tuple[Dict[str, Any], WeekRecord]:
+    """
+    Score one week of usage against an available allowance.
+    
+    Args:
+        config: Allowance configuration
+        available_allowance: Allowance for the week (see calculate_available_allowance)
+        daily_values: List of daily values (7 days) for dual constraint checking
+        weekly_usage: Amount used this week (if daily_values not provided)
+        
+    Returns:
+        (result dict, record to store in the weekly history)
+    """
+    # Calculate weekly usage and days used from daily values
+    if daily_values is not None:
+        weekly_usage = sum(daily_values)
+        days_used = sum(1 for value in daily_values if value > 0)
+    else:
+        days_used = None  # Can't determine days used from total only
+    
+    # Check dual constraints if max_days_per_week is specified
+    if config.max_days_per_week is not None and days_used is not None:
+        if days_used > config.max_days_per_week:
+            # Violates max days constraint - immediate failure
+            compliance_score = 0.0
+            overage = weekly_usage - available_allowance if weekly_usage > available_allowance else 0.0
+            
+            record = WeekRecord(weekly_usage, available_allowance, overage, compliance_score,
+                                days_used, config.max_days_per_week)
+            return {
+                "score": compliance_score,
+                "status": "exceeds_max_days",
+                "weekly_usage": weekly_usage,
+                "available_allowance": available_allowance,
+                "overage": overage,
+                "remaining_allowance": max(0.0, available_allowance - weekly_usage),
+                "days_used": days_used,
+                "max_days_allowed": config.max_days_per_week
+            }, record
+    
+    # Calculate base compliance score
+    if weekly_usage <= available_allowance:
+        compliance_score = 100.0
+        overage = 0.0
+        status = "within_allowance"
+    else:
+        overage = weekly_usage - available_allowance
+        # Penalty for going over allowance
+        penalty = min(overage * config.penalty_for_overage, 100.0)
+        compliance_score = max(0.0, 100.0 - penalty)
+        status = "over_allowance"
+    
+    # Check minimum usage requirement
+    if weekly_usage < config.minimum_weekly_usage:
+        compliance_score = max(0.0, compliance_score - 20.0)  # Penalty for under-usage
+        status = "under_minimum"
+    
+    max_days = config.max_days_per_week if days_used is not None else None
+    record = WeekRecord(weekly_usage, available_allowance, overage, compliance_score, days_used, max_days)
+    
+    result = {
+        "score": compliance_score,
+        "status": status,
+        "weekly_usage": weekly_usage,
+        "available_allowance": available_allowance,
+        "overage": overage,
+        "remaining_allowance": max(0.0, available_allowance - weekly_usage)
+    }
+    if days_used is not None:
+        result["days_used"] = days_used
+        result["max_days_allowed"] = config.max_days_per_week
+        
+    return result, record
+
+
+def evaluate_weekly_allowances(
+    config: ConstrainedWeeklyAllowanceConfig,
+    history: WeeklyHistoryStore,
+    week_identifier: Union[str, int],
+    usage_by_user: Mapping[Hashable, Union[List[Union[float, int]], float]]
+) -> Dict[Hashable, Dict[str, Any]]:
+    """
+    Score one week for many users against a shared history.
+    
+    Each user's rollover comes from their previous week in history, and this
+    week's outcome is stored back for the next one.
+    
+    Args:
+        config: Allowance configuration
+        history: Shared weekly history store
+        week_identifier: Week being scored (e.g., "2024-W01")
+        usage_by_user: User -> daily values (list) or total weekly usage
+        
+    Returns:
+        User -> result dict
+    """
+    week = iso_week_number(week_identifier)
+    results = {}
+    for user_id, usage in usage_by_user.items():
+        available_allowance = calculate_available_allowance(config, history.previous(user_id, week))
+        if isinstance(usage, (list, tuple)):
+            result, record = evaluate_weekly_allowance(config, available_allowance, daily_values=usage)
+        else:
+            result, record = evaluate_weekly_allowance(config, available_allowance, weekly_usage=usage)
+        history.put(user_id, week, record)
+        results[user_id] = result
+    return results
+
+
 class ConstrainedWeeklyAllowanceAlgorithm:
     """Constrained weekly allowance algorithm implementation."""
     
-    def __init__(self, config: ConstrainedWeeklyAllowanceConfig):
+    def __init__(
+        self,
+        config: ConstrainedWeeklyAllowanceConfig,
+        history: Optional[WeeklyHistoryStore] = None,
+        user_id: Hashable = None
+    ):
+        """
+        Args:
+            config: Allowance configuration
+            history: Weekly history store to read and record weeks in (shared
+                between instances and users; a private store by default)
+            user_id: User whose weeks this instance reads and records
+        """
         self.config = config
-        self.weekly_history = {}  # Track usage history by week
+        self.history = history if history is not None else WeeklyHistoryStore()
+        self.user_id = user_id
+        self.compile_kernel()
+    
+    def compile_kernel(self):
+        """Compile the vectorized scoring kernel for the current config."""
+        config = self.config
+        self.kernel = ConstrainedWeeklyAllowanceKernel(
+            config.weekly_allowance,
+            penalty_for_overage=config.penalty_for_overage,
+            minimum_weekly_usage=config.minimum_weekly_usage,
+            max_days_per_week=config.max_days_per_week
+        )
+    
+    @property
+    def weekly_history(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of this user's stored weeks, keyed by week identifier."""
+        return {
+            iso_week_identifier(week): record.as_dict()
+            for week, record in self.history.recent(self.user_id, len(self.history.weeks(self.user_id)))
+        }
     
     def calculate_score(self, daily_values: List[Union[float, int]] = None, weekly_usage: float = None, week_identifier: str = None) -> Dict[str, Any]:
         """
@@ -42,117 +219,29 @@ class ConstrainedWeeklyAllowanceAlgorithm:
         Args:
             daily_values: List of daily values (7 days) for dual constraint checking
             weekly_usage: Amount used this week (if daily_values not provided)
-            week_identifier: Unique identifier for the week (e.g., "2024-W01")
+            week_identifier: ISO week of the usage (e.g., "2024-W01")
             
         Returns:
             Dict containing score, allowance status, and details
         """
         if week_identifier is None:
             week_identifier = self._get_current_week_id()
+        week = iso_week_number(week_identifier)
         
-        # Calculate weekly usage and days used from daily values
-        if daily_values is not None:
-            weekly_usage = sum(daily_values)
-            days_used = sum(1 for value in daily_values if value > 0)
-        else:
-            days_used = None  # Can't determine days used from total only
-        
-        # Get available allowance for this week
-        available_allowance = self._calculate_available_allowance(week_identifier)
-        
-        # Check dual constraints if max_days_per_week is specified
-        if self.config.max_days_per_week is not None and days_used is not None:
-            if days_used > self.config.max_days_per_week:
-                # Violates max days constraint - immediate failure
-                compliance_score = 0.0
-                status = "exceeds_max_days"
-                overage = weekly_usage - available_allowance if weekly_usage > available_allowance else 0.0
-                
-                # Update history
-                self.weekly_history[week_identifier] = {
-                    "usage": weekly_usage,
-                    "allowance": available_allowance,
-                    "overage": overage,
-                    "score": compliance_score,
-                    "days_used": days_used,
-                    "max_days": self.config.max_days_per_week
-                }
-                
-                return {
-                    "score": compliance_score,
-                    "status": status,
-                    "weekly_usage": weekly_usage,
-                    "available_allowance": available_allowance,
-                    "overage": overage,
-                    "remaining_allowance": max(0.0, available_allowance - weekly_usage),
-                    "days_used": days_used,
-                    "max_days_allowed": self.config.max_days_per_week
-                }
-        
-        # Calculate base compliance score
-        if weekly_usage <= available_allowance:
-            compliance_score = 100.0
-            overage = 0.0
-            status = "within_allowance"
-        else:
-            overage = weekly_usage - available_allowance
-            # Penalty for going over allowance
-            penalty = min(overage * self.config.penalty_for_overage, 100.0)
-            compliance_score = max(0.0, 100.0 - penalty)
-            status = "over_allowance"
-        
-        # Check minimum usage requirement
-        if weekly_usage < self.config.minimum_weekly_usage:
-            compliance_score = max(0.0, compliance_score - 20.0)  # Penalty for under-usage
-            status = "under_minimum"
-        
-        # Update history
-        history_data = {
-            "usage": weekly_usage,
-            "allowance": available_allowance,
-            "overage": overage,
-            "score": compliance_score
-        }
-        if days_used is not None:
-            history_data["days_used"] = days_used
-            history_data["max_days"] = self.config.max_days_per_week
-            
-        self.weekly_history[week_identifier] = history_data
-        
-        result = {
-            "score": compliance_score,
-            "status": status,
-            "weekly_usage": weekly_usage,
-            "available_allowance": available_allowance,
-            "overage": overage,
-            "remaining_allowance": max(0.0, available_allowance - weekly_usage)
-        }
-        if days_used is not None:
-            result["days_used"] = days_used
-            result["max_days_allowed"] = self.config.max_days_per_week
-            
+        available_allowance = calculate_available_allowance(
+            self.config, self.history.previous(self.user_id, week)
+        )
+        result, record = evaluate_weekly_allowance(
+            self.config, available_allowance, daily_values=daily_values, weekly_usage=weekly_usage
+        )
+        self.history.put(self.user_id, week, record)
         return result
     
     def _calculate_available_allowance(self, week_identifier: str) -> float:
         """Calculate available allowance including any rollovers."""
-        base_allowance = self.config.weekly_allowance
-        
-        if not self.config.rollover_enabled:
-            return base_allowance
-        
-        # Calculate rollover from previous week
-        previous_week = self._get_previous_week_id(week_identifier)
-        if previous_week in self.weekly_history:
-            prev_data = self.weekly_history[previous_week]
-            unused_amount = max(0.0, prev_data["allowance"] - prev_data["usage"])
-            
-            # Apply rollover limits
-            max_rollover = base_allowance * (self.config.max_rollover_percentage / 100.0)
-            rollover_amount = min(unused_amount, max_rollover)
-            
-            return base_allowance + rollover_amount
-        
-        return base_allowance
+        return calculate_available_allowance(
+            self.config, self.history.previous(self.user_id, week_identifier)
+        )
     
     def _get_current_week_id(self) -> str:
         """Get current week identifier."""
@@ -163,18 +252,8 @@ class ConstrainedWeeklyAllowanceAlgorithm:
     def _get_previous_week_id(self, week_identifier: str) -> str:
         """Get previous week identifier."""
         try:
-            year, week_str = week_identifier.split("-W")
-            week = int(week_str)
-            
-            if week == 1:
-                # Handle year rollover
-                prev_year = int(year) - 1
-                # Get last week of previous year
-                last_week = datetime(prev_year, 12, 31).isocalendar()[1]
-                return f"{prev_year}-W{last_week:02d}"
-            else:
-                return f"{year}-W{week-1:02d}"
-        except:
+            return iso_week_identifier(iso_week_number(week_identifier) - 1)
+        except ValueError:
             return "unknown"
     
     def get_weekly_summary(self, week_identifier: str = None) -> Dict[str, Any]:
@@ -182,25 +261,25 @@ class ConstrainedWeeklyAllowanceAlgorithm:
         if week_identifier is None:
             week_identifier = self._get_current_week_id()
         
-        if week_identifier not in self.weekly_history:
+        try:
+            record = self.history.get(self.user_id, week_identifier)
+        except ValueError:
+            record = None
+        if record is None:
             return {"error": "No data for specified week"}
         
-        return self.weekly_history[week_identifier]
+        return record.as_dict()
     
     def get_usage_trend(self, num_weeks: int = 4) -> List[Dict[str, Any]]:
         """Get usage trend over recent weeks."""
-        sorted_weeks = sorted(self.weekly_history.keys(), reverse=True)
-        recent_weeks = sorted_weeks[:num_weeks]
-        
         trend = []
-        for week in reversed(recent_weeks):  # Chronological order
-            data = self.weekly_history[week]
+        for week, record in self.history.recent(self.user_id, num_weeks):  # Chronological order
             trend.append({
-                "week": week,
-                "usage": data["usage"],
-                "allowance": data["allowance"],
-                "score": data["score"],
-                "utilization_percentage": (data["usage"] / data["allowance"]) * 100
+                "week": iso_week_identifier(week),
+                "usage": record.usage,
+                "allowance": record.allowance,
+                "score": record.score,
+                "utilization_percentage": (record.usage / record.allowance) * 100
             })
         
         return trend
@@ -233,22 +312,8 @@ class ConstrainedWeeklyAllowanceAlgorithm:
         Returns:
             List of progressive scores (what user sees each day)
         """
-        progressive_scores = []
-        cumulative_usage = 0
-        
-        for value in daily_values:
-            cumulative_usage += value
-            
-            if cumulative_usage <= self.config.weekly_allowance:
-                progressive_scores.append(100.0)
-            else:
-                # Calculate penalty for exceeding allowance
-                overage = cumulative_usage - self.config.weekly_allowance
-                penalty = min(overage * self.config.penalty_for_overage, 100.0)
-                score = max(0.0, 100.0 - penalty)
-                progressive_scores.append(score)
-        
-        return progressive_scores
+        # Penalty once cumulative usage exceeds the allowance
+        return self.kernel.progressive(daily_values)[0].tolist()
     
     def get_formula(self) -> str:
         """Return the algorithm formula as a string."""
@@ -0,0 +1,725 @@
+"""
+Adherence Scoring Kernels
+=========================
+
+Vectorized scoring for every adherence algorithm. A kernel turns a
+(users x days) matrix of daily values into three arrays:
+
+- daily: each day's own score (users x days)
+- progressive: what the user sees on each day of the period (users x days)
+- weekly: the period's score (users,)
+
+Kernels are built from plain config values and own the scoring math; the
+algorithm classes compile one from their config and the config registry
+scores single entries through day_score, so all of them share one
+implementation. Per-row results match the scalar definitions exactly: sums
+run left to right in day order, as the row-at-a-time code did.
+
+Composite kernels take a (users x days x components) array, and the
+categorical kernel takes a matching matrix of category codes.
+"""
+
+import abc
+import bisect
+import operator
+from itertools import accumulate
+from typing import Any, Callable, Dict, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .zone_table import ZoneTable
+
+
+COMPARISONS = {
+    ">=": np.greater_equal,
+    ">": np.greater,
+    "==": np.equal,
+    "=": np.equal,
+    "<": np.less,
+    "<=": np.less_equal
+}
+
+# Comparisons accepted by the frequency and elimination scorers
+DAILY_COMPARISONS = {
+    "<=": np.less_equal,
+    ">=": np.greater_equal,
+    "==": np.equal
+}
+
+# Single-value versions of COMPARISONS, for day_score
+SCALAR_COMPARISONS = {
+    ">=": operator.ge,
+    ">": operator.gt,
+    "==": operator.eq,
+    "=": operator.eq,
+    "<": operator.lt,
+    "<=": operator.le
+}
+
+
+class KernelScores(NamedTuple):
+    daily: np.ndarray
+    progressive: np.ndarray
+    weekly: np.ndarray
+
+
+def as_matrix(values: Any, ndim: int = 2) -> np.ndarray:
+    """
+    Float array of daily values, one row per user
+
+    A single user's days (one dimension fewer) are promoted to a one-row matrix.
+    """
+    matrix = np.asarray(values, dtype=float)
+    if matrix.ndim == ndim - 1:
+        matrix = matrix[np.newaxis]
+    if matrix.ndim != ndim:
+        raise ValueError(f"Expected a {ndim}-dimensional array of daily values, got shape {matrix.shape}")
+    return matrix
+
+
+def row_sums(matrix: np.ndarray) -> np.ndarray:
+    """Sum of each row, accumulated left to right like sum()"""
+    total = np.zeros(matrix.shape[0])
+    for day in range(matrix.shape[1]):
+        total = total + matrix[:, day]
+    return total
+
+
+def row_means(matrix: np.ndarray) -> np.ndarray:
+    """Mean of each row (NaN for rows with no days), summed like sum() / len()"""
+    with np.errstate(invalid="ignore"):
+        return row_sums(matrix) / matrix.shape[1]
+
+
+def last_column(matrix: np.ndarray) -> np.ndarray:
+    """Last day of each row (NaN for rows with no days)"""
+    if matrix.shape[1] == 0:
+        return np.full(matrix.shape[0], np.nan)
+    return matrix[:, -1].copy()
+
+
+def remaining_days(matrix: np.ndarray) -> np.ndarray:
+    """Days left in the period after each day"""
+    days = matrix.shape[1]
+    return days - np.arange(1, days + 1)
+
+
+class AdherenceKernel(abc.ABC):
+    """
+    Base kernel: independent days, weekly score is the mean daily score
+
+    Subclasses implement daily and, where the period matters, override
+    progressive and weekly.
+    """
+
+    method = ""
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(method={self.method!r})"
+
+    @abc.abstractmethod
+    def daily(self, values: Any) -> np.ndarray:
+        """Each day's own score (users x days)"""
+
+    def progressive(self, values: Any) -> np.ndarray:
+        return self.daily(values)
+
+    def weekly(self, values: Any) -> np.ndarray:
+        return row_means(self.daily(values))
+
+    def score(self, values: Any) -> KernelScores:
+        """Daily, progressive and weekly scores in one call"""
+        return KernelScores(self.daily(values), self.progressive(values), self.weekly(values))
+
+    def day_score(self, value: float) -> float:
+        """
+        Daily score of a single value
+
+        Kernels scored one entry at a time (see the config registry) override
+        this with a scalar path that must match daily.
+        """
+        return float(self.daily([[value]])[0, 0])
+
+
+class BinaryThresholdKernel(AdherenceKernel):
+    """Success value when the day meets the threshold, failure value otherwise"""
+
+    method = "binary_threshold"
+
+    def __init__(
+        self,
+        threshold: float,
+        success_value: float = 100,
+        failure_value: float = 0,
+        comparison_operator: Any = ">="
+    ):
+        """
+        Args:
+            threshold: Value each day is compared against
+            success_value: Score for a day that meets the threshold
+            failure_value: Score for a day that does not
+            comparison_operator: Operator string or ComparisonOperator
+        """
+        comparison = getattr(comparison_operator, "value", comparison_operator)
+        self.compare = COMPARISONS.get(comparison)
+        if self.compare is None:
+            raise ValueError(f"Unknown comparison operator: {comparison_operator}")
+        self.compare_one = SCALAR_COMPARISONS[comparison]
+        self.threshold = float(threshold)
+        self.success_value = float(success_value)
+        self.failure_value = float(failure_value)
+
+    def daily(self, values: Any) -> np.ndarray:
+        meets = self.compare(as_matrix(values), self.threshold)
+        return np.where(meets, self.success_value, self.failure_value)
+
+    def day_score(self, value: float) -> float:
+        return self.success_value if self.compare_one(value, self.threshold) else self.failure_value
+
+
+class ProportionalKernel(AdherenceKernel):
+    """
+    Percentage of target per day; weekly configs accumulate toward the target
+
+    Weekly configs show cumulative progress and score the period total;
+    daily configs score each day and average them.
+    """
+
+    method = "proportional"
+
+    def __init__(
+        self,
+        target: float,
+        minimum_threshold: float = 0,
+        maximum_cap: float = 100,
+        partial_credit: bool = True,
+        is_weekly: bool = False
+    ):
+        """
+        Args:
+            target: Value that scores 100
+            minimum_threshold: Floor below which partial_credit applies
+            maximum_cap: Highest score
+            partial_credit: Score minimum_threshold (rather than 0) below it
+            is_weekly: Accumulate days toward the target over the period
+        """
+        self.target = target
+        self.minimum_threshold = minimum_threshold
+        self.maximum_cap = maximum_cap
+        self.partial_credit = partial_credit
+        self.is_weekly = is_weekly
+
+    def _check_target(self) -> None:
+        if self.target <= 0:
+            raise ValueError("Target must be greater than 0")
+
+    def daily(self, values: Any) -> np.ndarray:
+        self._check_target()
+        percentage = (as_matrix(values) / self.target) * 100
+        below = self.minimum_threshold if self.partial_credit else 0
+        return np.where(percentage < self.minimum_threshold, below, np.minimum(percentage, self.maximum_cap))
+
+    def day_score(self, value: float) -> float:
+        self._check_target()
+        percentage = (value / self.target) * 100
+        if percentage < self.minimum_threshold:
+            return float(self.minimum_threshold if self.partial_credit else 0)
+        return float(min(percentage, self.maximum_cap))
+
+    def progressive(self, values: Any) -> np.ndarray:
+        if not self.is_weekly:
+            return self.daily(values)
+        self._check_target()
+        cumulative = np.cumsum(as_matrix(values), axis=1)
+        cumulative_score = np.minimum((cumulative / self.target) * 100, self.maximum_cap)
+        return np.maximum(cumulative_score, self.minimum_threshold)
+
+    def weekly(self, values: Any) -> np.ndarray:
+        if self.is_weekly:
+            return last_column(self.progressive(values))
+        return row_means(self.daily(values))
+
+
+class MinimumFrequencyKernel(AdherenceKernel):
+    """Days meeting the threshold, against required_days per period"""
+
+    method = "minimum_frequency"
+
+    def __init__(self, daily_threshold: float, daily_comparison: str, required_days: int):
+        self.daily_threshold = daily_threshold
+        self.daily_comparison = daily_comparison
+        self.required_days = required_days
+        # The progressive view treats unknown comparisons as "=="
+        self.compare = DAILY_COMPARISONS.get(daily_comparison, np.equal)
+        self.compare_one = SCALAR_COMPARISONS[daily_comparison if daily_comparison in DAILY_COMPARISONS else "=="]
+
+    def passes(self, values: Any) -> np.ndarray:
+        return self.compare(as_matrix(values), self.daily_threshold)
+
+    def daily(self, values: Any) -> np.ndarray:
+        return np.where(self.passes(values), 100.0, 0.0)
+
+    def day_score(self, value: float) -> float:
+        return 100.0 if self.compare_one(value, self.daily_threshold) else 0.0
+
+    def progressive(self, values: Any) -> np.ndarray:
+        """100 while the goal is still reachable, then the best reachable percentage"""
+        passes = self.passes(values)
+        required = self.required_days
+        successes = np.cumsum(passes, axis=1)
+        max_possible = successes + remaining_days(passes)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            best_possible = np.minimum(100, np.maximum(0, (max_possible / required) * 100))
+        return np.where((successes >= required) | (max_possible >= required), 100.0, best_possible)
+
+    def weekly(self, values: Any) -> np.ndarray:
+        if self.daily_comparison not in DAILY_COMPARISONS:
+            raise ValueError(f"Unsupported comparison operator: {self.daily_comparison}")
+        required = self.required_days
+        successful_days = self.passes(values).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(successful_days >= required, 100.0, (successful_days / required) * 100)
+
+
+class WeeklyEliminationKernel(AdherenceKernel):
+    """Zero tolerance: any violation fails the rest of the period"""
+
+    method = "weekly_elimination"
+
+    def __init__(self, elimination_threshold: float = 0, elimination_comparison: str = "=="):
+        self.elimination_threshold = elimination_threshold
+        self.elimination_comparison = elimination_comparison
+        self.compare = DAILY_COMPARISONS.get(elimination_comparison)
+        self.compare_one = SCALAR_COMPARISONS[elimination_comparison] if self.compare is not None else None
+
+    def clean(self, values: Any) -> np.ndarray:
+        values = as_matrix(values)
+        if self.compare is None:
+            # Unknown comparisons never count as clean
+            return np.zeros(values.shape, dtype=bool)
+        return self.compare(values, self.elimination_threshold)
+
+    def daily(self, values: Any) -> np.ndarray:
+        return np.where(self.clean(values), 100.0, 0.0)
+
+    def day_score(self, value: float) -> float:
+        if self.compare_one is None:
+            return 0.0
+        return 100.0 if self.compare_one(value, self.elimination_threshold) else 0.0
+
+    def progressive(self, values: Any) -> np.ndarray:
+        return np.where(np.logical_and.accumulate(self.clean(values), axis=1), 100.0, 0.0)
+
+    def weekly(self, values: Any) -> np.ndarray:
+        if self.elimination_comparison not in DAILY_COMPARISONS:
+            raise ValueError(f"Unsupported comparison operator: {self.elimination_comparison}")
+        return np.where(self.clean(values).all(axis=1), 100.0, 0.0)
+
+
+class SumLimitKernel(AdherenceKernel):
+    """
+    Period total must stay at or under a limit (weekly or monthly sum limits)
+
+    Not tied to an algorithm class; built directly from the limit.
+    """
+
+    method = "weekly_elimination"
+
+    def __init__(self, limit: float):
+        self.limit = limit
+
+    def daily(self, values: Any) -> np.ndarray:
+        return np.where(as_matrix(values) <= self.limit, 100.0, 0.0)
+
+    def day_score(self, value: float) -> float:
+        return 100.0 if value <= self.limit else 0.0
+
+    def progressive(self, values: Any) -> np.ndarray:
+        return np.where(np.cumsum(as_matrix(values), axis=1) <= self.limit, 100.0, 0.0)
+
+    def weekly(self, values: Any) -> np.ndarray:
+        return np.where(row_sums(as_matrix(values)) > self.limit, 0.0, 100.0)
+
+
+class ProportionalFrequencyHybridKernel(AdherenceKernel):
+    """Proportional daily scores; weekly averages the top qualifying days"""
+
+    method = "proportional_frequency_hybrid"
+
+    def __init__(
+        self,
+        daily_target: float,
+        required_qualifying_days: int,
+        daily_minimum_threshold: float = 0,
+        minimum_threshold: float = 0,
+        maximum_cap: float = 100
+    ):
+        self.daily_target = daily_target
+        self.required_qualifying_days = required_qualifying_days
+        self.daily_minimum_threshold = daily_minimum_threshold
+        self.minimum_threshold = minimum_threshold
+        self.maximum_cap = maximum_cap
+
+    def daily(self, values: Any) -> np.ndarray:
+        values = as_matrix(values)
+        return np.where(values <= 0, 0.0, np.minimum((values / self.daily_target) * 100, self.maximum_cap))
+
+    def progressive(self, values: Any) -> np.ndarray:
+        """100 while enough qualifying days are still possible, 0 once they are not"""
+        qualifying = as_matrix(values) >= self.daily_minimum_threshold
+        required = self.required_qualifying_days
+        qualifying_count = np.cumsum(qualifying, axis=1)
+        reachable = (qualifying_count >= required) | (qualifying_count + remaining_days(qualifying) >= required)
+        return np.where(reachable, 100.0, 0.0)
+
+    def weekly(self, values: Any) -> np.ndarray:
+        values = as_matrix(values)
+        required = self.required_qualifying_days
+        daily_scores = self.daily(values)
+        qualifying = values >= self.daily_minimum_threshold
+
+        # Top required scores among qualifying days, highest first
+        ranked = -np.sort(np.where(qualifying, -daily_scores, np.inf), axis=1)
+        top_sum = row_sums(ranked[:, :required])
+        with np.errstate(invalid="ignore"):
+            weekly_score = np.minimum(np.maximum(top_sum / required, self.minimum_threshold), self.maximum_cap)
+        return np.where(qualifying.sum(axis=1) < required, float(self.minimum_threshold), weekly_score)
+
+
+class ZoneKernel(AdherenceKernel):
+    """Score of the zone each day falls in; weekly counts target-zone days"""
+
+    method = "zone_based"
+
+    def __init__(
+        self,
+        zones: Sequence[Tuple[float, float, float]],
+        graduated: bool = False,
+        frequency_target: Optional[int] = None
+    ):
+        """
+        Args:
+            zones: (min_value, max_value, score) per zone, in match order
+            graduated: Interpolate scores across each zone (grace range)
+            frequency_target: Target-zone days per week; None averages days
+        """
+        self.table = ZoneTable(zones)
+        self.graduated = graduated
+        self.frequency_target = frequency_target
+
+    def daily(self, values: Any) -> np.ndarray:
+        return self.table.scores(as_matrix(values), graduated=self.graduated)
+
+    def day_score(self, value: float) -> float:
+        return self.table.score(value, graduated=self.graduated)
+
+    def weekly(self, values: Any, target_zone_score: float = 100) -> np.ndarray:
+        daily_scores = self.daily(values)
+        if not self.frequency_target:
+            return row_means(daily_scores)
+        target_days = (daily_scores >= target_zone_score).sum(axis=1)
+        return np.where(target_days >= self.frequency_target, 100.0, (target_days / self.frequency_target) * 100)
+
+
+class ConstrainedWeeklyAllowanceKernel(AdherenceKernel):
+    """
+    Cumulative usage against the weekly allowance
+
+    weekly scores one standalone week; pass per-user available allowances
+    (see calculate_available_allowance) to include rollover.
+    """
+
+    method = "constrained_weekly_allowance"
+
+    def __init__(
+        self,
+        weekly_allowance: float,
+        penalty_for_overage: float = 0.0,
+        minimum_weekly_usage: float = 0.0,
+        max_days_per_week: Optional[int] = None
+    ):
+        self.weekly_allowance = weekly_allowance
+        self.penalty_for_overage = penalty_for_overage
+        self.minimum_weekly_usage = minimum_weekly_usage
+        self.max_days_per_week = max_days_per_week
+
+    def _overage_scores(self, usage: np.ndarray, allowance: Any) -> np.ndarray:
+        penalty = np.minimum((usage - allowance) * self.penalty_for_overage, 100.0)
+        return np.where(usage <= allowance, 100.0, np.maximum(0.0, 100.0 - penalty))
+
+    def daily(self, values: Any) -> np.ndarray:
+        return self._overage_scores(as_matrix(values), self.weekly_allowance)
+
+    def progressive(self, values: Any) -> np.ndarray:
+        return self._overage_scores(np.cumsum(as_matrix(values), axis=1), self.weekly_allowance)
+
+    def weekly(self, values: Any, available_allowance: Optional[Any] = None) -> np.ndarray:
+        values = as_matrix(values)
+        allowance = self.weekly_allowance if available_allowance is None else np.asarray(available_allowance, dtype=float)
+        weekly_usage = row_sums(values)
+
+        scores = self._overage_scores(weekly_usage, allowance)
+        scores = np.where(weekly_usage < self.minimum_weekly_usage, np.maximum(0.0, scores - 20.0), scores)
+        if self.max_days_per_week is not None:
+            days_used = (values > 0).sum(axis=1)
+            scores = np.where(days_used > self.max_days_per_week, 0.0, scores)
+        return scores
+
+
+# Operator string -> code for per-item comparisons
+_OPERATOR_CODES = {">=": 0, ">": 1, "=": 2, "==": 2, "<": 3, "<=": 4}
+
+
+class CategoricalFilterKernel(AdherenceKernel):
+    """
+    Category-specific thresholds, one table row per filter code
+
+    The last code is the default category, used for items no filter matches.
+    """
+
+    method = "categorical_filter_threshold"
+
+    def __init__(
+        self,
+        thresholds: Sequence[Any],
+        success_values: Sequence[float],
+        failure_values: Sequence[float],
+        comparison_operators: Sequence[Any]
+    ):
+        """
+        Args:
+            thresholds: Threshold per code (None counts as 0)
+            success_values: Score per code when the threshold is met
+            failure_values: Score per code otherwise
+            comparison_operators: Operator string or ComparisonOperator per
+                code; unknown operators never meet the threshold
+        """
+        self.thresholds = np.array([0 if t is None else t for t in thresholds], dtype=float)
+        self.success_values = np.array(success_values, dtype=float)
+        self.failure_values = np.array(failure_values, dtype=float)
+        self.operator_codes = np.array([
+            _OPERATOR_CODES.get(getattr(operator, "value", operator), -1) for operator in comparison_operators
+        ])
+        self.default_code = len(self.thresholds) - 1
+
+    def score_codes(self, category_codes: Any, values: Any) -> np.ndarray:
+        """
+        Per-item scores for arrays of category codes and measured values
+
+        The arrays may have any (matching) shape; the result has the same shape.
+        """
+        codes = np.asarray(category_codes, dtype=np.int64)
+        measured = np.asarray(values, dtype=float)
+        thresholds = self.thresholds[codes]
+        operators = self.operator_codes[codes]
+        meets = np.select(
+            [operators == 0, operators == 1, operators == 2, operators == 3, operators == 4],
+            [measured >= thresholds, measured > thresholds, measured == thresholds,
+             measured < thresholds, measured <= thresholds],
+            default=False
+        )
+        return np.where(meets, self.success_values[codes], self.failure_values[codes])
+
+    def _codes(self, values: np.ndarray, categories: Optional[Any]) -> np.ndarray:
+        if categories is None:
+            return np.full(values.shape, self.default_code, dtype=np.int64)
+        codes = np.asarray(categories, dtype=np.int64)
+        return codes[np.newaxis] if codes.ndim == 1 else codes
+
+    def daily(self, values: Any, categories: Optional[Any] = None) -> np.ndarray:
+        """
+        Args:
+            values: Daily measured values
+            categories: Matching matrix of category codes (see encode_categories)
+        """
+        values = as_matrix(values)
+        return self.score_codes(self._codes(values, categories), values)
+
+    def progressive(self, values: Any, categories: Optional[Any] = None) -> np.ndarray:
+        return self.daily(values, categories)
+
+    def weekly(self, values: Any, categories: Optional[Any] = None) -> np.ndarray:
+        return row_means(self.daily(values, categories))
+
+    def score(self, values: Any, categories: Optional[Any] = None) -> KernelScores:
+        daily = self.daily(values, categories)
+        return KernelScores(daily, daily, row_means(daily))
+
+
+class ComponentKernel(AdherenceKernel):
+    """
+    Per-day score from a (users x days x components) array
+
+    Subclasses score a (rows x components) matrix in batch_scores; missing
+    components (NaN) are masked out when skip_missing is set.
+    """
+
+    def __init__(self, skip_missing: bool = False):
+        self.skip_missing = skip_missing
+
+    @abc.abstractmethod
+    def batch_scores(self, values: Any, skip_missing: bool = False) -> np.ndarray:
+        """Score per row of a (rows x components) matrix"""
+
+    def daily(self, values: Any) -> np.ndarray:
+        values = as_matrix(values, ndim=3)
+        users, days, components = values.shape
+        scores = self.batch_scores(values.reshape(users * days, components), skip_missing=self.skip_missing)
+        return scores.reshape(users, days)
+
+
+class CompositeKernel(ComponentKernel):
+    """Weighted average of component scores, bounded to [minimum_threshold, maximum_cap]"""
+
+    method = "composite_weighted"
+
+    def __init__(
+        self,
+        field_names: Sequence[str],
+        weights: Sequence[float],
+        component_scorers: Sequence[Callable[[np.ndarray], np.ndarray]],
+        minimum_threshold: float = 0,
+        maximum_cap: float = 100,
+        skip_missing: bool = False
+    ):
+        """
+        Args:
+            field_names: Component field names, in column order
+            weights: Weight per component
+            component_scorers: Column scorer per component (float array in,
+                score array out)
+            minimum_threshold: Lowest composite score
+            maximum_cap: Highest composite score
+            skip_missing: Mask out missing components in daily
+        """
+        super().__init__(skip_missing)
+        self.field_names = list(field_names)
+        self.weights = np.array(weights, dtype=float)
+        self.component_scorers = list(component_scorers)
+        self.minimum_threshold = minimum_threshold
+        self.maximum_cap = maximum_cap
+
+    def batch_scores(self, values: Any, skip_missing: bool = False) -> np.ndarray:
+        """
+        Args:
+            values: (rows x components) matrix in component order; NaN marks a
+                missing value
+            skip_missing: Leave out missing components per row and average over
+                the rest, instead of raising
+        """
+        values = np.asarray(values, dtype=float)
+        if values.ndim != 2 or values.shape[1] != len(self.component_scorers):
+            raise ValueError(
+                f"Expected a (rows x {len(self.component_scorers)}) matrix of component values, got shape {values.shape}"
+            )
+
+        present = ~np.isnan(values)
+        if not skip_missing and not present.all():
+            row = int(np.argmin(present.all(axis=1)))
+            column = int(np.argmin(present[row]))
+            raise ValueError(f"Missing value for component: {self.field_names[column]}")
+
+        total_weighted_score = np.zeros(len(values))
+        total_weight = np.zeros(len(values))
+        # Accumulate in component order, as calculate_score does
+        for j, scores in enumerate(self.component_scorers):
+            weight = self.weights[j]
+            mask = present[:, j]
+            column_scores = scores(values[:, j])
+            total_weighted_score += np.where(mask, column_scores * weight, 0.0)
+            total_weight += np.where(mask, weight, 0.0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            composite = total_weighted_score / total_weight
+        composite = np.minimum(np.maximum(composite, self.minimum_threshold), self.maximum_cap)
+        return np.where(total_weight == 0, 0.0, composite)
+
+
+class SleepCompositeKernel(ComponentKernel):
+    """Sleep duration and consistency per day (columns duration, sleep variance, wake variance)"""
+
+    method = "sleep_composite"
+
+    def __init__(
+        self,
+        duration_zones: Sequence[Dict[str, Any]],
+        variance_thresholds: Sequence[Dict[str, Any]],
+        weights: Sequence[float],
+        skip_missing: bool = False
+    ):
+        """
+        Args:
+            duration_zones: {"range": [min, max), "score"} in match order
+            variance_thresholds: {"max_variance", "score"} in match order
+            weights: Duration, sleep consistency and wake consistency weights
+            skip_missing: Rescale the weights of present components in daily
+        """
+        super().__init__(skip_missing)
+        self.duration_table = ZoneTable(
+            [(zone["range"][0], zone["range"][1], float(zone["score"])) for zone in duration_zones],
+            include_max=False,
+            default=None
+        )
+        # Durations no zone covers score as the last zone
+        self.duration_fallback = float(duration_zones[-1]["score"])
+        # First threshold with variance < max_variance, via the running maximum
+        # of the bounds (matches the listed-order scan even if unsorted)
+        self.variance_bounds = list(accumulate(
+            (threshold["max_variance"] for threshold in variance_thresholds), max
+        ))
+        self.variance_scores = [float(threshold["score"]) for threshold in variance_thresholds] + [0.0]
+        self.weights = np.array(weights, dtype=float)
+        self._variance_bounds = np.array(self.variance_bounds, dtype=float)
+        self._variance_scores = np.array(self.variance_scores)
+
+    def duration_score(self, duration: float) -> float:
+        """Score for one night's sleep duration"""
+        score = self.duration_table.score(duration)
+        if score is not None:
+            return score
+        # Exactly at the max value of the optimal zone
+        if duration == 9.0:
+            return 100.0
+        return self.duration_fallback
+
+    def consistency_score(self, variance_minutes: float) -> float:
+        """Score for one sleep or wake time variance (0 for extreme variance)"""
+        return self.variance_scores[bisect.bisect_right(self.variance_bounds, variance_minutes)]
+
+    def batch_scores(self, values: Any, skip_missing: bool = False) -> np.ndarray:
+        """
+        Args:
+            values: (rows x 3) matrix of sleep data; NaN marks a missing value
+            skip_missing: Leave out missing components per row and rescale the
+                remaining weights, instead of scoring missing values as 0
+        """
+        values = np.asarray(values, dtype=float)
+        if values.ndim != 2 or values.shape[1] != 3:
+            raise ValueError(f"Expected a (rows x 3) matrix of sleep data, got shape {values.shape}")
+
+        present = ~np.isnan(values)
+        if not skip_missing:
+            values = np.where(present, values, 0.0)
+
+        durations = values[:, 0]
+        duration_scores = self.duration_table.scores(durations)
+        uncovered = np.isnan(duration_scores)
+        duration_scores[uncovered] = np.where(durations[uncovered] == 9.0, 100.0, self.duration_fallback)
+
+        sleep_scores = self._variance_scores[np.searchsorted(self._variance_bounds, values[:, 1], side="right")]
+        wake_scores = self._variance_scores[np.searchsorted(self._variance_bounds, values[:, 2], side="right")]
+
+        duration_weight, sleep_weight, wake_weight = self.weights
+        composite = (
+            (duration_scores * duration_weight) +
+            (sleep_scores * sleep_weight) +
+            (wake_scores * wake_weight)
+        )
+        if skip_missing:
+            contributions = np.column_stack([duration_scores, sleep_scores, wake_scores]) * self.weights
+            present_weight = present @ self.weights
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rescaled = np.where(present, contributions, 0.0).sum(axis=1) / present_weight * self.weights.sum()
+            composite = np.where(present.all(axis=1), composite, np.where(present_weight > 0, rescaled, 0.0))
+
+        return np.clip(composite, 0.0, 100.0)
@@ -15,6 +15,8 @@ from typing import List, Dict, Any, Union
 from dataclasses import dataclass
 import logging
 
+from .kernels import MinimumFrequencyKernel
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,6 +34,12 @@ class MinimumFrequencyAlgorithm:
     
     def __init__(self, config: MinimumFrequencyConfig):
         self.config = config
+        self.compile_kernel()
+    
+    def compile_kernel(self):
+        """Compile the vectorized scoring kernel for the current config."""
+        config = self.config
+        self.kernel = MinimumFrequencyKernel(config.daily_threshold, config.daily_comparison, config.required_days)
     
     def calculate_score(self, daily_values: List[float]) -> float:
         """Calculate weekly score based on frequency requirement."""
@@ -56,36 +64,7 @@ class MinimumFrequencyAlgorithm:
         Returns:
             List of progressive scores (what user sees each day)
         """
-        progressive_scores = []
-        successes = 0
-        
-        for day_idx, value in enumerate(daily_values):
-            # Check if this day meets threshold
-            if self.config.daily_comparison == "<=":
-                day_pass = value <= self.config.daily_threshold
-            elif self.config.daily_comparison == ">=":
-                day_pass = value >= self.config.daily_threshold
-            else:  # "=="
-                day_pass = value == self.config.daily_threshold
-            
-            if day_pass:
-                successes += 1
-            
-            remaining_days = len(daily_values) - (day_idx + 1)
-            max_possible_successes = successes + remaining_days
-            
-            if successes >= self.config.required_days:
-                # Already achieved full goal
-                progressive_scores.append(100)
-            elif max_possible_successes >= self.config.required_days:
-                # Can still achieve 100%
-                progressive_scores.append(100)
-            else:
-                # Calculate best possible achievement percentage
-                best_possible_score = (max_possible_successes / self.config.required_days) * 100
-                progressive_scores.append(min(100, max(0, best_possible_score)))
-        
-        return progressive_scores
+        return self.kernel.progressive(daily_values)[0].tolist()
 
 
 def calculate_minimum_frequency_score(
@@ -8,6 +8,7 @@ Supports minimum thresholds, maximum caps, and partial credit.
 from typing import Dict, Any, Union, List
 from dataclasses import dataclass
 from .binary_threshold import EvaluationPeriod, SuccessCriteria, CalculationMethod
+from .kernels import ProportionalKernel
 
 
 @dataclass
@@ -31,6 +32,21 @@ class ProportionalAlgorithm:
     
     def __init__(self, config: ProportionalConfig):
         self.config = config
+        self.compile_kernel()
+    
+    def compile_kernel(self):
+        """Compile the vectorized scoring kernel for the current config."""
+        config = self.config
+        self.kernel = ProportionalKernel(
+            config.target,
+            minimum_threshold=config.minimum_threshold,
+            maximum_cap=config.maximum_cap,
+            partial_credit=config.partial_credit,
+            is_weekly=(
+                config.evaluation_period == EvaluationPeriod.ROLLING_7_DAY or
+                'weekly' in config.frequency_requirement.lower()
+            )
+        )
     
     def calculate_score(self, actual_value: Union[float, int]) -> float:
         """
@@ -68,26 +84,7 @@ class ProportionalAlgorithm:
         Returns:
             List of progressive scores (what user sees each day)
         """
-        progressive_scores = []
-        
-        # Check if this is weekly evaluation
-        is_weekly = (self.config.evaluation_period == EvaluationPeriod.ROLLING_7_DAY or
-                    'weekly' in self.config.frequency_requirement.lower())
-        
-        if is_weekly:
-            # Weekly evaluation: show cumulative progress toward weekly target
-            cumulative_total = 0
-            for value in daily_values:
-                cumulative_total += value
-                cumulative_score = min((cumulative_total / self.config.target) * 100, self.config.maximum_cap)
-                progressive_scores.append(max(cumulative_score, self.config.minimum_threshold))
-        else:
-            # Daily evaluation: each day is independent
-            for value in daily_values:
-                score = self.calculate_score(value)
-                progressive_scores.append(score)
-        
-        return progressive_scores
+        return self.kernel.progressive(daily_values)[0].tolist()
     
     def validate_config(self) -> bool:
         """Validate the configuration parameters."""
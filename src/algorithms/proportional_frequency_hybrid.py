@@ -8,6 +8,7 @@ Solves the issue where partial progress gets no credit in frequency patterns.
 from typing import Dict, Any, List, Union, Tuple
 from dataclasses import dataclass
 from .binary_threshold import EvaluationPeriod, SuccessCriteria, CalculationMethod
+from .kernels import ProportionalFrequencyHybridKernel
 
 
 @dataclass
@@ -34,6 +35,18 @@ class ProportionalFrequencyHybridAlgorithm:
     def __init__(self, config: ProportionalFrequencyHybridConfig):
         self.config = config
         self._validate_config()
+        self.compile_kernel()
+    
+    def compile_kernel(self):
+        """Compile the vectorized scoring kernel for the current config."""
+        config = self.config
+        self.kernel = ProportionalFrequencyHybridKernel(
+            config.daily_target,
+            config.required_qualifying_days,
+            daily_minimum_threshold=config.daily_minimum_threshold,
+            minimum_threshold=config.minimum_threshold,
+            maximum_cap=config.maximum_cap
+        )
     
     def _validate_config(self):
         """Validate configuration parameters."""
@@ -81,32 +94,9 @@ class ProportionalFrequencyHybridAlgorithm:
         if len(daily_values) != self.config.total_days:
             raise ValueError(f"Expected {self.config.total_days} daily values, got {len(daily_values)}")
         
-        # Calculate daily scores
-        daily_scores = [self.calculate_daily_score(value) for value in daily_values]
-        
-        # Filter qualifying days (above minimum threshold)
-        qualifying_data = [
-            (score, value) 
-            for score, value in zip(daily_scores, daily_values) 
-            if value >= self.config.daily_minimum_threshold
-        ]
-        
-        # Check if we have enough qualifying days
-        if len(qualifying_data) < self.config.required_qualifying_days:
-            return self.config.minimum_threshold
-        
-        # Sort by score descending and take top N
-        qualifying_data.sort(key=lambda x: x[0], reverse=True)
-        top_scores = [score for score, _ in qualifying_data[:self.config.required_qualifying_days]]
-        
-        # Calculate average of top qualifying days
-        weekly_score = sum(top_scores) / len(top_scores)
-        
-        # Apply minimum threshold and maximum cap
-        weekly_score = max(weekly_score, self.config.minimum_threshold)
-        weekly_score = min(weekly_score, self.config.maximum_cap)
-        
-        return weekly_score
+        # Average of the top required_qualifying_days scores among qualifying
+        # days (above minimum threshold), within minimum_threshold and maximum_cap
+        return float(self.kernel.weekly(daily_values)[0])
     
     def calculate_progressive_scores(self, daily_values: List[Union[float, int]]) -> List[float]:
         """
@@ -120,24 +110,21 @@ class ProportionalFrequencyHybridAlgorithm:
         Returns:
             List of progressive scores (what user sees each day)
         """
-        progressive_scores = []
+        return self.kernel.progressive(daily_values)[0].tolist()
+    
+    def calculate_rolling_scores(self, daily_values: List[Union[float, int]], window: int = None) -> List[float]:
+        """
+        Calculate the weekly score of every window of a long daily history.
         
-        for day_idx in range(len(daily_values)):
-            # Calculate current qualifying days up to this point
-            current_values = daily_values[:day_idx + 1]
-            qualifying_count = sum(1 for value in current_values if value >= self.config.daily_minimum_threshold)
-            
-            remaining_days = len(daily_values) - (day_idx + 1)
-            can_still_achieve = (qualifying_count + remaining_days) >= self.config.required_qualifying_days
+        Args:
+            daily_values: Daily measured values, oldest first
+            window: Days per window (defaults to total_days)
             
-            if qualifying_count >= self.config.required_qualifying_days:
-                progressive_scores.append(100.0)  # Already achieved
-            elif can_still_achieve:
-                progressive_scores.append(100.0)  # Still possible
-            else:
-                progressive_scores.append(0.0)   # Impossible now
-        
-        return progressive_scores
+        Returns:
+            One score per window, matching calculate_weekly_score on that slice
+        """
+        from .rolling_window import calculate_rolling_hybrid_scores
+        return calculate_rolling_hybrid_scores(self, daily_values, window)
     
     def get_daily_breakdown(self, daily_values: List[Union[float, int]]) -> Dict[str, Any]:
         """
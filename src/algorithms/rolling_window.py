@@ -0,0 +1,230 @@
+"""
+Rolling Window Adherence Evaluator
+==================================
+
+Scores every N-day window of a long daily history in a single pass, for trend
+charts and backfills that need a score per day over months of data.
+
+The weekly scorers (calculate_minimum_frequency_score,
+calculate_weekly_elimination_score, ProportionalFrequencyHybridAlgorithm.
+calculate_weekly_score) take exactly one window and recompute it from scratch;
+scoring a year of rolling weeks with them means 365 independent calls. Here
+each window is derived from the previous one:
+- Pass/violation counts and totals come from prefix sums
+- The best day of a window comes from a monotonic deque
+- Larger top-N selections keep the window's scores in sorted order
+
+Window i covers daily_values[i:i + window], so a history of n days yields
+n - window + 1 scores, each equal to the weekly scorer's result for that slice.
+"""
+
+import bisect
+from collections import deque
+from itertools import accumulate
+from typing import Any, List, Union
+
+Number = Union[float, int]
+
+SUPPORTED_COMPARISONS = ("<=", ">=", "==")
+
+
+def _meets(value: Number, threshold: Number, comparison: str) -> bool:
+    if comparison == "<=":
+        return value <= threshold
+    elif comparison == ">=":
+        return value >= threshold
+    return value == threshold
+
+
+def _check_window(window: int) -> None:
+    if not isinstance(window, int) or window < 1:
+        raise ValueError(f"window must be a positive integer, got {window}")
+
+
+def rolling_sums(values: List[Number], window: int) -> List[Number]:
+    """
+    Sum of every window-length slice, from prefix sums
+
+    Returns:
+        len(values) - window + 1 sums (empty if the history is shorter than window)
+    """
+    _check_window(window)
+    prefix = [0] + list(accumulate(values))
+    return [prefix[end] - prefix[end - window] for end in range(window, len(prefix))]
+
+
+def rolling_counts(flags: List[bool], window: int) -> List[int]:
+    """Number of True flags in every window-length slice"""
+    return rolling_sums([1 if flag else 0 for flag in flags], window)
+
+
+def sliding_max(values: List[Number], window: int) -> List[Number]:
+    """
+    Maximum of every window-length slice
+
+    Uses a deque of indices whose values decrease from front to back, so each
+    value is pushed and popped at most once.
+    """
+    _check_window(window)
+    result = []
+    candidates = deque()
+    for i, value in enumerate(values):
+        while candidates and values[candidates[-1]] <= value:
+            candidates.pop()
+        candidates.append(i)
+        if candidates[0] <= i - window:
+            candidates.popleft()
+        if i >= window - 1:
+            result.append(values[candidates[0]])
+    return result
+
+
+def calculate_rolling_minimum_frequency_scores(
+    daily_values: List[Number],
+    daily_threshold: Number,
+    daily_comparison: str,
+    required_days: int,
+    window: int = 7
+) -> List[float]:
+    """
+    SC-MINIMUM-FREQUENCY score of every window
+
+    Args:
+        daily_values: Daily measurements, oldest first
+        daily_threshold: The threshold each day must meet
+        daily_comparison: Comparison operator ("<=", ">=", "==")
+        required_days: Minimum number of days per window that must meet threshold
+        window: Days per evaluation window
+
+    Returns:
+        Scores matching calculate_minimum_frequency_score for each window
+    """
+    if daily_comparison not in SUPPORTED_COMPARISONS:
+        raise ValueError(f"Unsupported comparison operator: {daily_comparison}")
+
+    successes = rolling_counts(
+        [_meets(value, daily_threshold, daily_comparison) for value in daily_values], window
+    )
+    return [
+        100 if count >= required_days else (count / required_days) * 100
+        for count in successes
+    ]
+
+
+def calculate_rolling_elimination_scores(
+    daily_values: List[Number],
+    elimination_threshold: Number = 0,
+    elimination_comparison: str = "==",
+    window: int = 7
+) -> List[int]:
+    """
+    SC-WEEKLY-ELIMINATION score of every window (any violation fails the window)
+
+    Returns:
+        Scores matching calculate_weekly_elimination_score for each window
+    """
+    if elimination_comparison not in SUPPORTED_COMPARISONS:
+        raise ValueError(f"Unsupported comparison operator: {elimination_comparison}")
+
+    violations = rolling_counts(
+        [not _meets(value, elimination_threshold, elimination_comparison) for value in daily_values],
+        window
+    )
+    return [100 if count == 0 else 0 for count in violations]
+
+
+def calculate_rolling_limit_scores(
+    daily_values: List[Number],
+    weekly_limit: Number,
+    window: int = 7
+) -> List[int]:
+    """
+    SC-WEEKLY-ELIMINATION weekly sum limit score of every window
+
+    Returns:
+        Scores matching calculate_weekly_limit_score for each window (totals
+        of fractional values may differ from sum() in the last bit)
+    """
+    return [0 if total > weekly_limit else 100 for total in rolling_sums(daily_values, window)]
+
+
+def calculate_rolling_hybrid_scores(algorithm, daily_values: List[Number], window: int = None) -> List[float]:
+    """
+    Proportional frequency hybrid weekly score of every window
+
+    Each window averages its top required_qualifying_days daily scores among
+    qualifying days. A single required day is a sliding maximum; otherwise
+    the window's qualifying scores are kept sorted as days enter and leave.
+
+    Args:
+        algorithm: ProportionalFrequencyHybridAlgorithm
+        daily_values: Daily measurements, oldest first
+        window: Days per window (defaults to the config's total_days)
+
+    Returns:
+        Scores matching calculate_weekly_score for each window
+    """
+    config = algorithm.config
+    window = config.total_days if window is None else window
+    _check_window(window)
+    required = config.required_qualifying_days
+
+    daily_scores = [algorithm.calculate_daily_score(value) for value in daily_values]
+    qualifying = [value >= config.daily_minimum_threshold for value in daily_values]
+    counts = rolling_counts(qualifying, window)
+
+    if required == 1:
+        # Non-qualifying days can never be the best qualifying day
+        top_sums = sliding_max(
+            [score if ok else float("-inf") for score, ok in zip(daily_scores, qualifying)], window
+        )
+    else:
+        top_sums = []
+        in_window: List[float] = []
+        for i, (score, ok) in enumerate(zip(daily_scores, qualifying)):
+            if ok:
+                bisect.insort(in_window, score)
+            if i >= window:
+                leaving = i - window
+                if qualifying[leaving]:
+                    del in_window[bisect.bisect_left(in_window, daily_scores[leaving])]
+            if i >= window - 1:
+                # Same summation order as calculate_weekly_score (highest first)
+                top_sums.append(sum(reversed(in_window[-required:])) if len(in_window) >= required else None)
+
+    scores = []
+    for count, top_sum in zip(counts, top_sums):
+        if count < required:
+            scores.append(config.minimum_threshold)
+            continue
+        weekly_score = top_sum / required
+        weekly_score = max(weekly_score, config.minimum_threshold)
+        scores.append(min(weekly_score, config.maximum_cap))
+    return scores
+
+
+def calculate_progressive_scores_by_period(
+    algorithm: Any,
+    daily_values: List[Any],
+    period: int = 7
+) -> List[float]:
+    """
+    Progressive (what the user saw each day) scores over a long history
+
+    The history is split into consecutive periods, oldest first, and each is
+    scored with the algorithm's calculate_progressive_scores. A trailing
+    partial period is left out, since its remaining days are not known yet.
+
+    Args:
+        algorithm: Any algorithm with calculate_progressive_scores
+        daily_values: Daily values (or daily records) in the form the algorithm takes
+        period: Days per evaluation period
+
+    Returns:
+        One progressive score per day of every complete period
+    """
+    _check_window(period)
+    scores: List[float] = []
+    for start in range(0, len(daily_values) - period + 1, period):
+        scores.extend(algorithm.calculate_progressive_scores(daily_values[start:start + period]))
+    return scores
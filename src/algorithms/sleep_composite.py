@@ -16,8 +16,15 @@ from typing import Dict, Any, Union, List
 from dataclasses import dataclass
 import logging
 
+import numpy as np
+
+from .kernels import SleepCompositeKernel
+
 logger = logging.getLogger(__name__)
 
+# Column order of calculate_batch_scores
+SLEEP_FIELDS = ("sleep_duration", "sleep_time_consistency", "wake_time_consistency")
+
 
 @dataclass
 class SleepCompositeConfig:
@@ -62,6 +69,11 @@ class SleepCompositeAlgorithm:
     
     def __init__(self, config: SleepCompositeConfig):
         self.config = config
+        self.kernel = SleepCompositeKernel(
+            config.duration_zones,
+            config.variance_thresholds,
+            [config.duration_weight, config.sleep_consistency_weight, config.wake_consistency_weight]
+        )
     
     def calculate_score(self, sleep_data: Dict[str, Union[float, int]]) -> float:
         """
@@ -72,6 +84,8 @@ class SleepCompositeAlgorithm:
                 - sleep_duration: Hours of sleep (float)
                 - sleep_time_consistency: Variance in minutes (float) 
                 - wake_time_consistency: Variance in minutes (float)
+                (SleepConsistencyTracker.add_night produces these from
+                nightly bed and wake times)
                 
         Returns:
             Composite sleep score (0-100)
@@ -97,26 +111,27 @@ class SleepCompositeAlgorithm:
     
     def _calculate_duration_score(self, duration: float) -> float:
         """Calculate score for sleep duration using zone-based logic"""
-        for zone in self.config.duration_zones:
-            min_val, max_val = zone["range"]
-            if min_val <= duration < max_val:
-                return float(zone["score"])
-        
-        # Handle edge case: exactly at max value of optimal zone
-        if duration == 9.0:  # Exactly 9 hours
-            return 100.0
-        
-        # Fallback to last zone for values beyond defined ranges
-        return float(self.config.duration_zones[-1]["score"])
+        return self.kernel.duration_score(duration)
     
     def _calculate_consistency_score(self, variance_minutes: float) -> float:
         """Calculate score for sleep/wake consistency using variance thresholds"""
-        for threshold in self.config.variance_thresholds:
-            if variance_minutes < threshold["max_variance"]:
-                return float(threshold["score"])
+        return self.kernel.consistency_score(variance_minutes)
+    
+    def calculate_batch_scores(self, values: Any, skip_missing: bool = False) -> np.ndarray:
+        """
+        Score a (rows x 3) matrix of sleep data in one pass.
         
-        # Fallback to 0 for extreme variance
-        return 0.0
+        Args:
+            values: Columns sleep_duration, sleep_time_consistency and
+                wake_time_consistency; NaN marks a missing value
+            skip_missing: Leave out missing components per row and rescale the
+                remaining weights, instead of scoring missing values as 0
+                (as calculate_score does for absent keys)
+            
+        Returns:
+            Composite score per row, matching calculate_score
+        """
+        return self.kernel.batch_scores(values, skip_missing=skip_missing)
     
     def calculate_progressive_scores(self, daily_sleep_data: List[Dict[str, Union[float, int]]]) -> List[float]:
         """
@@ -128,13 +143,12 @@ class SleepCompositeAlgorithm:
         Returns:
             List of daily composite scores
         """
-        progressive_scores = []
-        
-        for daily_data in daily_sleep_data:
-            score = self.calculate_score(daily_data)
-            progressive_scores.append(score)
-        
-        return progressive_scores
+        # Absent fields score as 0, as in calculate_score
+        matrix = [
+            [daily_data.get(field, 0) for field in SLEEP_FIELDS]
+            for daily_data in daily_sleep_data
+        ]
+        return self.kernel.progressive(np.array(matrix, dtype=float).reshape(-1, len(SLEEP_FIELDS))).ravel().tolist()
     
     def get_component_breakdown(self, sleep_data: Dict[str, Union[float, int]]) -> Dict[str, Any]:
         """
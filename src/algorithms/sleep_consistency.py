@@ -0,0 +1,221 @@
+"""
+Streaming Sleep Consistency
+
+Turns nightly bedtime and wake timestamps into the sleep_time_consistency
+and wake_time_consistency inputs of SleepCompositeAlgorithm, updating per
+night instead of recomputing from stored history on every sync.
+
+Key Features:
+- Clock times are angles on a 24 hour circle, so 23:30 and 00:30 are an
+  hour apart and their mean is midnight (not noon)
+- Each user keeps a rolling window of nights; the mean unit vector of the
+  window is updated Welford-style as a night joins and the oldest leaves,
+  O(1) per night
+- Consistency is the circular standard deviation of the window in minutes,
+  sqrt(-2 ln R) where R is the mean resultant length, which matches the
+  ordinary standard deviation for tightly grouped times
+"""
+
+import math
+import threading
+from collections import deque
+from datetime import datetime, time
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Union
+
+import numpy as np
+
+MINUTES_PER_DAY = 1440
+DEFAULT_WINDOW_NIGHTS = 7
+
+ClockValue = Union[datetime, time, str, float, int]
+
+
+def clock_minutes(value: ClockValue) -> float:
+    """
+    Minutes after midnight of a clock time
+
+    Accepts datetimes, times, "HH:MM[:SS]" or ISO datetime strings, and
+    numbers of minutes (wrapped into one day).
+    """
+    if isinstance(value, (datetime, time)):
+        return value.hour * 60 + value.minute + value.second / 60
+    if isinstance(value, str):
+        try:
+            return clock_minutes(time.fromisoformat(value))
+        except ValueError:
+            try:
+                return clock_minutes(datetime.fromisoformat(value))
+            except ValueError:
+                raise ValueError(f"Invalid clock time: {value!r}")
+    return float(value) % MINUTES_PER_DAY
+
+
+def circular_difference(minutes: float, reference: float) -> float:
+    """Signed minutes from reference to minutes, the short way round [-720, 720)"""
+    return (minutes - reference + MINUTES_PER_DAY / 2) % MINUTES_PER_DAY - MINUTES_PER_DAY / 2
+
+
+class RollingCircularStats:
+    """Circular mean and spread of the most recent window clock times"""
+
+    def __init__(self, window: int = DEFAULT_WINDOW_NIGHTS):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self._angles = deque()
+        self._mean_cos = 0.0
+        self._mean_sin = 0.0
+
+    def __len__(self) -> int:
+        return len(self._angles)
+
+    def add(self, minutes: float) -> None:
+        """Add a clock time (minutes after midnight), evicting the oldest if full"""
+        if len(self._angles) == self.window:
+            self._evict()
+        angle = 2 * math.pi * (minutes % MINUTES_PER_DAY) / MINUTES_PER_DAY
+        self._angles.append(angle)
+        n = len(self._angles)
+        self._mean_cos += (math.cos(angle) - self._mean_cos) / n
+        self._mean_sin += (math.sin(angle) - self._mean_sin) / n
+
+    def _evict(self) -> None:
+        angle = self._angles.popleft()
+        n = len(self._angles)
+        if n == 0:
+            self._mean_cos = self._mean_sin = 0.0
+            return
+        self._mean_cos -= (math.cos(angle) - self._mean_cos) / n
+        self._mean_sin -= (math.sin(angle) - self._mean_sin) / n
+
+    @property
+    def resultant_length(self) -> float:
+        """Mean resultant length R (1 = identical times, 0 = spread evenly)"""
+        return min(1.0, math.hypot(self._mean_cos, self._mean_sin))
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Circular mean in minutes after midnight (None when empty or undefined)"""
+        if not self._angles or self.resultant_length < 1e-12:
+            return None
+        angle = math.atan2(self._mean_sin, self._mean_cos)
+        return (angle * MINUTES_PER_DAY / (2 * math.pi)) % MINUTES_PER_DAY
+
+    @property
+    def std_minutes(self) -> Optional[float]:
+        """Circular standard deviation in minutes (None when empty)"""
+        if not self._angles:
+            return None
+        r = self.resultant_length
+        if r <= 0:
+            return float("inf")
+        return math.sqrt(-2 * math.log(r)) * MINUTES_PER_DAY / (2 * math.pi)
+
+
+class SleepConsistencyTracker:
+    """Per-user rolling bedtime and wake time consistency"""
+
+    def __init__(self, window_nights: int = DEFAULT_WINDOW_NIGHTS):
+        """
+        Initialize the tracker
+
+        Args:
+            window_nights: Most recent nights each consistency covers
+        """
+        if window_nights < 1:
+            raise ValueError("window_nights must be at least 1")
+        self.window_nights = window_nights
+        self._bedtimes: Dict[Hashable, RollingCircularStats] = {}
+        self._wake_times: Dict[Hashable, RollingCircularStats] = {}
+        self._durations: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._bedtimes)
+
+    def add_night(self, user_id: Hashable, bedtime: ClockValue, wake_time: ClockValue) -> Dict[str, Any]:
+        """
+        Record one night and return the user's updated sleep data
+
+        Args:
+            user_id: User the night belongs to
+            bedtime: When the user went to sleep
+            wake_time: When the user woke up
+
+        Returns:
+            Sleep data for SleepCompositeAlgorithm.calculate_score, plus each
+            time's deviation from the rolling mean before this night joined
+        """
+        bed_minutes = clock_minutes(bedtime)
+        wake_minutes = clock_minutes(wake_time)
+        if isinstance(bedtime, datetime) and isinstance(wake_time, datetime):
+            duration = (wake_time - bedtime).total_seconds() / 3600
+        else:
+            duration = ((wake_minutes - bed_minutes) % MINUTES_PER_DAY) / 60
+
+        with self._lock:
+            bedtimes = self._bedtimes.get(user_id)
+            if bedtimes is None:
+                bedtimes = self._bedtimes[user_id] = RollingCircularStats(self.window_nights)
+                self._wake_times[user_id] = RollingCircularStats(self.window_nights)
+            wake_times = self._wake_times[user_id]
+
+            bed_mean, wake_mean = bedtimes.mean, wake_times.mean
+            bedtimes.add(bed_minutes)
+            wake_times.add(wake_minutes)
+            self._durations[user_id] = duration
+
+            sleep_data = self._sleep_data(user_id)
+
+        sleep_data["sleep_time_deviation"] = None if bed_mean is None else circular_difference(bed_minutes, bed_mean)
+        sleep_data["wake_time_deviation"] = None if wake_mean is None else circular_difference(wake_minutes, wake_mean)
+        return sleep_data
+
+    def _sleep_data(self, user_id: Hashable) -> Dict[str, Any]:
+        if user_id not in self._bedtimes:
+            return {}
+        return {
+            "sleep_duration": self._durations[user_id],
+            "sleep_time_consistency": self._bedtimes[user_id].std_minutes,
+            "wake_time_consistency": self._wake_times[user_id].std_minutes
+        }
+
+    def sleep_data(self, user_id: Hashable, sleep_duration: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Current sleep data for SleepCompositeAlgorithm.calculate_score
+
+        Args:
+            user_id: User to report
+            sleep_duration: Duration to score instead of the latest night's
+
+        Returns:
+            sleep_duration and both consistencies (empty for unknown users)
+        """
+        data = self._sleep_data(user_id)
+        if sleep_duration is not None:
+            data["sleep_duration"] = sleep_duration
+        return data
+
+    def sleep_matrix(self, user_ids: Sequence[Hashable]) -> np.ndarray:
+        """
+        (users x 3) matrix for SleepCompositeAlgorithm.calculate_batch_scores
+
+        Unknown users get a row of NaN.
+        """
+        matrix = np.full((len(user_ids), 3), np.nan)
+        for i, user_id in enumerate(user_ids):
+            data = self._sleep_data(user_id)
+            if data:
+                matrix[i] = [data["sleep_duration"], data["sleep_time_consistency"], data["wake_time_consistency"]]
+        return matrix
+
+    def users(self) -> List[Hashable]:
+        """Users with at least one night recorded"""
+        return list(self._bedtimes)
+
+    def remove_user(self, user_id: Hashable) -> None:
+        """Drop all of a user's nights"""
+        with self._lock:
+            self._bedtimes.pop(user_id, None)
+            self._wake_times.pop(user_id, None)
+            self._durations.pop(user_id, None)
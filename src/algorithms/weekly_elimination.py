@@ -16,6 +16,8 @@ from typing import List, Dict, Any, Union
 from dataclasses import dataclass
 import logging
 
+from .kernels import WeeklyEliminationKernel
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,6 +33,11 @@ class WeeklyEliminationAlgorithm:
     
     def __init__(self, config: WeeklyEliminationConfig):
         self.config = config
+        self.compile_kernel()
+    
+    def compile_kernel(self):
+        """Compile the vectorized scoring kernel for the current config."""
+        self.kernel = WeeklyEliminationKernel(self.config.elimination_threshold, self.config.elimination_comparison)
     
     def calculate_score(self, daily_values: List[float]) -> float:
         """Calculate weekly score based on elimination requirement."""
@@ -53,27 +60,8 @@ class WeeklyEliminationAlgorithm:
         Returns:
             List of progressive scores (what user sees each day)
         """
-        progressive_scores = []
-        week_still_clean = True
-        
-        for value in daily_values:
-            # Check if this day meets elimination criteria
-            if self.config.elimination_comparison == "==":
-                day_clean = value == self.config.elimination_threshold
-            elif self.config.elimination_comparison == "<=":
-                day_clean = value <= self.config.elimination_threshold
-            elif self.config.elimination_comparison == ">=":
-                day_clean = value >= self.config.elimination_threshold
-            else:
-                day_clean = False
-            
-            if not day_clean:
-                week_still_clean = False
-            
-            # Once violated, entire week fails (zero tolerance)
-            progressive_scores.append(100 if week_still_clean else 0)
-        
-        return progressive_scores
+        # Once violated, entire week fails (zero tolerance)
+        return self.kernel.progressive(daily_values)[0].tolist()
 
 
 def calculate_weekly_elimination_score(
@@ -0,0 +1,131 @@
+"""
+Weekly History Store
+
+Multi-user store of weekly allowance outcomes, shared by every
+ConstrainedWeeklyAllowanceAlgorithm evaluating the same recommendation.
+
+Key Features:
+- Records keyed by (user, ISO week number), where the week number is a
+  running count of ISO weeks so the previous week is always number - 1
+- Each user's weeks are kept in sorted order, so recent-week trends never sort
+- Bounded retention: weeks older than retention_weeks before a user's newest
+  week are dropped as new weeks arrive
+"""
+
+import bisect
+import threading
+from datetime import date
+from typing import Dict, Hashable, List, NamedTuple, Optional, Tuple, Union
+
+
+DEFAULT_RETENTION_WEEKS = 104
+
+
+def iso_week_number(week_identifier: Union[str, int]) -> int:
+    """
+    Running ISO week number of a "YYYY-Www" identifier
+
+    Consecutive ISO weeks map to consecutive integers, across year boundaries.
+    """
+    if isinstance(week_identifier, int):
+        return week_identifier
+    try:
+        year, week = week_identifier.split("-W")
+        monday = date.fromisocalendar(int(year), int(week), 1)
+    except (AttributeError, ValueError):
+        raise ValueError(f"Invalid ISO week identifier: {week_identifier!r}")
+    return (monday.toordinal() - 1) // 7
+
+
+def iso_week_identifier(week_number: int) -> str:
+    """"YYYY-Www" identifier of a running ISO week number"""
+    year, week, _ = date.fromordinal(week_number * 7 + 1).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class WeekRecord(NamedTuple):
+    usage: float
+    allowance: float
+    overage: float
+    score: float
+    days_used: Optional[int] = None
+    max_days: Optional[int] = None
+
+    def as_dict(self) -> Dict[str, float]:
+        """History entry in the algorithm's summary format"""
+        data = {
+            "usage": self.usage,
+            "allowance": self.allowance,
+            "overage": self.overage,
+            "score": self.score
+        }
+        if self.days_used is not None:
+            data["days_used"] = self.days_used
+            data["max_days"] = self.max_days
+        return data
+
+
+class WeeklyHistoryStore:
+    """Bounded per-user weekly allowance history"""
+
+    def __init__(self, retention_weeks: Optional[int] = DEFAULT_RETENTION_WEEKS):
+        """
+        Initialize the store
+
+        Args:
+            retention_weeks: Weeks kept per user, counting back from the user's
+                newest week (None keeps everything)
+        """
+        if retention_weeks is not None and retention_weeks < 1:
+            raise ValueError("retention_weeks must be at least 1")
+        self.retention_weeks = retention_weeks
+        self._records: Dict[Tuple[Hashable, int], WeekRecord] = {}
+        self._weeks: Dict[Hashable, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, user_id: Hashable, week: Union[str, int]) -> Optional[WeekRecord]:
+        """Record for one user and week, if stored"""
+        return self._records.get((user_id, iso_week_number(week)))
+
+    def previous(self, user_id: Hashable, week: Union[str, int]) -> Optional[WeekRecord]:
+        """Record for the week before week, if stored"""
+        return self._records.get((user_id, iso_week_number(week) - 1))
+
+    def put(self, user_id: Hashable, week: Union[str, int], record: WeekRecord) -> None:
+        """Store (or replace) a user's record for a week and apply retention"""
+        week = iso_week_number(week)
+        with self._lock:
+            weeks = self._weeks.setdefault(user_id, [])
+            if (user_id, week) not in self._records:
+                if not weeks or week > weeks[-1]:
+                    weeks.append(week)
+                else:
+                    bisect.insort(weeks, week)
+            self._records[(user_id, week)] = record
+
+            if self.retention_weeks is not None:
+                oldest_kept = weeks[-1] - self.retention_weeks + 1
+                expired = bisect.bisect_left(weeks, oldest_kept)
+                for old_week in weeks[:expired]:
+                    del self._records[(user_id, old_week)]
+                del weeks[:expired]
+
+    def weeks(self, user_id: Hashable) -> List[int]:
+        """A user's stored week numbers, oldest first"""
+        return list(self._weeks.get(user_id, ()))
+
+    def recent(self, user_id: Hashable, num_weeks: int) -> List[Tuple[int, WeekRecord]]:
+        """A user's newest num_weeks stored weeks, oldest first"""
+        weeks = self._weeks.get(user_id, [])
+        if num_weeks <= 0:
+            return []
+        return [(week, self._records[(user_id, week)]) for week in weeks[-num_weeks:]]
+
+    def remove_user(self, user_id: Hashable) -> None:
+        """Drop all of a user's history"""
+        with self._lock:
+            for week in self._weeks.pop(user_id, []):
+                del self._records[(user_id, week)]
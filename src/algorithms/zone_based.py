@@ -8,6 +8,7 @@ Supports 5-tier zone system with configurable ranges and scores.
 from typing import Dict, Any, Union, List
 from dataclasses import dataclass
 from .binary_threshold import EvaluationPeriod, SuccessCriteria, CalculationMethod
+from .kernels import ZoneKernel
 
 
 @dataclass
@@ -45,6 +46,22 @@ class ZoneBasedAlgorithm:
         self.config = config
         self.frequency_target = frequency_target  # For frequency-based evaluation
         self._validate_zones()
+        self.compile_zones()
+    
+    def compile_zones(self) -> None:
+        """
+        Compile config.zones into the zone kernel's lookup table.
+        
+        Called on construction and by validate_config; call it again after
+        editing config.zones in place.
+        """
+        # Zones are matched in min_value order; a shared boundary belongs to the lower zone
+        sorted_zones = sorted(self.config.zones, key=lambda z: z.min_value)
+        self.kernel = ZoneKernel(
+            [(zone.min_value, zone.max_value, zone.score) for zone in sorted_zones],
+            graduated=self.config.grace_range and self.config.boundary_handling == "graduated",
+            frequency_target=self.frequency_target
+        )
     
     def calculate_score(self, actual_value: Union[float, int]) -> float:
         """
@@ -54,32 +71,21 @@ class ZoneBasedAlgorithm:
             actual_value: The measured value to evaluate
             
         Returns:
-            Score based on the zone the value falls into
+            Score based on the zone the value falls into (0 outside all zones)
         """
-        # Sort zones by min_value to ensure we find the first matching zone
-        sorted_zones = sorted(self.config.zones, key=lambda z: z.min_value)
-        
-        for zone in sorted_zones:
-            if zone.contains(actual_value):
-                if self.config.grace_range and self.config.boundary_handling == "graduated":
-                    return self._apply_graduated_scoring(actual_value, zone)
-                return zone.score
-        
-        # Value doesn't fall in any zone - return 0
-        return 0.0
+        return self.kernel.day_score(actual_value)
     
-    def _apply_graduated_scoring(self, value: Union[float, int], zone: Zone) -> float:
-        """Apply graduated scoring near zone boundaries."""
-        zone_width = zone.max_value - zone.min_value
-        if zone_width == 0:
-            return zone.score
-        
-        # Calculate position within zone (0.0 to 1.0)
-        position = (value - zone.min_value) / zone_width
+    def calculate_scores(self, actual_values: List[Union[float, int]]) -> List[float]:
+        """
+        Calculate zone scores for many values at once.
         
-        # Apply a small gradient based on position
-        gradient_factor = 0.95 + (0.05 * position)  # 95% to 100% of zone score
-        return zone.score * gradient_factor
+        Args:
+            actual_values: Measured values to evaluate
+            
+        Returns:
+            Scores matching calculate_score for each value
+        """
+        return self.kernel.daily(actual_values)[0].tolist()
     
     def _validate_zones(self):
         """Validate zone configuration."""
@@ -119,26 +125,22 @@ class ZoneBasedAlgorithm:
                 raise ValueError(f"Missing required field: {field}")
         
         self._validate_zones()
+        self.compile_zones()
         return True
     
     def calculate_weekly_frequency_score(self, daily_values: List[Union[float, int]], target_zone_score: float = 100) -> float:
-        """Calculate weekly score based on frequency of hitting target zone."""
-        if not self.frequency_target:
-            # No frequency requirement, return average of daily scores
-            daily_scores = [self.calculate_score(value) for value in daily_values]
-            return sum(daily_scores) / len(daily_scores)
+        """
+        Calculate weekly score based on frequency of hitting target zone.
         
-        # Count days that hit the target zone (e.g., optimal sleep = 100 points)
-        target_days = 0
-        for value in daily_values:
-            if self.calculate_score(value) >= target_zone_score:
-                target_days += 1
+        Without a frequency target this is the average daily score; otherwise
+        the share of frequency_target days whose score reaches target_zone_score.
         
-        # Calculate achievement ratio
-        if target_days >= self.frequency_target:
-            return 100.0  # Full achievement
-        else:
-            return (target_days / self.frequency_target) * 100
+        Raises:
+            ValueError: No daily values and no frequency target to score against
+        """
+        if not self.frequency_target and not daily_values:
+            raise ValueError("No daily values to average")
+        return float(self.kernel.weekly(daily_values, target_zone_score=target_zone_score)[0])
     
     def get_formula(self) -> str:
         """Return the algorithm formula as a string."""
@@ -158,13 +160,7 @@ class ZoneBasedAlgorithm:
         Returns:
             List of progressive scores (what user sees each day)
         """
-        progressive_scores = []
-        
-        for value in daily_values:
-            score = self.calculate_score(value)
-            progressive_scores.append(score)
-        
-        return progressive_scores
+        return self.kernel.progressive(daily_values)[0].tolist()
     
     def get_zone_info(self) -> str:
         """Return information about all zones."""
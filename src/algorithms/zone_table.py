@@ -0,0 +1,126 @@
+"""
+Zone Lookup Tables
+
+Compiles a list of scoring zones once into sorted boundary arrays, so each
+lookup is a binary search (bisect for one value, numpy searchsorted for
+many) instead of a scan over the zones.
+
+The boundaries split the number line into points and the open gaps between
+them; which zone covers each piece is resolved once at compile time with the
+same first-match-in-order rule as a linear scan. That keeps the exact
+semantics of the scans it replaces, including inclusive or half-open upper
+bounds, shared boundaries, gaps and even overlapping zones.
+"""
+
+import bisect
+import math
+from typing import Any, Sequence, Tuple, Union
+
+import numpy as np
+
+Number = Union[float, int]
+
+
+class ZoneTable:
+    """Compiled first-match zone lookup."""
+
+    def __init__(
+        self,
+        zones: Sequence[Tuple[Number, Number, Any]],
+        include_max: bool = True,
+        default: Any = 0.0
+    ):
+        """
+        Compile zones
+
+        Args:
+            zones: (min_value, max_value, score) per zone, in match order
+            include_max: Whether max_value belongs to the zone ([min, max]
+                rather than [min, max))
+            default: Score for values no zone covers
+        """
+        self.include_max = include_max
+        self.default = default
+        self.mins = [zone[0] for zone in zones]
+        self.maxs = [zone[1] for zone in zones]
+        self.zone_scores = [zone[2] for zone in zones]
+        # Graduated-gradient table: offset and width of each zone
+        self.widths = [zone_max - zone_min for zone_min, zone_max in zip(self.mins, self.maxs)]
+
+        self.points = sorted(set(self.mins) | set(self.maxs))
+        self.point_zone = [self._first_match_at(point) for point in self.points]
+        # Gap k lies strictly between points[k - 1] and points[k]
+        bounds = [-math.inf] + self.points + [math.inf]
+        self.gap_zone = [self._first_match_between(bounds[k], bounds[k + 1]) for k in range(len(self.points) + 1)]
+
+        self._points = np.array(self.points, dtype=float)
+        self._point_zone = np.array(self.point_zone, dtype=np.int64)
+        self._gap_zone = np.array(self.gap_zone, dtype=np.int64)
+
+    def _first_match_at(self, value: Number) -> int:
+        for i, (zone_min, zone_max) in enumerate(zip(self.mins, self.maxs)):
+            if zone_min <= value and (value <= zone_max if self.include_max else value < zone_max):
+                return i
+        return -1
+
+    def _first_match_between(self, low: Number, high: Number) -> int:
+        # A zone covers the open gap (low, high) iff it spans it entirely
+        for i, (zone_min, zone_max) in enumerate(zip(self.mins, self.maxs)):
+            if zone_min <= low and zone_max >= high:
+                return i
+        return -1
+
+    def __len__(self) -> int:
+        return len(self.zone_scores)
+
+    def index(self, value: Number) -> int:
+        """Position of the first zone containing value, or -1"""
+        if value != value:  # NaN is in no zone
+            return -1
+        k = bisect.bisect_left(self.points, value)
+        if k < len(self.points) and self.points[k] == value:
+            return self.point_zone[k]
+        return self.gap_zone[k]
+
+    def score(self, value: Number, graduated: bool = False) -> Any:
+        """
+        Score of the zone containing value (default if none)
+
+        With graduated, the score ramps from 95% at the zone's min to 100%
+        at its max.
+        """
+        i = self.index(value)
+        if i < 0:
+            return self.default
+        if not graduated or self.widths[i] == 0:
+            return self.zone_scores[i]
+        position = (value - self.mins[i]) / self.widths[i]
+        return self.zone_scores[i] * (0.95 + (0.05 * position))
+
+    def indices(self, values: Sequence[Number]) -> np.ndarray:
+        """index() for an array of values"""
+        values = np.asarray(values, dtype=float)
+        if not self.points:
+            return np.full(values.shape, -1, dtype=np.int64)
+        k = np.searchsorted(self._points, values, side="left")
+        nearest = np.minimum(k, len(self.points) - 1)
+        on_point = (k < len(self.points)) & (self._points[nearest] == values)
+        result = np.where(on_point, self._point_zone[nearest], self._gap_zone[k])
+        result[np.isnan(values)] = -1
+        return result
+
+    def scores(self, values: Sequence[Number], graduated: bool = False) -> np.ndarray:
+        """score() for an array of values, as floats"""
+        values = np.asarray(values, dtype=float)
+        idx = self.indices(values)
+        default = np.nan if self.default is None else self.default
+        table = np.array(self.zone_scores + [default], dtype=float)
+        result = table[idx]
+        if graduated and len(self):
+            mins = np.array(self.mins + [0.0], dtype=float)[idx]
+            widths = np.array(self.widths + [0.0], dtype=float)[idx]
+            ramp = (idx >= 0) & (widths != 0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                position = (values - mins) / widths
+                result = np.where(ramp, result * (0.95 + (0.05 * position)), result)
+        return result
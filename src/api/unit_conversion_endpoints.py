@@ -6,22 +6,109 @@ Flask/FastAPI endpoints that integrate unit conversion into the WellPath API.
 Handles user input, conversion, scoring, and display formatting.
 """
 
-from flask import Flask, request, jsonify
-from typing import Dict, Any, Optional
+from flask import Blueprint, Flask, Response, current_app, request, jsonify, stream_with_context
+from werkzeug.local import LocalProxy
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from dataclasses import dataclass
+import atexit
+import base64
+import binascii
 import json
+import os
 from datetime import datetime
 import uuid
 
+import numpy as np
+
 from ..core_systems.unit_conversion_service import UnitConversionService
 from ..core_systems.recommendation_engine_with_units import RecommendationEngineWithUnits
+from ..core_systems.user_preference_service import UserPreferenceService
+from ..core_systems.config_registry import ConfigWatcher
+from ..database.metric_storage import MetricStorageBackend, SQLiteMetricStorage
+from ..database.audit_sink import BufferedAuditSink
 
 
-app = Flask(__name__)
+bp = Blueprint('unit_conversion', __name__)
 converter = UnitConversionService()
-engine = RecommendationEngineWithUnits()
 
 
-@app.route('/api/metrics/entry', methods=['POST'])
+@dataclass
+class ApiServices:
+    """Storage, audit sink and engine shared by the endpoints of one app"""
+    storage: MetricStorageBackend
+    audit_sink: BufferedAuditSink
+    preference_service: UserPreferenceService
+    engine: RecommendationEngineWithUnits
+    config_watcher: Optional[ConfigWatcher] = None
+
+    def close(self) -> None:
+        """Stop the config watcher, flush the audit sink and close storage"""
+        if self.config_watcher is not None:
+            self.config_watcher.stop()
+        self.audit_sink.close()
+        self.storage.close()
+
+
+def create_app(
+    metrics_db: Optional[str] = None,
+    config_bundle: Optional[str] = None,
+    config_poll_seconds: Optional[float] = None
+) -> Flask:
+    """
+    Create the API app and start its background services
+    
+    Args:
+        metrics_db: SQLite database path (default WELLPATH_METRICS_DB)
+        config_bundle: Packed config bundle path (default WELLPATH_CONFIG_BUNDLE)
+        config_poll_seconds: Seconds between config reload polls, 0 to disable
+            (default WELLPATH_CONFIG_POLL_SECONDS, else 5)
+    
+    The services are closed at interpreter exit, or earlier with
+    app.extensions['wellpath'].close().
+    """
+    if config_poll_seconds is None:
+        config_poll_seconds = float(os.environ.get("WELLPATH_CONFIG_POLL_SECONDS", "5"))
+    
+    storage = SQLiteMetricStorage(
+        metrics_db or os.environ.get("WELLPATH_METRICS_DB", "data/wellpath_metrics.db")
+    )
+    audit_sink = BufferedAuditSink(storage.log_conversions)
+    preference_service = UserPreferenceService(storage)
+    engine = RecommendationEngineWithUnits(
+        audit_sink=audit_sink,
+        preference_service=preference_service,
+        config_bundle=config_bundle or os.environ.get("WELLPATH_CONFIG_BUNDLE")
+    )
+    services = ApiServices(storage, audit_sink, preference_service, engine)
+    if config_poll_seconds > 0:
+        # Pick up configs written by RecommendationConfigGenerator without a restart
+        services.config_watcher = ConfigWatcher(engine.config_registry, interval=config_poll_seconds).start()
+    atexit.register(services.close)
+    
+    app = Flask(__name__)
+    app.extensions['wellpath'] = services
+    app.register_blueprint(bp)
+    return app
+
+
+def _services() -> ApiServices:
+    return current_app.extensions['wellpath']
+
+
+# Resolved against the current app, so the endpoints and helpers below
+# use the services created by create_app
+storage: MetricStorageBackend = LocalProxy(lambda: _services().storage)
+audit_sink: BufferedAuditSink = LocalProxy(lambda: _services().audit_sink)
+preference_service: UserPreferenceService = LocalProxy(lambda: _services().preference_service)
+engine: RecommendationEngineWithUnits = LocalProxy(lambda: _services().engine)
+
+# History requests for more entries than this are streamed instead of built in memory
+HISTORY_STREAM_THRESHOLD = 1000
+# Entries fetched, converted and written per database round trip when streaming
+HISTORY_CHUNK_SIZE = 500
+
+
+@bp.route('/api/metrics/entry', methods=['POST'])
 def create_metric_entry_with_conversion():
     """
     Create a metric entry with automatic unit conversion
@@ -92,7 +179,7 @@ def create_metric_entry_with_conversion():
             session_id=session_id
         )
         
-        # Store in database (implementation would go here)
+        # Store in database
         entry_id = store_metric_entry(result, data.get('timestamp'))
         
         # Get display formatting
@@ -126,7 +213,7 @@ def create_metric_entry_with_conversion():
         }), 500
 
 
-@app.route('/api/units/supported/<metric_id>', methods=['GET'])
+@bp.route('/api/units/supported/<metric_id>', methods=['GET'])
 def get_supported_units(metric_id: str):
     """
     Get supported units for a metric
@@ -151,7 +238,7 @@ def get_supported_units(metric_id: str):
         }), 500
 
 
-@app.route('/api/units/convert', methods=['POST'])
+@bp.route('/api/units/convert', methods=['POST'])
 def convert_units():
     """
     Convert between units (utility endpoint)
@@ -206,7 +293,7 @@ def convert_units():
         }), 500
 
 
-@app.route('/api/users/<user_id>/preferences/units', methods=['GET', 'POST'])
+@bp.route('/api/users/<user_id>/preferences/units', methods=['GET', 'POST'])
 def manage_unit_preferences(user_id: str):
     """
     Get or set user's unit preferences
@@ -262,14 +349,18 @@ def manage_unit_preferences(user_id: str):
         })
 
 
-@app.route('/api/metrics/history/<user_id>/<metric_id>', methods=['GET'])
+@bp.route('/api/metrics/history/<user_id>/<metric_id>', methods=['GET'])
 def get_metric_history_with_units(user_id: str, metric_id: str):
     """
     Get metric history with unit conversion for display
     
     Query Parameters:
     - display_unit: Preferred unit for display (optional)
-    - limit: Number of entries to return (default: 100)
+    - limit: Number of entries to return, a positive integer (default: 100)
+    - cursor: Opaque cursor from a previous response's next_cursor (optional)
+    
+    Requests for more than HISTORY_STREAM_THRESHOLD entries are streamed,
+    HISTORY_CHUNK_SIZE entries at a time.
     
     Response:
     {
@@ -291,55 +382,48 @@ def get_metric_history_with_units(user_id: str, metric_id: str):
                     "REC0020.2": 85.1
                 }
             }
-        ]
+        ],
+        "next_cursor": "MjAyNC0wMS0xNVQxMDozMDowMHxlbnRyeV80NTY="
     }
     """
     try:
         display_unit = request.args.get('display_unit')
-        limit = int(request.args.get('limit', 100))
+        cursor = request.args.get('cursor')
         
-        # Get raw entries from database
-        raw_entries = get_metric_entries_from_db(user_id, metric_id, limit)
+        try:
+            limit = parse_history_limit(request.args.get('limit', '100'))
+            before = decode_history_cursor(cursor) if cursor else None
+        except ValueError as e:
+            return jsonify({
+                'error': str(e)
+            }), 400
         
         # If no display unit specified, use user's preference
         if not display_unit:
             unit_type = engine._get_unit_type_for_metric(metric_id)
             display_unit = engine._get_user_preferred_unit(user_id, unit_type)
         
-        # Process entries for display
-        processed_entries = []
-        for entry in raw_entries:
-            # Convert to display unit if different from stored original unit
-            if display_unit != entry['original_unit']:
-                display_conversion = converter.convert_from_base(
-                    entry['base_value'],
-                    entry['base_unit'],
-                    display_unit
-                )
-                display_value = display_conversion['value']
-                display_formatted = display_conversion['formatted_display']
-            else:
-                display_value = entry['original_value']
-                display_formatted = f"{entry['original_value']} {entry['original_unit']}"
-                
-            processed_entries.append({
-                'entry_id': entry['entry_id'],
-                'timestamp': entry['timestamp'].isoformat(),
-                'original_value': entry['original_value'],
-                'original_unit': entry['original_unit'],
-                'base_value': entry['base_value'],
-                'base_unit': entry['base_unit'],
-                'display_value': display_value,
-                'display_unit': display_unit,
-                'display_formatted': display_formatted,
-                'scores': entry.get('scores', {})
-            })
-            
-        return jsonify({
+        header = {
             'user_id': user_id,
             'metric_id': metric_id,
-            'display_unit': display_unit,
-            'entries': processed_entries
+            'display_unit': display_unit
+        }
+        
+        if limit > HISTORY_STREAM_THRESHOLD:
+            return Response(
+                stream_with_context(
+                    stream_history_json(header, user_id, metric_id, display_unit, limit, before)
+                ),
+                mimetype='application/json'
+            )
+        
+        raw_entries, next_cursor = fetch_history_page(user_id, metric_id, limit, before)
+        processed_entries = build_history_entries(raw_entries, display_unit)
+            
+        return jsonify({
+            **header,
+            'entries': processed_entries,
+            'next_cursor': next_cursor
         })
         
     except Exception as e:
@@ -348,7 +432,7 @@ def get_metric_history_with_units(user_id: str, metric_id: str):
         }), 500
 
 
-@app.route('/api/conversion/validate', methods=['POST'])
+@bp.route('/api/conversion/validate', methods=['POST'])
 def validate_conversion_input():
     """
     Validate user input before conversion
@@ -401,15 +485,42 @@ def validate_conversion_input():
         }), 500
 
 
-# Helper functions (these would be implemented based on your database setup)
+@bp.route('/api/conversion/audit/stats', methods=['GET'])
+def get_conversion_audit_stats():
+    """
+    Get conversion audit sink counters
+    
+    Response:
+    {
+        "submitted": 1200,
+        "written": 1150,
+        "dropped": 0,
+        "backpressure": 0,
+        "flushes": 3,
+        "write_errors": 0,
+        "queued": 50
+    }
+    """
+    return jsonify(audit_sink.stats())
+
+
+# Helper functions
 
 def store_metric_entry(conversion_result: Dict, timestamp: Optional[str] = None) -> str:
     """Store metric entry in database and return entry ID"""
-    # Implementation would insert into metric_entries table
-    # with both original and converted values
-    entry_id = str(uuid.uuid4())
-    # ... database insertion logic ...
-    return entry_id
+    conversion = conversion_result['conversion']
+    return storage.store_metric_entry({
+        'user_id': conversion_result['user_id'],
+        'metric_id': conversion_result['metric_id'],
+        'base_value': conversion['converted_value'],
+        'base_unit': conversion['base_unit'],
+        'original_value': conversion['original_value'],
+        'original_unit': conversion['original_unit'],
+        'conversion_method': conversion['conversion_method'],
+        'scores': {k: v['score'] for k, v in conversion_result['scores'].items()},
+        'session_id': conversion_result.get('session_id'),
+        'timestamp': timestamp
+    })
 
 
 def generate_achievement_message(scores: Dict[str, Any]) -> str:
@@ -430,32 +541,170 @@ def generate_achievement_message(scores: Dict[str, Any]) -> str:
 
 
 def get_user_unit_preferences(user_id: str) -> Dict[str, str]:
-    """Get user's unit preferences from database"""
-    # Implementation would query user_unit_preferences table
-    # For now, return defaults
-    return {
-        'volume': 'cup',
-        'mass': 'pound',
-        'length': 'feet_inches',
-        'temperature': 'fahrenheit'
-    }
+    """Get user's unit preferences (cached, backed by the database)"""
+    return preference_service.get_preferences(user_id)
 
 
 def save_user_unit_preferences(user_id: str, new_preferences: Dict[str, str]) -> Dict[str, str]:
-    """Save user's unit preferences to database"""
-    # Implementation would insert/update user_unit_preferences table
-    current_prefs = get_user_unit_preferences(user_id)
-    current_prefs.update(new_preferences)
-    # ... database update logic ...
-    return current_prefs
+    """Save user's unit preferences to database and refresh the cache"""
+    return preference_service.save_preferences(user_id, new_preferences)
+
+
+def get_metric_entries_from_db(
+    user_id: str,
+    metric_id: str,
+    limit: int,
+    before: Optional[Tuple[str, str]] = None
+) -> list:
+    """
+    Get metric entries from database, newest first
+    
+    Args:
+        before: (timestamp, entry_id) keyset from a history cursor; only
+            entries strictly older than it are returned
+    """
+    return storage.get_metric_entries(user_id, metric_id, limit, before)
+
+
+def fetch_history_page(
+    user_id: str,
+    metric_id: str,
+    limit: int,
+    before: Optional[Tuple[str, str]] = None
+) -> Tuple[list, Optional[str]]:
+    """
+    Fetch up to limit entries older than before, with the cursor of the next page
+    
+    Fetches one extra row to know whether another page exists; the cursor is
+    None on the last page.
+    
+    Raises:
+        ValueError: limit is less than 1
+    """
+    if limit < 1:
+        raise ValueError(f"limit must be at least 1, got {limit}")
+    raw_entries = get_metric_entries_from_db(user_id, metric_id, limit + 1, before)
+    if len(raw_entries) <= limit:
+        return raw_entries, None
+    raw_entries = raw_entries[:limit]
+    last = raw_entries[-1]
+    return raw_entries, encode_history_cursor(last['timestamp'], last['entry_id'])
+
+
+def build_history_entries(raw_entries: List[Dict], display_unit: str) -> List[Dict]:
+    """
+    Convert history entries for display with one conversion plan per base unit
+    
+    Entries whose original unit already matches the display unit keep their
+    original value, as entered by the user.
+    """
+    count = len(raw_entries)
+    display_values: List[Any] = [None] * count
+    display_formatted: List[str] = [''] * count
+    
+    # Group row indexes by base unit (normally a single group per metric)
+    groups: Dict[str, List[int]] = {}
+    for i, entry in enumerate(raw_entries):
+        if entry['original_unit'] == display_unit:
+            display_values[i] = entry['original_value']
+            display_formatted[i] = f"{entry['original_value']} {entry['original_unit']}"
+        else:
+            groups.setdefault(entry['base_unit'], []).append(i)
+            
+    for base_unit, indexes in groups.items():
+        plan = converter.build_display_plan(base_unit, display_unit)
+        base_values = np.fromiter(
+            (raw_entries[i]['base_value'] for i in indexes), dtype=float, count=len(indexes)
+        )
+        converted = plan.apply(base_values, decimals=2)
+        formatted = plan.format(converted)
+        for i, value, text in zip(indexes, converted.tolist(), formatted):
+            display_values[i] = value
+            display_formatted[i] = text
+            
+    return [
+        {
+            'entry_id': entry['entry_id'],
+            'timestamp': _timestamp_to_iso(entry['timestamp']),
+            'original_value': entry['original_value'],
+            'original_unit': entry['original_unit'],
+            'base_value': entry['base_value'],
+            'base_unit': entry['base_unit'],
+            'display_value': display_values[i],
+            'display_unit': display_unit,
+            'display_formatted': display_formatted[i],
+            'scores': entry.get('scores', {})
+        }
+        for i, entry in enumerate(raw_entries)
+    ]
+
+
+def stream_history_json(
+    header: Dict[str, Any],
+    user_id: str,
+    metric_id: str,
+    display_unit: str,
+    limit: int,
+    before: Optional[Tuple[str, str]] = None
+) -> Iterator[str]:
+    """
+    Yield a history response as JSON chunks instead of one large body
+    
+    Entries are fetched, converted and written HISTORY_CHUNK_SIZE at a time,
+    so at most one chunk is held in memory.
+    """
+    opening = json.dumps(header)
+    yield opening[:-1] + ', "entries": ['
+    
+    remaining = limit
+    next_cursor = None
+    separator = ''
+    while remaining > 0:
+        raw_entries, next_cursor = fetch_history_page(
+            user_id, metric_id, min(remaining, HISTORY_CHUNK_SIZE), before
+        )
+        for entry in build_history_entries(raw_entries, display_unit):
+            yield separator + json.dumps(entry)
+            separator = ','
+        remaining -= len(raw_entries)
+        if next_cursor is None:
+            break
+        before = decode_history_cursor(next_cursor)
+        
+    yield '], "next_cursor": ' + json.dumps(next_cursor) + '}'
+
+
+def parse_history_limit(raw: str) -> int:
+    """Parse the history limit query parameter, which must be a positive integer"""
+    try:
+        limit = int(raw)
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        raise ValueError(f"limit must be a positive integer, got {raw!r}")
+    return limit
+
+
+def encode_history_cursor(timestamp: Any, entry_id: str) -> str:
+    """Encode the (timestamp, entry_id) keyset of the last returned entry"""
+    raw = f"{_timestamp_to_iso(timestamp)}|{entry_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_history_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a history cursor back into its (timestamp, entry_id) keyset"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        timestamp, entry_id = raw.split('|', 1)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return timestamp, entry_id
 
 
-def get_metric_entries_from_db(user_id: str, metric_id: str, limit: int) -> list:
-    """Get metric entries from database"""
-    # Implementation would query metric_entries table
-    # Return list of entries with conversion information
-    return []
+def _timestamp_to_iso(timestamp: Any) -> str:
+    """Entries may carry datetimes or already-serialized timestamps"""
+    return timestamp.isoformat() if isinstance(timestamp, datetime) else str(timestamp)
 
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    create_app().run(debug=True)
\ No newline at end of file
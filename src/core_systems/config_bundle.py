@@ -0,0 +1,233 @@
+"""
+Generated Config Bundle
+=======================
+
+Packs every generated recommendation config into one versioned binary file
+that loaders memory-map instead of globbing and parsing 100+ JSON files.
+
+Layout (little-endian):
+    header   MAGIC, format version, build version, config count,
+             index offset/length, SHA-1 of the data section
+    data     compact UTF-8 JSON of each config, back to back
+    index    JSON: recommendation_id -> [offset, length, filename],
+             tracked metric -> [recommendation_id, ...]
+
+Opening a bundle maps the file and parses only the header and index;
+individual configs are decoded on first access, and raw() returns a
+zero-copy memoryview of a config's bytes.
+
+Usage:
+    python src/core_systems/config_bundle.py build [config_dir] [-o bundle_path]
+    python src/core_systems/config_bundle.py info [bundle_path]
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+
+MAGIC = b"WPCB"
+FORMAT_VERSION = 1
+BUNDLE_FILENAME = "generated_configs.bundle"
+MASTER_FILENAME = "all_generated_configs.json"
+
+# magic, format version, build version, count, index offset, index length, data sha1
+HEADER = struct.Struct("<4sHQIQQ20s")
+
+
+def _config_files(config_dir: str) -> List[str]:
+    return sorted(
+        path for path in glob.glob(os.path.join(config_dir, "*.json"))
+        if os.path.basename(path) != MASTER_FILENAME
+    )
+
+
+def build_config_bundle(config_dir: str = "src/generated_configs/", bundle_path: Optional[str] = None) -> str:
+    """
+    Pack all config JSON files in config_dir into a single bundle
+
+    Files without metadata.recommendation_id are skipped. When two files
+    share a recommendation_id the later filename wins, as in the engine.
+
+    Returns:
+        Path of the written bundle
+    """
+    if bundle_path is None:
+        bundle_path = os.path.join(config_dir, BUNDLE_FILENAME)
+
+    blobs: Dict[str, Tuple[bytes, str, List[str]]] = {}
+    for path in _config_files(config_dir):
+        with open(path, 'r') as f:
+            config = json.load(f)
+        rec_id = config.get('metadata', {}).get('recommendation_id')
+        if not rec_id:
+            continue
+        tracked = config.get('configuration_json', {}).get('schema', {}).get('tracked_metrics', [])
+        blob = json.dumps(config, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        blobs[rec_id] = (blob, os.path.basename(path), list(tracked))
+
+    data = bytearray()
+    index: Dict[str, Any] = {'configs': {}, 'metrics': {}}
+    for rec_id in sorted(blobs):
+        blob, filename, tracked = blobs[rec_id]
+        index['configs'][rec_id] = [HEADER.size + len(data), len(blob), filename]
+        data += blob
+        for metric_id in tracked:
+            index['metrics'].setdefault(metric_id, []).append(rec_id)
+
+    index_bytes = json.dumps(index, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        time.time_ns() // 1_000_000,
+        len(blobs),
+        HEADER.size + len(data),
+        len(index_bytes),
+        hashlib.sha1(data).digest()
+    )
+
+    # Write then rename so readers never map a half-written bundle
+    tmp_path = f"{bundle_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(data)
+        f.write(index_bytes)
+    os.replace(tmp_path, bundle_path)
+    return bundle_path
+
+
+class ConfigBundle:
+    """Read-only, memory-mapped view of a config bundle"""
+
+    def __init__(self, bundle_path: str):
+        """
+        Map a bundle and read its header and index
+
+        Raises:
+            ValueError: Not a bundle or unsupported format version
+        """
+        self.path = bundle_path
+        self._file = open(bundle_path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Empty config bundle: {bundle_path}")
+
+        try:
+            (magic, format_version, build_version, count,
+             index_offset, index_length, data_sha1) = HEADER.unpack_from(self._map, 0)
+        except struct.error:
+            self.close()
+            raise ValueError(f"Truncated config bundle: {bundle_path}")
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Not a config bundle: {bundle_path}")
+        if format_version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported config bundle format {format_version}: {bundle_path}")
+
+        self.format_version = format_version
+        self.build_version = build_version
+        self.data_sha1 = data_sha1.hex()
+        index = json.loads(self._map[index_offset:index_offset + index_length])
+        self._offsets: Dict[str, List[Any]] = index['configs']
+        self._metrics: Dict[str, List[str]] = index['metrics']
+        self._decoded: Dict[str, Dict[str, Any]] = {}
+        if len(self._offsets) != count:
+            self.close()
+            raise ValueError(f"Corrupt config bundle index: {bundle_path}")
+
+    def __enter__(self) -> "ConfigBundle":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, recommendation_id: str) -> bool:
+        return recommendation_id in self._offsets
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._offsets)
+
+    @property
+    def recommendation_ids(self) -> List[str]:
+        return list(self._offsets)
+
+    @property
+    def metrics(self) -> List[str]:
+        return list(self._metrics)
+
+    def raw(self, recommendation_id: str) -> memoryview:
+        """Zero-copy view of a config's JSON bytes"""
+        offset, length, _ = self._offsets[recommendation_id]
+        return memoryview(self._map)[offset:offset + length]
+
+    def filename(self, recommendation_id: str) -> str:
+        """Source filename the config was packed from"""
+        return self._offsets[recommendation_id][2]
+
+    def get(self, recommendation_id: str) -> Dict[str, Any]:
+        """Decode one config (cached after first access)"""
+        config = self._decoded.get(recommendation_id)
+        if config is None:
+            offset, length, _ = self._offsets[recommendation_id]
+            config = json.loads(self._map[offset:offset + length])
+            self._decoded[recommendation_id] = config
+        return config
+
+    def recommendation_ids_for_metric(self, metric_id: str) -> List[str]:
+        """Recommendation IDs whose configs track the given metric"""
+        return list(self._metrics.get(metric_id, ()))
+
+    def configs_for_metric(self, metric_id: str) -> Dict[str, Dict[str, Any]]:
+        """Decoded configs that track the given metric"""
+        return {rec_id: self.get(rec_id) for rec_id in self._metrics.get(metric_id, ())}
+
+    def close(self) -> None:
+        """Unmap the bundle"""
+        if getattr(self, '_map', None) is not None and not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or inspect the generated config bundle")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Pack generated configs into a bundle')
+    build_parser.add_argument('config_dir', nargs='?', default="src/generated_configs/")
+    build_parser.add_argument('-o', '--output', help='Bundle path (default: <config_dir>/generated_configs.bundle)')
+
+    info_parser = subparsers.add_parser('info', help='Show bundle header and index summary')
+    info_parser.add_argument('bundle_path', nargs='?', default=os.path.join("src/generated_configs", BUNDLE_FILENAME))
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        bundle_path = build_config_bundle(args.config_dir, args.output)
+        with ConfigBundle(bundle_path) as bundle:
+            print(f"✅ Wrote {len(bundle)} configs to {bundle_path} "
+                  f"(build {bundle.build_version}, {time.perf_counter() - start:.3f}s)")
+    else:
+        with ConfigBundle(args.bundle_path) as bundle:
+            print(f"Bundle: {bundle.path}")
+            print(f"Format version: {bundle.format_version}")
+            print(f"Build version: {bundle.build_version}")
+            print(f"Data SHA-1: {bundle.data_sha1}")
+            print(f"Configs: {len(bundle)}")
+            print(f"Tracked metrics: {len(bundle.metrics)}")
+
+
+if __name__ == "__main__":
+    main()
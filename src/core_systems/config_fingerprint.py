@@ -0,0 +1,157 @@
+"""
+Config Fingerprint Service
+==========================
+
+Tracks a content fingerprint for every file matching a pattern in a
+directory, for change detection by the test auto-updater and the config
+registry's hot reload.
+
+Key Features:
+- Files are only re-hashed when their (mtime_ns, size) changed
+- CRC-32 content hash (fast, non-cryptographic; used to detect edits, not tampering)
+- Stat-only mode for callers that read and hash changed files themselves
+- The index is persisted in a single compact JSON cache file so a fresh
+  process does not re-hash an unchanged tree
+"""
+
+import json
+import os
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+
+CACHE_FORMAT_VERSION = 1
+HASH_ALGORITHM = "crc32"
+_CHUNK_SIZE = 1 << 20
+
+
+class FileFingerprint(NamedTuple):
+    mtime_ns: int
+    size: int
+    hash: str
+
+
+def content_hash(data: bytes) -> str:
+    """Fingerprint of an in-memory file body"""
+    return f"{zlib.crc32(data):08x}"
+
+
+def file_hash(path: Union[str, Path]) -> str:
+    """Fingerprint of a file, read in chunks"""
+    crc = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            crc = zlib.crc32(chunk, crc)
+    return f"{crc:08x}"
+
+
+class FingerprintService:
+    """Incremental content fingerprints for the files of one directory"""
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        pattern: str = "*.json",
+        cache_file: Optional[Union[str, Path]] = None,
+        exclude: Tuple[str, ...] = ("all_generated_configs.json",),
+        hash_contents: bool = True
+    ):
+        """
+        Initialize the service
+
+        Args:
+            directory: Directory to fingerprint
+            pattern: Glob pattern of files to track
+            cache_file: Where to persist the index (None keeps it in memory only)
+            exclude: File names to ignore even if they match pattern
+            hash_contents: Hash changed files; False tracks (mtime_ns, size)
+                only and leaves every hash empty
+        """
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self.cache_file = Path(cache_file) if cache_file is not None else None
+        self.exclude = set(exclude)
+        self.hash_contents = hash_contents
+        self.hash_algorithm = HASH_ALGORITHM if hash_contents else "none"
+        self.rehashed = 0
+        self._index: Dict[str, FileFingerprint] = self._load_cache()
+        self._lock = threading.Lock()
+
+    def _load_cache(self) -> Dict[str, FileFingerprint]:
+        if self.cache_file is None or not self.cache_file.exists():
+            return {}
+        try:
+            with open(self.cache_file, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if cache.get('version') != CACHE_FORMAT_VERSION or cache.get('hash') != self.hash_algorithm:
+            return {}
+        return {name: FileFingerprint(*entry) for name, entry in cache.get('files', {}).items()}
+
+    def _save_cache(self) -> None:
+        cache = {
+            'version': CACHE_FORMAT_VERSION,
+            'hash': self.hash_algorithm,
+            'files': {name: list(entry) for name, entry in sorted(self._index.items())}
+        }
+        tmp_file = self.cache_file.with_name(self.cache_file.name + '.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(cache, f, separators=(',', ':'))
+        os.replace(tmp_file, self.cache_file)
+
+    def scan(self) -> Dict[str, FileFingerprint]:
+        """
+        Fingerprint every tracked file, re-hashing only files whose stat changed
+
+        Returns:
+            File path relative to the directory -> FileFingerprint
+        """
+        with self._lock:
+            current: Dict[str, FileFingerprint] = {}
+            rehashed = 0
+            for path in sorted(self.directory.glob(self.pattern)):
+                if path.name in self.exclude:
+                    continue
+                name = path.relative_to(self.directory).as_posix()
+                try:
+                    stat = path.stat()
+                    previous = self._index.get(name)
+                    if previous is not None and (previous.mtime_ns, previous.size) == (stat.st_mtime_ns, stat.st_size):
+                        current[name] = previous
+                        continue
+                    digest = file_hash(path) if self.hash_contents else ''
+                    current[name] = FileFingerprint(stat.st_mtime_ns, stat.st_size, digest)
+                    rehashed += 1
+                except OSError:
+                    # Removed between glob and stat/read
+                    continue
+
+            changed = rehashed > 0 or current.keys() != self._index.keys()
+            self._index = current
+            self.rehashed = rehashed
+            if changed and self.cache_file is not None:
+                self._save_cache()
+            return dict(current)
+
+    def hashes(self) -> Dict[str, str]:
+        """File path -> content hash for the current tree"""
+        return {name: entry.hash for name, entry in self.scan().items()}
+
+
+def diff_fingerprints(
+    previous: Dict[str, str],
+    current: Dict[str, str]
+) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Compare two path -> hash maps
+
+    Returns:
+        (new, modified, deleted) file paths
+    """
+    new = [name for name in current if name not in previous]
+    modified = [name for name in current if name in previous and current[name] != previous[name]]
+    deleted = [name for name in previous if name not in current]
+    return new, modified, deleted
@@ -0,0 +1,473 @@
+"""
+Compiled Recommendation Config Registry
+=======================================
+
+Compiles the generated recommendation configs (src/generated_configs/*.json)
+into immutable scorer objects once, instead of digging through
+configuration_json and branching on method strings for every score.
+
+Key Features:
+- Configs compiled by algorithms/config_compiler.py into the same kernels
+  the algorithm classes score with; each entry is scored as one kernel day
+- Configs validated at compile time; broken configs are reported, not served
+- Expected base unit resolved once per config
+- Metric -> scorers index for O(1) config lookup per entry
+- Hot reload: only changed files are recompiled and the index is patched
+  incrementally; readers see immutable snapshots swapped in atomically
+- ConfigWatcher polls mtime/size and reloads in the background
+"""
+
+import abc
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from .config_bundle import ConfigBundle
+from .config_fingerprint import FingerprintService
+
+try:
+    from ..algorithms.config_compiler import ALGORITHM_BUILDERS, compile_kernel
+    from ..algorithms.kernels import AdherenceKernel, ComponentKernel
+except ImportError:
+    # Imported as a top-level package, with src/ on sys.path
+    from algorithms.config_compiler import ALGORITHM_BUILDERS, compile_kernel
+    from algorithms.kernels import AdherenceKernel, ComponentKernel
+
+
+class UnsupportedMethodError(ValueError):
+    """Config uses a scoring method the config compiler cannot score"""
+
+
+class CompiledScorer(abc.ABC):
+    """
+    Immutable, precompiled scorer for one recommendation config
+
+    Wraps the kernel algorithms.config_compiler compiles for the config, so
+    the registry shares its schema reading and scoring math with the
+    algorithm classes.
+    """
+
+    __slots__ = ('config_id', 'recommendation_id', 'method', 'tracked_metrics', 'expected_base_unit', 'config', 'kernel')
+
+    # Whether single metric entries are scored (and the scorer indexed by metric)
+    scores_entries = True
+
+    def __init__(self, config: Dict[str, Any], recommendation_id: str, kernel: AdherenceKernel):
+        schema = config['configuration_json']['schema']
+        self._set('config_id', config['config_id'])
+        self._set('recommendation_id', recommendation_id)
+        self._set('method', config['configuration_json']['method'])
+        self._set('tracked_metrics', tuple(schema.get('tracked_metrics', ())))
+        # backwards compatibility: older configs only carry 'unit'
+        self._set('expected_base_unit', schema.get('base_unit', schema.get('unit')))
+        self._set('config', config)
+        self._set('kernel', kernel)
+
+    def _set(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.recommendation_id!r}, method={self.method!r})"
+
+    @abc.abstractmethod
+    def score(self, value: Any) -> float:
+        """Score one day of input"""
+
+    def calculate(self, base_value: float, base_unit: str) -> Dict[str, Any]:
+        """Score a base unit value and return the engine's score result dict"""
+        if self.expected_base_unit != base_unit:
+            raise ValueError(f"Unit mismatch: config expects {self.expected_base_unit}, got {base_unit}")
+
+        return {
+            'score': self.score(base_value),
+            'base_value': base_value,
+            'base_unit': base_unit,
+            'method': self.method,
+            'config_id': self.config_id
+        }
+
+
+class EntryScorer(CompiledScorer):
+    """Scores each metric entry as one day of the config's kernel"""
+
+    __slots__ = ()
+
+    def score(self, value: float) -> float:
+        return round(self.kernel.day_score(value), 2)
+
+
+class ComponentScorer(CompiledScorer):
+    """
+    Scores one day of a multi-component config (composite_weighted, sleep_composite)
+
+    A single metric entry can't fill every component, so these scorers are
+    not indexed by metric; score takes the day's component values in the
+    kernel's column order.
+    """
+
+    __slots__ = ()
+
+    scores_entries = False
+
+    def score(self, value: Sequence[float]) -> float:
+        return round(self.kernel.day_score(value), 2)
+
+
+def _entry_schema(method: str, schema: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Method and schema the config compiler should build for a config
+
+    Older engine configs set an evaluation_pattern that scores each entry
+    differently from the method's own algorithm; they are rewritten onto the
+    equivalent compiler schema. Other configs are returned unchanged.
+    """
+    pattern = schema.get('evaluation_pattern')
+    if method == 'proportional' and pattern == 'weekly_frequency':
+        # A qualifying day earns its share of the week's required days
+        return 'binary_threshold', {
+            'threshold': schema['daily_threshold'],
+            'success_value': round(min(100, (1 / schema['required_days']) * 100), 2)
+        }
+    elif method == 'proportional' and pattern == 'daily_achievement':
+        return 'proportional', dict(schema, target=schema['daily_target'])
+    elif method == 'binary' and pattern == 'weekly_frequency':
+        return 'binary_threshold', {
+            'threshold': schema['daily_threshold'],
+            'success_value': 100,
+            'failure_value': 20
+        }
+    return method, schema
+
+
+def compile_config(config: Dict[str, Any], recommendation_id: str) -> CompiledScorer:
+    """
+    Validate a config and compile it into a scorer
+
+    Raises:
+        UnsupportedMethodError: The config compiler has no algorithm for the method
+        ValueError: Missing/invalid fields
+    """
+    try:
+        schema = config['configuration_json']['schema']
+        method = config['configuration_json']['method']
+        _require(config, 'config_id')
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Malformed config {recommendation_id}: missing {e}")
+
+    try:
+        compiled_method, compiled_schema = _entry_schema(method, schema)
+        if compiled_method not in ALGORITHM_BUILDERS:
+            raise UnsupportedMethodError(f"Unsupported scoring method: {method}")
+        kernel = compile_kernel({'configuration_json': {'method': compiled_method, 'schema': compiled_schema}})
+        if isinstance(kernel, ComponentKernel):
+            return ComponentScorer(config, recommendation_id, kernel)
+        scorer = EntryScorer(config, recommendation_id, kernel)
+        # Score one entry now so invalid thresholds and targets fail here, not per entry
+        scorer.score(0)
+        return scorer
+    except UnsupportedMethodError:
+        raise
+    except KeyError as e:
+        raise ValueError(f"Config {recommendation_id} ({method}) is missing required field {e}")
+    except ZeroDivisionError:
+        raise ValueError(f"Config {recommendation_id} ({method}) has zero required_days")
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Config {recommendation_id} ({method}): {e}")
+
+
+def _require(mapping: Dict[str, Any], *fields: str) -> None:
+    """Raise KeyError for the first missing field"""
+    for field in fields:
+        if field not in mapping:
+            raise KeyError(field)
+
+
+class ConfigFile:
+    """Load/compile result for one config file, reused until the file changes"""
+
+    __slots__ = ('path', 'signature', 'digest', 'recommendation_id', 'config', 'scorer', 'error')
+
+    def __init__(
+        self,
+        path: str,
+        signature: Tuple[int, int],
+        digest: str,
+        recommendation_id: Optional[str] = None,
+        config: Optional[Dict[str, Any]] = None,
+        scorer: Optional[CompiledScorer] = None,
+        error: Optional[str] = None
+    ):
+        self.path = path
+        self.signature = signature
+        self.digest = digest
+        self.recommendation_id = recommendation_id
+        self.config = config
+        self.scorer = scorer
+        self.error = error
+
+
+class RegistrySnapshot:
+    """
+    Immutable view of the compiled configs at one point in time
+
+    The registry swaps in a new snapshot on reload; a request that grabs
+    a snapshot once keeps a consistent view even if a reload happens mid-request.
+    """
+
+    __slots__ = ('files', 'configs', 'scorers', 'by_metric', 'errors', 'version')
+
+    def __init__(
+        self,
+        files: Dict[str, ConfigFile],
+        by_metric: Dict[str, Tuple[CompiledScorer, ...]],
+        version: int
+    ):
+        self.files = files
+        self.configs: Dict[str, Dict] = {}
+        self.scorers: Dict[str, CompiledScorer] = {}
+        self.errors: Dict[str, str] = {}
+        for path, entry in files.items():
+            if entry.config is not None:
+                self.configs[entry.recommendation_id] = entry.config
+            if entry.scorer is not None:
+                self.scorers[entry.recommendation_id] = entry.scorer
+            if entry.error is not None:
+                self.errors[path] = entry.error
+        self.by_metric = by_metric
+        self.version = version
+
+    def scorers_for_metric(self, metric_id: str) -> Tuple[CompiledScorer, ...]:
+        """All compiled scorers that track the given metric"""
+        return self.by_metric.get(metric_id, ())
+
+
+class ConfigRegistry:
+    """Compiled scorers for every config in a directory, indexed by metric"""
+
+    def __init__(self, config_dir: str = "src/generated_configs/", bundle_path: Optional[str] = None):
+        """
+        Compile all configs in config_dir
+
+        Args:
+            config_dir: Directory containing recommendation config JSON files
+            bundle_path: Load from a packed config bundle instead of the
+                individual JSON files (see config_bundle.py)
+        """
+        self.config_dir = config_dir
+        self.bundle_path = bundle_path
+        self.logger = logging.getLogger(__name__)
+        self._reload_lock = threading.Lock()
+        self._bundle: Optional[ConfigBundle] = None
+        self._bundle_signature: Optional[Tuple[int, int]] = None
+        # Stat-only: _load_file reads and hashes each changed file once itself
+        self._fingerprints = FingerprintService(config_dir, hash_contents=False)
+        self._snapshot = RegistrySnapshot({}, {}, version=0)
+        self.reload()
+
+    @property
+    def snapshot(self) -> RegistrySnapshot:
+        """Current snapshot; grab once per request for a consistent view"""
+        return self._snapshot
+
+    @property
+    def configs(self) -> Dict[str, Dict]:
+        return self._snapshot.configs
+
+    @property
+    def scorers(self) -> Dict[str, CompiledScorer]:
+        return self._snapshot.scorers
+
+    @property
+    def by_metric(self) -> Dict[str, Tuple[CompiledScorer, ...]]:
+        return self._snapshot.by_metric
+
+    @property
+    def errors(self) -> Dict[str, str]:
+        return self._snapshot.errors
+
+    def scorers_for_metric(self, metric_id: str) -> Tuple[CompiledScorer, ...]:
+        """All compiled scorers that track the given metric"""
+        return self._snapshot.scorers_for_metric(metric_id)
+
+    def _current_signature(self) -> Dict[str, Tuple[int, int]]:
+        # The fingerprint service skips the master file, which aggregates
+        # every config and is not a config itself
+        return {
+            os.path.join(self.config_dir, name): (entry.mtime_ns, entry.size)
+            for name, entry in self._fingerprints.scan().items()
+        }
+
+    def _bundle_file_signature(self) -> Tuple[int, int]:
+        stat = os.stat(self.bundle_path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _bundle_entries(self) -> Dict[str, Tuple[int, int]]:
+        """Open the bundle and return the signature of each config in it"""
+        self._bundle = ConfigBundle(self.bundle_path)
+        return {
+            f"{self.bundle_path}#{rec_id}": (self._bundle.build_version, len(self._bundle.raw(rec_id)))
+            for rec_id in self._bundle
+        }
+
+    def _read(self, path: str) -> bytes:
+        if self._bundle is not None:
+            return bytes(self._bundle.raw(path.rsplit('#', 1)[1]))
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def _load_file(self, path: str, signature: Tuple[int, int], previous: Optional[ConfigFile]) -> ConfigFile:
+        """Parse and compile one file, reusing the previous result if its content is unchanged"""
+        try:
+            raw = self._read(path)
+        except OSError as e:
+            return ConfigFile(path, signature, '', error=str(e))
+
+        # The only read and hash of a changed file; reusing a compiled scorer
+        # needs a collision-resistant digest
+        digest = hashlib.sha1(raw).hexdigest()
+        if previous is not None and previous.digest == digest:
+            # Touched but not modified
+            return ConfigFile(
+                path, signature, digest, previous.recommendation_id,
+                previous.config, previous.scorer, previous.error
+            )
+
+        try:
+            config = json.loads(raw)
+            rec_id = config['metadata']['recommendation_id']
+        except Exception as e:
+            self.logger.error(f"Failed to load config {path}: {e}")
+            return ConfigFile(path, signature, digest, error=str(e))
+
+        try:
+            scorer = compile_config(config, rec_id)
+        except UnsupportedMethodError as e:
+            self.logger.info(f"Config {rec_id} not scorable: {e}")
+            return ConfigFile(path, signature, digest, rec_id, config)
+        except ValueError as e:
+            self.logger.warning(f"Config {rec_id} not scorable: {e}")
+            return ConfigFile(path, signature, digest, rec_id, config, error=str(e))
+
+        return ConfigFile(path, signature, digest, rec_id, config, scorer)
+
+    def reload(self) -> bool:
+        """
+        Recompile configs whose files were added, removed or changed
+
+        Unchanged files keep their compiled scorers, only metrics touched by
+        changed configs are re-indexed, and the new snapshot is swapped in
+        with a single reference assignment.
+
+        Returns:
+            True if a new snapshot was published
+        """
+        with self._reload_lock:
+            current = self._snapshot
+            if self.bundle_path is not None:
+                bundle_signature = self._bundle_file_signature()
+                if bundle_signature == self._bundle_signature:
+                    return False
+                try:
+                    published = self._apply(current, self._bundle_entries())
+                finally:
+                    if self._bundle is not None:
+                        self._bundle.close()
+                        self._bundle = None
+                # Only remember the bundle once it was applied, so a failed
+                # reload is retried on the next poll
+                self._bundle_signature = bundle_signature
+                return published
+            return self._apply(current, self._current_signature())
+
+    def _apply(self, current: RegistrySnapshot, signature: Dict[str, Tuple[int, int]]) -> bool:
+        """Build and publish the snapshot for a new signature (caller holds the reload lock)"""
+        changed = [
+            path for path, sig in signature.items()
+            if path not in current.files or current.files[path].signature != sig
+        ]
+        removed = [path for path in current.files if path not in signature]
+        if not changed and not removed:
+            return False
+
+        files = dict(current.files)
+        for path in removed:
+            del files[path]
+        for path in changed:
+            files[path] = self._load_file(path, signature[path], current.files.get(path))
+
+        # Re-index only the metrics whose scorers were replaced or removed,
+        # rebuilding each touched tuple in file order so lookups are deterministic
+        old_scorers = [current.files[p].scorer for p in changed + removed if p in current.files]
+        new_scorers = [files[p].scorer for p in changed]
+        touched_metrics = {
+            metric_id
+            for scorer in old_scorers + new_scorers if scorer is not None
+            for metric_id in scorer.tracked_metrics
+        }
+
+        rebuilt: Dict[str, List[CompiledScorer]] = {metric_id: [] for metric_id in touched_metrics}
+        for path in sorted(files):
+            scorer = files[path].scorer
+            if scorer is None or not scorer.scores_entries:
+                continue
+            for metric_id in scorer.tracked_metrics:
+                if metric_id in rebuilt:
+                    rebuilt[metric_id].append(scorer)
+
+        by_metric = dict(current.by_metric)
+        for metric_id, scorers in rebuilt.items():
+            if scorers:
+                by_metric[metric_id] = tuple(scorers)
+            else:
+                by_metric.pop(metric_id, None)
+
+        self._snapshot = RegistrySnapshot(files, by_metric, current.version + 1)
+        self.logger.info(
+            f"Config registry v{current.version + 1}: "
+            f"{len(changed)} changed, {len(removed)} removed"
+        )
+        return True
+
+
+class ConfigWatcher:
+    """Polls a registry's config directory and reloads it when files change"""
+
+    def __init__(self, registry: ConfigRegistry, interval: float = 5.0):
+        """
+        Args:
+            registry: Registry to keep up to date
+            interval: Seconds between mtime/size polls
+        """
+        self.registry = registry
+        self.interval = interval
+        self.logger = logging.getLogger(__name__)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "ConfigWatcher":
+        """Start polling in a daemon thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop polling"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.registry.reload()
+            except Exception as e:
+                # Keep serving the last good snapshot
+                self.logger.error(f"Config reload failed: {e}")
@@ -13,47 +13,64 @@ Key Features:
 - User preference management for display units
 """
 
+import csv
 import json
-import pandas as pd
 from typing import Dict, Any, List, Optional, Union, Tuple
 from decimal import Decimal, ROUND_HALF_UP
 from datetime import datetime
 import logging
 
 from .unit_conversion_service import UnitConversionService
+from .user_preference_service import UserPreferenceService
+from .config_registry import ConfigRegistry, compile_config
+
+
+# Metrics referenced before metric_types_v3 covered them
+LEGACY_METRIC_UNIT_TYPES = {
+    'dietary_water': 'volume',
+    'body_weight': 'mass',
+    'height': 'length',
+    'daily_whole_food_meals': 'count'
+}
 
 
 class RecommendationEngineWithUnits:
     """Enhanced recommendation engine with unit conversion capabilities"""
     
-    def __init__(self, config_dir: str = "src/generated_configs/"):
+    def __init__(
+        self,
+        config_dir: str = "src/generated_configs/",
+        audit_sink: Optional[Any] = None,
+        preference_service: Optional[UserPreferenceService] = None,
+        metric_types_csv: str = "src/ref_csv_files_airtable/metric_types_v3.csv",
+        config_bundle: Optional[str] = None
+    ):
         """
         Initialize the recommendation engine with unit conversion
         
         Args:
             config_dir: Directory containing recommendation config JSON files
+            audit_sink: Optional BufferedAuditSink receiving conversion audit entries
+            preference_service: Cached user unit preferences (defaults only if omitted)
+            metric_types_csv: Metric definitions used to map metrics to unit types
+            config_bundle: Packed config bundle to load instead of config_dir's JSON files
         """
         self.config_dir = config_dir
-        self.unit_converter = UnitConversionService()
-        self.configs = self._load_recommendation_configs()
         self.logger = logging.getLogger(__name__)
+        self.audit_sink = audit_sink
+        self.preference_service = preference_service or UserPreferenceService()
+        self.unit_converter = UnitConversionService()
+        self.metric_unit_types = self._build_metric_unit_types(metric_types_csv)
+        self.config_registry = ConfigRegistry(config_dir, bundle_path=config_bundle)
         
-    def _load_recommendation_configs(self) -> Dict[str, Dict]:
-        """Load and parse recommendation configuration files"""
-        configs = {}
-        import os
-        import glob
+    @property
+    def configs(self) -> Dict[str, Dict]:
+        """Raw recommendation configs keyed by recommendation ID"""
+        return self.config_registry.configs
         
-        for config_file in glob.glob(os.path.join(self.config_dir, "*.json")):
-            try:
-                with open(config_file, 'r') as f:
-                    config = json.load(f)
-                    rec_id = config['metadata']['recommendation_id']
-                    configs[rec_id] = config
-            except Exception as e:
-                self.logger.error(f"Failed to load config {config_file}: {e}")
-                
-        return configs
+    def reload_configs(self) -> bool:
+        """Recompile configs if any file in config_dir (or the bundle) changed"""
+        return self.config_registry.reload()
         
     def process_user_input(
         self, 
@@ -80,18 +97,15 @@ class RecommendationEngineWithUnits:
             # Convert to base unit for algorithm processing
             conversion_result = self.unit_converter.convert_to_base(value, input_unit)
             
-            # Find matching recommendation configs for this metric
-            matching_configs = self._find_configs_for_metric(metric_id)
-            
-            # Process scores for each matching configuration
+            # Process scores for each compiled config tracking this metric,
+            # from one snapshot so a concurrent reload can't mix config versions
+            snapshot = self.config_registry.snapshot
             scores = {}
-            for config_id, config in matching_configs.items():
-                score_result = self._calculate_score_with_conversion(
-                    config, 
+            for scorer in snapshot.scorers_for_metric(metric_id):
+                scores[scorer.recommendation_id] = scorer.calculate(
                     conversion_result['converted_value'],
                     conversion_result['base_unit']
                 )
-                scores[config_id] = score_result
                 
             # Prepare result
             result = {
@@ -113,18 +127,11 @@ class RecommendationEngineWithUnits:
             raise
             
     def _find_configs_for_metric(self, metric_id: str) -> Dict[str, Dict]:
-        """Find all recommendation configs that track the given metric"""
-        matching_configs = {}
-        
-        for config_id, config in self.configs.items():
-            try:
-                tracked_metrics = config['configuration_json']['schema']['tracked_metrics']
-                if metric_id in tracked_metrics:
-                    matching_configs[config_id] = config
-            except KeyError:
-                continue
-                
-        return matching_configs
+        """Find all scorable recommendation configs that track the given metric"""
+        return {
+            scorer.recommendation_id: scorer.config
+            for scorer in self.config_registry.scorers_for_metric(metric_id)
+        }
         
     def _calculate_score_with_conversion(
         self, 
@@ -133,7 +140,10 @@ class RecommendationEngineWithUnits:
         base_unit: str
     ) -> Dict[str, Any]:
         """
-        Calculate recommendation score using base unit values
+        Calculate recommendation score for a config outside the registry
+        
+        Registered configs are precompiled; this compiles a one-off config
+        and scores it with the same scorer classes.
         
         Args:
             config: Recommendation configuration
@@ -143,167 +153,8 @@ class RecommendationEngineWithUnits:
         Returns:
             Dict with score calculation results
         """
-        schema = config['configuration_json']['schema']
-        method = config['configuration_json']['method']
-        
-        # Validate that config expects this base unit
-        expected_base_unit = schema.get('base_unit', schema.get('unit'))  # backwards compatibility
-        if expected_base_unit != base_unit:
-            raise ValueError(f"Unit mismatch: config expects {expected_base_unit}, got {base_unit}")
-            
-        # Apply the appropriate scoring algorithm
-        if method == 'proportional':
-            if schema.get('evaluation_pattern') == 'weekly_frequency':
-                score = self._calculate_proportional_frequency_score(schema, base_value)
-            elif schema.get('evaluation_pattern') == 'daily_achievement':
-                score = self._calculate_proportional_daily_score(schema, base_value)
-            else:
-                score = self._calculate_basic_proportional_score(schema, base_value)
-        elif method == 'binary_threshold':
-            score = self._calculate_binary_threshold_score(schema, base_value)
-        elif method == 'binary' and schema.get('evaluation_pattern') == 'weekly_frequency':
-            score = self._calculate_binary_frequency_score(schema, base_value)
-        elif method == 'minimum_frequency':
-            score = self._calculate_minimum_frequency_score(schema, base_value)
-        elif method == 'weekly_elimination':
-            score = self._calculate_weekly_elimination_score(schema, base_value)
-        else:
-            raise ValueError(f"Unsupported scoring method: {method}")
-            
-        return {
-            'score': score,
-            'base_value': base_value,
-            'base_unit': base_unit,
-            'method': method,
-            'config_id': config['config_id']
-        }
-        
-    def _calculate_proportional_frequency_score(self, schema: Dict, value: float) -> float:
-        """Calculate score for proportional frequency patterns"""
-        threshold = schema['daily_threshold']
-        required_days = schema['required_days']
-        
-        # For individual day assessment, assume this represents one day meeting threshold
-        if value >= threshold:
-            days_meeting = 1
-        else:
-            days_meeting = 0
-            
-        # Proportional scoring: (days_meeting / required_days) * 100
-        score = min(100, (days_meeting / required_days) * 100)
-        return round(score, 2)
-        
-    def _calculate_proportional_daily_score(self, schema: Dict, value: float) -> float:
-        """Calculate score for proportional daily achievement"""
-        target = schema['daily_target']
-        
-        # Proportional to target: (actual / target) * 100, capped at 100
-        score = min(100, (value / target) * 100)
-        return round(score, 2)
-        
-    def _calculate_binary_threshold_score(self, schema: Dict, value: float) -> float:
-        """Calculate score for binary threshold patterns"""
-        threshold = schema['threshold']
-        success_value = schema.get('success_value', 100)
-        failure_value = schema.get('failure_value', 0)
-        
-        if value >= threshold:
-            return float(success_value)
-        else:
-            return float(failure_value)
-            
-    def _calculate_binary_frequency_score(self, schema: Dict, value: float) -> float:
-        """Calculate score for binary frequency patterns"""
-        threshold = schema['daily_threshold']
-        
-        # For binary frequency, if daily threshold is met, assume success for that pattern
-        if value >= threshold:
-            return 100.0
-        else:
-            return 20.0  # Standard "failure" score for binary patterns
-            
-    def _calculate_basic_proportional_score(self, schema: Dict, value: float) -> float:
-        """Calculate basic proportional score"""
-        # This would need more specific implementation based on the schema
-        # For now, assume a simple percentage calculation
-        max_value = schema.get('maximum_cap', 100)
-        score = min(max_value, (value / max_value) * 100)
-        return round(score, 2)
-        
-    def _calculate_minimum_frequency_score(self, schema: Dict, value: float) -> float:
-        """
-        Calculate SC-MINIMUM-FREQUENCY score
-        
-        For single day input, determine if this day meets threshold.
-        Full weekly calculation would require 7 daily values.
-        This is a simplified version for individual day assessment.
-        """
-        threshold = schema['daily_threshold']
-        comparison = schema['daily_comparison']
-        required_days = schema['required_days']
-        
-        # Check if this day meets the threshold
-        day_meets_threshold = False
-        if comparison == "<=":
-            day_meets_threshold = value <= threshold
-        elif comparison == ">=":
-            day_meets_threshold = value >= threshold
-        elif comparison == "==":
-            day_meets_threshold = value == threshold
-            
-        # For single day input, we can only assess if this day would contribute
-        # In real implementation, we'd need all 7 days to calculate final score
-        # For now, return 100 if day meets threshold, 0 if not
-        # This is a placeholder - full implementation needs weekly data
-        
-        if day_meets_threshold:
-            # This day contributes to the weekly goal
-            # Real calculation: successful_days >= required_days ? 100 : 0
-            return 100.0  # Placeholder - indicates this day meets criteria
-        else:
-            return 0.0    # This day does not meet criteria
-            
-    def _calculate_weekly_elimination_score(self, schema: Dict, value: float) -> float:
-        """
-        Calculate SC-WEEKLY-ELIMINATION score
-        
-        For weekly elimination, any violation during the week = 0 for entire week.
-        This method handles single day input - full weekly calculation needs all 7 days.
-        """
-        if schema.get('calculation_method') == 'weekly_sum_limit':
-            # Weekly limit variant (e.g., ≤1 takeout meal per week)
-            weekly_limit = schema['weekly_limit']
-            # For single day, we can't calculate weekly sum yet
-            # This is a placeholder - real implementation needs weekly aggregation
-            return 100.0 if value <= weekly_limit else 0.0
-            
-        elif schema.get('calculation_method') == 'monthly_sum_limit':
-            # Monthly limit variant
-            monthly_limit = schema['monthly_limit']
-            # Placeholder for monthly aggregation
-            return 100.0 if value <= monthly_limit else 0.0
-            
-        else:
-            # Daily elimination variant (most common)
-            elimination_threshold = schema['elimination_threshold']
-            comparison = schema['elimination_comparison']
-            
-            # Check if this day meets elimination criteria
-            if comparison == "==":
-                day_meets_elimination = (value == elimination_threshold)
-            elif comparison == "<=":
-                day_meets_elimination = (value <= elimination_threshold)
-            elif comparison == ">=":
-                day_meets_elimination = (value >= elimination_threshold)
-            else:
-                day_meets_elimination = False
-                
-            # For weekly elimination, ALL days must meet criteria
-            # Single day violation = entire week fails
-            # For single day input, return 100 if meets criteria, 0 if violates
-            # Real implementation needs all 7 days: any day fails = week fails
-            
-            return 100.0 if day_meets_elimination else 0.0
+        rec_id = config.get('metadata', {}).get('recommendation_id', config.get('config_id'))
+        return compile_config(config, rec_id).calculate(base_value, base_unit)
         
     def get_user_display_format(
         self, 
@@ -355,32 +206,29 @@ class RecommendationEngineWithUnits:
                 'base_unit': base_unit
             }
             
+    def _build_metric_unit_types(self, metric_types_csv: str) -> Dict[str, str]:
+        """Build the metric -> unit type mapping once from metric_types_v3"""
+        metric_unit_types = dict(LEGACY_METRIC_UNIT_TYPES)
+        units = self.unit_converter.units_dict
+        
+        try:
+            with open(metric_types_csv, 'r', encoding='utf-8-sig', newline='') as f:
+                for row in csv.DictReader(f):
+                    unit = row['units'].strip()
+                    if unit in units:
+                        metric_unit_types[row['identifier']] = units[unit]['unit_type']
+        except FileNotFoundError:
+            logging.getLogger(__name__).warning(f"Metric types CSV not found: {metric_types_csv}")
+            
+        return metric_unit_types
+        
     def _get_unit_type_for_metric(self, metric_id: str) -> str:
         """Determine unit type for a metric (volume, mass, etc.)"""
-        # This would typically query the metric_types_v3 table or CSV
-        # For now, using common patterns
-        metric_unit_mapping = {
-            'dietary_water': 'volume',
-            'body_weight': 'mass',
-            'height': 'length',
-            'daily_whole_food_meals': 'count'
-        }
-        
-        return metric_unit_mapping.get(metric_id, 'count')
+        return self.metric_unit_types.get(metric_id, 'count')
         
     def _get_user_preferred_unit(self, user_id: str, unit_type: str) -> str:
         """Get user's preferred unit for a unit type"""
-        # This would typically query the user_unit_preferences table
-        # For now, using defaults
-        default_preferences = {
-            'volume': 'cup',
-            'mass': 'pound',
-            'length': 'feet_inches',
-            'temperature': 'fahrenheit',
-            'count': 'count'
-        }
-        
-        return default_preferences.get(unit_type, 'count')
+        return self.preference_service.get_preferred_unit(user_id, unit_type)
         
     def _log_conversion_audit(self, result: Dict[str, Any]) -> None:
         """Log conversion operation for audit trail"""
@@ -396,8 +244,11 @@ class RecommendationEngineWithUnits:
             'timestamp': result['processed_at']
         }
         
-        # This would typically insert into conversion_audit_log table
-        self.logger.info(f"Conversion audit: {audit_entry}")
+        if self.audit_sink is not None:
+            # Non-blocking; written to conversion_audit_log in batches
+            self.audit_sink.submit(audit_entry)
+        else:
+            self.logger.info("Conversion audit: %s", audit_entry)
         
     def get_supported_units_for_metric(self, metric_id: str) -> Dict[str, Any]:
         """Get list of supported input units for a metric"""
@@ -11,45 +11,154 @@ Key Features:
 - Compound conversions (feet+inches -> cm)
 - Scale mappings (1-10 scale -> 1-5 scale)
 - Bidirectional conversion for display
+- Vectorized array conversion for history endpoints and batch imports
 """
 
-import pandas as pd
+import csv
+import os
 import re
-from typing import Dict, Any, Optional, Union, Tuple
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Union, Tuple
 from decimal import Decimal, ROUND_HALF_UP
 
 
-class UnitConversionService:
-    def __init__(self, csv_path: str = "src/ref_csv_files_airtable/unit_standardization.csv"):
-        """Initialize conversion service with unit standards"""
-        self.units_df = pd.read_csv(csv_path)
-        self.units_dict = self._build_units_lookup()
-        self.base_units = self._get_base_units()
-        
-    def _build_units_lookup(self) -> Dict[str, Dict]:
-        """Build lookup dictionary from CSV data"""
-        units = {}
-        for _, row in self.units_df.iterrows():
-            unit_id = row['Unit Identifier']
+# Pattern: 5'10" or 5'10
+FEET_INCHES_PATTERN = re.compile(r"(\d+)'(\d+)\"?")
+# Anchored form of FEET_INCHES_PATTERN, for the array parser
+FEET_INCHES_PREFIX = re.compile("^" + FEET_INCHES_PATTERN.pattern)
+
+
+@dataclass(frozen=True)
+class CompiledUnitTable:
+    """
+    Unit lookup tables compiled once from unit_standardization.csv
+
+    Attributes:
+        units: Unit identifier -> unit info dict (same shape as the legacy units_dict)
+        base_units: Unit type -> base unit identifier
+        to_base_factors: Unit identifier -> multiplier into its type's base unit
+            (linear units only; special conversions are absent)
+        factor_pairs: (from_unit, to_unit) -> multiplier for every linear pair of the same type
+    """
+    units: Dict[str, Dict[str, Any]]
+    base_units: Dict[str, str]
+    to_base_factors: Dict[str, float]
+    factor_pairs: Dict[Tuple[str, str], float]
+
+
+@dataclass(frozen=True)
+class DisplayConversionPlan:
+    """
+    Base unit -> display unit conversion resolved once and applied to many values
+
+    Linear and temperature targets reduce to display = base * factor + offset.
+    Compound height targets convert centimeters to total inches and format as feet/inches.
+    """
+    base_unit: str
+    target_unit: str
+    symbol: str
+    factor: float
+    offset: float = 0.0
+    compound_height: bool = False
+
+    def apply(self, base_values: Any, decimals: Optional[int] = None) -> np.ndarray:
+        """Convert base unit values to display values (strings for compound height)"""
+        base_values = np.asarray(base_values, dtype=float)
+
+        if self.compound_height:
+            total_inches = base_values / 2.54
+            feet = (total_inches // 12).astype(int)
+            inches = (total_inches % 12).astype(int)
+            formatted = [f"{f}'{i}\"" for f, i in zip(feet.ravel().tolist(), inches.ravel().tolist())]
+            return np.array(formatted, dtype=object).reshape(base_values.shape)
+
+        display_values = base_values * self.factor + self.offset
+        if decimals is not None:
+            display_values = np.round(display_values, decimals)
+        return display_values
+
+    def format(self, display_values: Any, decimals: int = 2) -> List[str]:
+        """Format display values the same way convert_from_base does"""
+        if self.compound_height:
+            return [str(value) for value in display_values]
+
+        rounded = np.round(np.asarray(display_values, dtype=float), decimals)
+        return [f"{value} {self.symbol}" for value in rounded.tolist()]
+
+
+def _optional(value: str) -> Optional[str]:
+    """Map blank CSV cells to None"""
+    value = value.strip()
+    return value or None
+
+
+def compile_unit_table(csv_path: str) -> CompiledUnitTable:
+    """Parse the unit standardization CSV and precompute all lookup tables"""
+    units = {}
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            unit_id = row['Unit Identifier'].strip()
+            if not unit_id:
+                continue
+            factor = _optional(row['Conversion Factor'])
             units[unit_id] = {
                 'display_name': row['Display Name'],
                 'symbol': row['Symbol'],
                 'unit_type': row['Unit Type'],
-                'conversion_factor': row['Conversion Factor'] if pd.notna(row['Conversion Factor']) else None,
-                'is_base_unit': str(row['Is Base Unit']).lower() == 'checked',
-                'healthkit_equivalent': row['HealthKit Equivalent'],
-                'base_unit': row['Base Unit'],
-                'special_conversion': row['Special Conversion'] if pd.notna(row['Special Conversion']) else None
+                'conversion_factor': float(factor) if factor is not None else None,
+                'is_base_unit': row['Is Base Unit'].strip().lower() == 'checked',
+                'healthkit_equivalent': _optional(row['HealthKit Equivalent']),
+                'base_unit': _optional(row['Base Unit']),
+                'special_conversion': _optional(row['Special Conversion'])
             }
-        return units
-        
-    def _get_base_units(self) -> Dict[str, str]:
-        """Get mapping of unit types to their base units"""
-        base_units = {}
-        for unit_id, unit_info in self.units_dict.items():
-            if unit_info['is_base_unit']:
-                base_units[unit_info['unit_type']] = unit_id
-        return base_units
+
+    base_units = {}
+    for unit_id, unit_info in units.items():
+        if unit_info['is_base_unit']:
+            base_units[unit_info['unit_type']] = unit_id
+
+    # 'linear' is recorded on some base units but is not a special formula
+    to_base_factors = {}
+    for unit_id, unit_info in units.items():
+        if unit_info['special_conversion'] in (None, 'linear'):
+            to_base_factors[unit_id] = unit_info['conversion_factor'] or 1.0
+
+    factor_pairs = {}
+    for from_unit, from_factor in to_base_factors.items():
+        unit_type = units[from_unit]['unit_type']
+        for to_unit, to_factor in to_base_factors.items():
+            if units[to_unit]['unit_type'] == unit_type:
+                factor_pairs[(from_unit, to_unit)] = from_factor / to_factor
+
+    return CompiledUnitTable(
+        units=units,
+        base_units=base_units,
+        to_base_factors=to_base_factors,
+        factor_pairs=factor_pairs
+    )
+
+
+_unit_table_cache: Dict[str, Tuple[float, CompiledUnitTable]] = {}
+
+
+def load_unit_table(csv_path: str) -> CompiledUnitTable:
+    """Return the compiled unit table for a CSV, recompiling only when the file changes"""
+    path = os.path.abspath(csv_path)
+    mtime = os.path.getmtime(path)
+    cached = _unit_table_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, compile_unit_table(path))
+        _unit_table_cache[path] = cached
+    return cached[1]
+
+
+class UnitConversionService:
+    def __init__(self, csv_path: str = "src/ref_csv_files_airtable/unit_standardization.csv"):
+        """Initialize conversion service with unit standards"""
+        self.unit_table = load_unit_table(csv_path)
+        self.units_dict = self.unit_table.units
+        self.base_units = self.unit_table.base_units
         
     def convert_to_base(self, value: Union[float, str], from_unit: str) -> Dict[str, Any]:
         """
@@ -73,12 +182,9 @@ class UnitConversionService:
             base_value = self._convert_temperature_to_base(value, from_unit)
         elif special_conversion == 'compound_height':
             base_value = self._convert_compound_height_to_base(value, from_unit)
-        elif unit_info['conversion_factor'] and from_unit != unit_info['base_unit']:
-            # Standard linear conversion
-            base_value = float(value) * unit_info['conversion_factor']
         else:
-            # Already in base unit or no conversion needed
-            base_value = float(value)
+            # Standard linear conversion (factor is 1.0 for base units)
+            base_value = float(value) * self.unit_table.to_base_factors[from_unit]
             
         # Get base unit for this unit type
         base_unit = self._get_base_unit_for_type(unit_info['unit_type'])
@@ -120,9 +226,9 @@ class UnitConversionService:
                 'symbol': target_info['symbol'],
                 'formatted_display': display_value
             }
-        elif target_info['conversion_factor'] and target_unit != base_unit:
+        elif target_unit != base_unit:
             # Standard linear conversion
-            display_value = base_value / target_info['conversion_factor']
+            display_value = base_value / self.unit_table.to_base_factors[target_unit]
         else:
             # Already in target unit
             display_value = base_value
@@ -134,6 +240,116 @@ class UnitConversionService:
             'formatted_display': f"{round(display_value, 2)} {target_info['symbol']}"
         }
         
+    def convert_array_to_base(
+        self,
+        values: Any,
+        from_unit: str,
+        decimals: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Convert many user inputs in one unit to the base unit
+        
+        Args:
+            values: NumPy array, pandas Series or sequence of values. Compound
+                heights may be strings ("5'10\"") or numbers (inches / decimal feet)
+            from_unit: Source unit identifier
+            decimals: Optional rounding applied to the whole result
+            
+        Returns:
+            Float array of base unit values (same order as the input)
+        """
+        if from_unit not in self.units_dict:
+            raise ValueError(f"Unknown unit: {from_unit}")
+            
+        special_conversion = self.units_dict[from_unit]['special_conversion']
+        
+        if special_conversion == 'temperature':
+            base_values = self._convert_temperature_array_to_base(values, from_unit)
+        elif special_conversion == 'compound_height':
+            base_values = self._convert_compound_height_array_to_base(values, from_unit)
+        else:
+            base_values = np.asarray(values, dtype=float) * self.unit_table.to_base_factors[from_unit]
+            
+        if decimals is not None:
+            base_values = np.round(base_values, decimals)
+        return base_values
+        
+    def convert_array_from_base(
+        self,
+        values: Any,
+        base_unit: str,
+        target_unit: str,
+        decimals: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Convert many base unit values to a target unit for display
+        
+        Args:
+            values: NumPy array, pandas Series or sequence of base unit values
+            base_unit: Base unit identifier
+            target_unit: Target unit for display
+            decimals: Optional rounding applied to the whole result
+            
+        Returns:
+            Float array of target unit values, or an object array of
+            formatted strings for compound height targets
+        """
+        return self.build_display_plan(base_unit, target_unit).apply(values, decimals)
+        
+    def format_display_array(self, display_values: Any, target_unit: str, decimals: int = 2) -> List[str]:
+        """Format converted display values the same way convert_from_base does"""
+        if target_unit not in self.units_dict:
+            raise ValueError(f"Unknown target unit: {target_unit}")
+            
+        target_info = self.units_dict[target_unit]
+        plan = DisplayConversionPlan(
+            base_unit=target_unit,
+            target_unit=target_unit,
+            symbol=target_info['symbol'],
+            factor=1.0,
+            compound_height=target_info['special_conversion'] == 'compound_height'
+        )
+        return plan.format(display_values, decimals)
+        
+    def build_display_plan(self, base_unit: str, target_unit: str) -> DisplayConversionPlan:
+        """
+        Resolve unit info, formula and formatting for base -> target display once
+        
+        Args:
+            base_unit: Base unit identifier the values are stored in
+            target_unit: Target unit for display
+            
+        Returns:
+            DisplayConversionPlan that can be applied to any number of values
+        """
+        if target_unit not in self.units_dict:
+            raise ValueError(f"Unknown target unit: {target_unit}")
+            
+        target_info = self.units_dict[target_unit]
+        special_conversion = target_info['special_conversion']
+        factor, offset = 1.0, 0.0
+        
+        if special_conversion == 'compound_height':
+            if target_unit != 'feet_inches':
+                raise ValueError(f"Compound height display only supports feet_inches, got: {target_unit}")
+        elif special_conversion == 'temperature':
+            if target_unit == 'fahrenheit':
+                # C to F: (C × 9/5) + 32
+                factor, offset = 9/5, 32.0
+            elif target_unit != 'celsius':
+                raise ValueError(f"Unsupported temperature unit: {target_unit}")
+        elif target_unit != base_unit:
+            factor = 1 / self.unit_table.to_base_factors[target_unit]
+            
+        return DisplayConversionPlan(
+            base_unit=base_unit,
+            target_unit=target_unit,
+            symbol=target_info['symbol'],
+            factor=factor,
+            offset=offset,
+            compound_height=special_conversion == 'compound_height'
+        )
+        
     def _convert_temperature_to_base(self, value: float, from_unit: str) -> float:
         """Convert temperature to base unit (Celsius)"""
         if from_unit == 'fahrenheit':
@@ -169,9 +385,7 @@ class UnitConversionService:
             
         value_str = str(value).strip()
         
-        # Pattern: 5'10" or 5'10
-        feet_inches_pattern = r"(\d+)'(\d+)\"?"
-        match = re.match(feet_inches_pattern, value_str)
+        match = FEET_INCHES_PATTERN.match(value_str)
         
         if match:
             feet = int(match.group(1))
@@ -205,12 +419,80 @@ class UnitConversionService:
         
         return f"{feet}'{inches}\""
         
+    def _convert_temperature_array_to_base(self, values: Any, from_unit: str) -> np.ndarray:
+        """Vectorized temperature conversion to base unit (Celsius)"""
+        values = np.asarray(values, dtype=float)
+        if from_unit == 'fahrenheit':
+            return (values - 32) * 5/9
+        elif from_unit == 'celsius':
+            return values
+        else:
+            raise ValueError(f"Unsupported temperature unit: {from_unit}")
+            
+    def _convert_compound_height_array_to_base(self, values: Any, from_unit: str) -> np.ndarray:
+        """
+        Convert many compound heights to centimeters
+        
+        Numeric inputs are handled fully vectorized; string inputs are matched
+        against the precompiled feet/inches pattern, and the remaining values
+        parsed as numbers in one cast. Same formats and inches vs decimal
+        feet rule as _convert_compound_height_to_base.
+        """
+        if from_unit != 'feet_inches':
+            raise ValueError(f"Compound height conversion only supports feet_inches, got: {from_unit}")
+            
+        raw = np.asarray(values)
+        if raw.dtype.kind in 'biuf':
+            numeric = raw.astype(float)
+            total_inches = np.where(numeric > 15, numeric, numeric * 12)
+            return total_inches * 2.54
+            
+        strings = np.char.strip(raw.ravel().astype(str))
+        matches = [FEET_INCHES_PREFIX.match(value_str) for value_str in strings.tolist()]
+        matched = np.fromiter((match is not None for match in matches), dtype=bool, count=len(matches))
+        
+        total_inches = np.empty(len(strings), dtype=float)
+        total_inches[matched] = np.fromiter(
+            (int(match.group(1)) * 12 + int(match.group(2)) for match in matches if match is not None),
+            dtype=float, count=int(matched.sum())
+        )
+        
+        rest = strings[~matched]
+        try:
+            numeric = rest.astype(float)
+        except ValueError:
+            for value_str in rest:
+                try:
+                    float(value_str)
+                except ValueError:
+                    raise ValueError(f"Unable to parse height format: {value_str}")
+            raise
+        total_inches[~matched] = np.where(numeric > 15, numeric, numeric * 12)
+            
+        return total_inches.reshape(raw.shape) * 2.54
+        
     def _get_base_unit_for_type(self, unit_type: str) -> str:
         """Get the base unit identifier for a given unit type"""
-        for unit_id, unit_info in self.units_dict.items():
-            if unit_info['unit_type'] == unit_type and unit_info['is_base_unit']:
-                return unit_id
-        raise ValueError(f"No base unit found for type: {unit_type}")
+        try:
+            return self.base_units[unit_type]
+        except KeyError:
+            raise ValueError(f"No base unit found for type: {unit_type}")
+
+    def get_conversion_factor(self, from_unit: str, to_unit: str) -> Optional[float]:
+        """
+        Get the precomputed multiplier between two linear units of the same type
+
+        Returns None when either unit needs a special conversion (temperature,
+        compound height) or the units are not compatible.
+        """
+        return self.unit_table.factor_pairs.get((from_unit, to_unit))
+
+    def convert_linear(self, value: float, from_unit: str, to_unit: str) -> float:
+        """Convert directly between two linear units with a single multiply"""
+        factor = self.unit_table.factor_pairs.get((from_unit, to_unit))
+        if factor is None:
+            raise ValueError(f"No linear conversion from {from_unit} to {to_unit}")
+        return float(value) * factor
         
     def get_supported_units_for_type(self, unit_type: str) -> Dict[str, Dict]:
         """Get all supported units for a given type (for UI dropdowns)"""
@@ -0,0 +1,106 @@
+"""
+User Unit Preference Service
+============================
+
+Caches user unit preferences in process so display formatting does not need
+a database round-trip per call.
+
+Key Features:
+- LRU + TTL cache keyed by user
+- Write-through saves: the storage backend is updated, then the cache entry
+  is replaced with the stored result
+- Explicit invalidation for changes made outside this process
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+# Used when no storage backend is configured and for unit types without a stored default
+DEFAULT_UNIT_PREFERENCES = {
+    'volume': 'cup',
+    'mass': 'pound',
+    'length': 'feet_inches',
+    'temperature': 'fahrenheit',
+    'count': 'count'
+}
+
+
+class UserPreferenceService:
+    """User unit preferences backed by a MetricStorageBackend with an LRU+TTL cache"""
+
+    def __init__(self, storage=None, ttl_seconds: float = 300.0, max_users: int = 10000):
+        """
+        Initialize the preference service
+
+        Args:
+            storage: MetricStorageBackend providing get/save_user_unit_preferences
+                (None serves DEFAULT_UNIT_PREFERENCES only)
+            ttl_seconds: How long a cached user entry stays valid
+            max_users: Maximum number of users kept in the cache
+        """
+        self.storage = storage
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_preferences(self, user_id: str) -> Dict[str, str]:
+        """Get unit type -> preferred unit for a user"""
+        cached = self._get_cached(user_id)
+        if cached is not None:
+            return dict(cached)
+
+        preferences = dict(DEFAULT_UNIT_PREFERENCES)
+        if self.storage is not None:
+            preferences.update(self.storage.get_user_unit_preferences(user_id))
+        self._put(user_id, preferences)
+        return dict(preferences)
+
+    def get_preferred_unit(self, user_id: str, unit_type: str) -> str:
+        """Get a user's preferred unit for one unit type"""
+        cached = self._get_cached(user_id)
+        if cached is None:
+            cached = self.get_preferences(user_id)
+        return cached.get(unit_type, 'count')
+
+    def save_preferences(self, user_id: str, new_preferences: Dict[str, str]) -> Dict[str, str]:
+        """Persist preferences and refresh the cached entry (write-through)"""
+        if self.storage is not None:
+            stored = self.storage.save_user_unit_preferences(user_id, new_preferences)
+            preferences = dict(DEFAULT_UNIT_PREFERENCES)
+            preferences.update(stored)
+        else:
+            preferences = self.get_preferences(user_id)
+            preferences.update(new_preferences)
+        self._put(user_id, preferences)
+        return dict(preferences)
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Drop one user's cached preferences, or the whole cache"""
+        with self._lock:
+            if user_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(user_id, None)
+
+    def _get_cached(self, user_id: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            entry = self._cache.get(user_id)
+            if entry is None:
+                return None
+            expires_at, preferences = entry
+            if expires_at < time.monotonic():
+                del self._cache[user_id]
+                return None
+            self._cache.move_to_end(user_id)
+            return preferences
+
+    def _put(self, user_id: str, preferences: Dict[str, str]) -> None:
+        with self._lock:
+            self._cache[user_id] = (time.monotonic() + self.ttl_seconds, preferences)
+            self._cache.move_to_end(user_id)
+            while len(self._cache) > self.max_users:
+                self._cache.popitem(last=False)
@@ -0,0 +1,161 @@
+"""
+Buffered Conversion Audit Sink
+==============================
+
+Moves conversion audit writes off the request path. Request threads enqueue
+audit entries without blocking; a background thread flushes them in batches
+to the conversion_audit_log table (through a MetricStorageBackend) or to a
+JSONL file.
+
+Key Features:
+- Bounded queue, entries are dropped (and counted) instead of blocking
+- Flush on batch size or time interval, whichever comes first
+- Counters for submitted, written, dropped, backpressure and write errors
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Dict, Any, Callable, List, Optional
+
+
+AuditWriter = Callable[[List[Dict[str, Any]]], None]
+
+
+class JsonlAuditWriter:
+    """Append audit batches to a JSON Lines file"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __call__(self, batch: List[Dict[str, Any]]) -> None:
+        lines = ''.join(json.dumps(entry, default=str) + '\n' for entry in batch)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+
+
+class BufferedAuditSink:
+    """Bounded, non-blocking audit buffer flushed by a background thread"""
+
+    def __init__(
+        self,
+        writer: AuditWriter,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        high_water_ratio: float = 0.8
+    ):
+        """
+        Initialize the sink and start its flush thread
+
+        Args:
+            writer: Callable that persists a batch, e.g. MetricStorageBackend.log_conversions
+                or a JsonlAuditWriter
+            max_queue_size: Entries buffered before new entries are dropped
+            batch_size: Flush as soon as this many entries are pending
+            flush_interval: Flush pending entries at least this often (seconds)
+            high_water_ratio: Queue fill ratio counted as backpressure
+        """
+        self.writer = writer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.logger = logging.getLogger(__name__)
+
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue_size)
+        self._high_water_mark = max(1, int(max_queue_size * high_water_ratio))
+        self._counters = {
+            'submitted': 0,
+            'written': 0,
+            'dropped': 0,
+            'backpressure': 0,
+            'flushes': 0,
+            'write_errors': 0
+        }
+        self._counter_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="conversion-audit-sink", daemon=True)
+        self._thread.start()
+
+    def submit(self, entry: Dict[str, Any]) -> bool:
+        """
+        Enqueue an audit entry without blocking
+
+        Returns:
+            False if the buffer was full and the entry was dropped
+        """
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self._increment('dropped')
+            return False
+
+        self._increment('submitted')
+        if self._queue.qsize() >= self._high_water_mark:
+            self._increment('backpressure')
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of the sink counters plus the current queue depth"""
+        with self._counter_lock:
+            snapshot = dict(self._counters)
+        snapshot['queued'] = self._queue.qsize()
+        return snapshot
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop the flush thread after writing everything still queued"""
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def _increment(self, counter: str, amount: int = 1) -> None:
+        with self._counter_lock:
+            self._counters[counter] += amount
+
+    def _run(self) -> None:
+        """Collect batches until batch_size or flush_interval, then write them"""
+        while not self._stop.is_set():
+            batch = self._collect_batch()
+            if batch:
+                self._write(batch)
+
+        # Drain whatever is left on shutdown
+        while True:
+            batch = self._drain(self.batch_size)
+            if not batch:
+                break
+            self._write(batch)
+
+    def _collect_batch(self) -> List[Dict[str, Any]]:
+        batch: List[Dict[str, Any]] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and not self._stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=min(remaining, 0.1)))
+            except queue.Empty:
+                continue
+            batch.extend(self._drain(self.batch_size - len(batch)))
+        return batch
+
+    def _drain(self, limit: int) -> List[Dict[str, Any]]:
+        items: List[Dict[str, Any]] = []
+        while len(items) < limit:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            self.writer(batch)
+        except Exception as e:
+            self._increment('write_errors')
+            self._increment('dropped', len(batch))
+            self.logger.error("Failed to write %d conversion audit entries: %s", len(batch), e)
+            return
+        self._increment('written', len(batch))
+        self._increment('flushes')
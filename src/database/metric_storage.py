@@ -0,0 +1,307 @@
+"""
+Metric Storage Backends
+=======================
+
+Persistence for metric entries, user unit preferences and the conversion
+audit log described in schema_unit_conversion.sql.
+
+Key Features:
+- MetricStorageBackend interface used by the API layer
+- SQLiteMetricStorage reference implementation (schema_sqlite.sql)
+- Connection pooling with one connection per concurrent caller
+- Batched inserts in a single transaction
+- Fixed SQL text per operation so sqlite3 reuses prepared statements
+"""
+
+import json
+import queue
+import sqlite3
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+
+SCHEMA_PATH = Path(__file__).parent / "schema_sqlite.sql"
+
+# Statement text is kept constant so sqlite3's statement cache reuses the
+# prepared statement instead of re-parsing it on every call
+INSERT_ENTRY_SQL = """
+    INSERT INTO metric_entries (
+        entry_id, user_id, metric_id, value, original_value, original_unit,
+        base_unit, conversion_method, scores, session_id, timestamp
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SELECT_ENTRIES_SQL = """
+    SELECT entry_id, timestamp, original_value, original_unit, value,
+           base_unit, conversion_method, scores
+    FROM metric_entries
+    WHERE user_id = ? AND metric_id = ?
+    ORDER BY timestamp DESC, entry_id DESC
+    LIMIT ?
+"""
+
+SELECT_ENTRIES_BEFORE_SQL = """
+    SELECT entry_id, timestamp, original_value, original_unit, value,
+           base_unit, conversion_method, scores
+    FROM metric_entries
+    WHERE user_id = ? AND metric_id = ?
+      AND (timestamp < ? OR (timestamp = ? AND entry_id < ?))
+    ORDER BY timestamp DESC, entry_id DESC
+    LIMIT ?
+"""
+
+SELECT_PREFERENCES_SQL = """
+    SELECT user_id, unit_type, preferred_unit
+    FROM user_unit_preferences
+    WHERE user_id IN ('default', ?)
+"""
+
+UPSERT_PREFERENCE_SQL = """
+    INSERT INTO user_unit_preferences (user_id, unit_type, preferred_unit)
+    VALUES (?, ?, ?)
+    ON CONFLICT (user_id, unit_type) DO UPDATE SET
+        preferred_unit = excluded.preferred_unit,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+INSERT_AUDIT_SQL = """
+    INSERT INTO conversion_audit_log (
+        user_id, metric_id, original_value, original_unit, converted_value,
+        base_unit, conversion_method, conversion_timestamp, session_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def normalize_timestamp(timestamp: Any = None) -> str:
+    """
+    Normalize a timestamp to the ISO 8601 text stored in metric_entries
+
+    Accepts datetimes, ISO strings (including a trailing 'Z') or None for now.
+    Values are converted to UTC (naive values are taken as UTC) and written
+    with microseconds, so the text sorts in time order and the
+    (timestamp, entry_id) index ordering stays correct.
+    """
+    if timestamp is None:
+        moment = datetime.now(timezone.utc)
+    elif isinstance(timestamp, datetime):
+        moment = timestamp
+    else:
+        text = str(timestamp).strip()
+        if text.endswith('Z'):
+            text = text[:-1] + '+00:00'
+        moment = datetime.fromisoformat(text)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).isoformat(timespec='microseconds')
+
+
+class MetricStorageBackend(ABC):
+    """Storage interface for metric entries, unit preferences and audit records"""
+
+    @abstractmethod
+    def store_metric_entries(self, entries: List[Dict[str, Any]]) -> List[str]:
+        """
+        Store metric entries in one batch
+
+        Each entry needs user_id, metric_id, base_value, base_unit and may carry
+        entry_id, timestamp, original_value, original_unit, conversion_method,
+        scores and session_id.
+
+        Returns:
+            Entry IDs in input order
+        """
+
+    @abstractmethod
+    def get_metric_entries(
+        self,
+        user_id: str,
+        metric_id: str,
+        limit: int,
+        before: Optional[Tuple[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get a user's entries for a metric, newest first
+
+        Args:
+            before: (timestamp, entry_id) keyset; only older entries are returned
+        """
+
+    @abstractmethod
+    def get_user_unit_preferences(self, user_id: str) -> Dict[str, str]:
+        """Get unit type -> preferred unit, with system defaults filled in"""
+
+    @abstractmethod
+    def save_user_unit_preferences(self, user_id: str, preferences: Dict[str, str]) -> Dict[str, str]:
+        """Upsert unit preferences and return the user's full preferences"""
+
+    @abstractmethod
+    def log_conversions(self, audit_entries: List[Dict[str, Any]]) -> None:
+        """Append conversion audit records in one batch"""
+
+    def store_metric_entry(self, entry: Dict[str, Any]) -> str:
+        """Store a single metric entry and return its entry ID"""
+        return self.store_metric_entries([entry])[0]
+
+    def close(self) -> None:
+        """Release any resources held by the backend"""
+
+
+class SQLiteMetricStorage(MetricStorageBackend):
+    """SQLite reference backend implementing schema_sqlite.sql"""
+
+    def __init__(self, db_path: str = "data/wellpath_metrics.db", pool_size: int = 4):
+        """
+        Initialize the SQLite backend and create the schema if needed
+
+        Args:
+            db_path: Database file, or ':memory:' for a private in-memory database
+            pool_size: Maximum number of idle connections kept for reuse
+        """
+        if db_path == ':memory:':
+            # Pooled connections must share one in-memory database
+            self._database = f"file:wellpath-{uuid.uuid4().hex}?mode=memory&cache=shared"
+            self._uri = True
+        else:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._database = db_path
+            self._uri = False
+
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=pool_size)
+
+        # The first connection stays pooled, which also keeps an in-memory database alive
+        with self._connection() as conn:
+            conn.executescript(SCHEMA_PATH.read_text())
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self._database,
+            uri=self._uri,
+            check_same_thread=False,
+            cached_statements=256
+        )
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection for one transaction"""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def store_metric_entries(self, entries: List[Dict[str, Any]]) -> List[str]:
+        """Store metric entries with one executemany in a single transaction"""
+        entry_ids = []
+        rows = []
+        for entry in entries:
+            entry_id = entry.get('entry_id') or str(uuid.uuid4())
+            entry_ids.append(entry_id)
+            rows.append((
+                entry_id,
+                entry['user_id'],
+                entry['metric_id'],
+                float(entry['base_value']),
+                entry.get('original_value'),
+                entry.get('original_unit'),
+                entry['base_unit'],
+                entry.get('conversion_method', 'linear'),
+                json.dumps(entry.get('scores') or {}),
+                entry.get('session_id'),
+                normalize_timestamp(entry.get('timestamp'))
+            ))
+
+        with self._connection() as conn:
+            conn.executemany(INSERT_ENTRY_SQL, rows)
+        return entry_ids
+
+    def get_metric_entries(
+        self,
+        user_id: str,
+        metric_id: str,
+        limit: int,
+        before: Optional[Tuple[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Get a user's entries for a metric, newest first"""
+        with self._connection() as conn:
+            if before is None:
+                rows = conn.execute(SELECT_ENTRIES_SQL, (user_id, metric_id, limit)).fetchall()
+            else:
+                timestamp, entry_id = before
+                timestamp = normalize_timestamp(timestamp)
+                rows = conn.execute(
+                    SELECT_ENTRIES_BEFORE_SQL,
+                    (user_id, metric_id, timestamp, timestamp, entry_id, limit)
+                ).fetchall()
+
+        return [
+            {
+                'entry_id': entry_id,
+                'timestamp': timestamp,
+                'original_value': original_value,
+                'original_unit': original_unit,
+                'base_value': base_value,
+                'base_unit': base_unit,
+                'conversion_method': conversion_method,
+                'scores': json.loads(scores) if scores else {}
+            }
+            for (entry_id, timestamp, original_value, original_unit, base_value,
+                 base_unit, conversion_method, scores) in rows
+        ]
+
+    def get_user_unit_preferences(self, user_id: str) -> Dict[str, str]:
+        """Get unit preferences, user rows overriding the 'default' rows"""
+        with self._connection() as conn:
+            rows = conn.execute(SELECT_PREFERENCES_SQL, (user_id,)).fetchall()
+
+        preferences = {}
+        # Defaults first so user-specific rows win
+        for row_user, unit_type, preferred_unit in sorted(rows, key=lambda r: r[0] != 'default'):
+            preferences[unit_type] = preferred_unit
+        return preferences
+
+    def save_user_unit_preferences(self, user_id: str, preferences: Dict[str, str]) -> Dict[str, str]:
+        """Upsert unit preferences in one transaction"""
+        rows = [(user_id, unit_type, unit) for unit_type, unit in preferences.items()]
+        with self._connection() as conn:
+            conn.executemany(UPSERT_PREFERENCE_SQL, rows)
+        return self.get_user_unit_preferences(user_id)
+
+    def log_conversions(self, audit_entries: List[Dict[str, Any]]) -> None:
+        """Append conversion audit records with one executemany"""
+        rows = [
+            (
+                audit['user_id'],
+                audit['metric_id'],
+                audit['original_value'],
+                audit['original_unit'],
+                audit['converted_value'],
+                audit['base_unit'],
+                audit['conversion_method'],
+                normalize_timestamp(audit.get('timestamp')),
+                audit.get('session_id')
+            )
+            for audit in audit_entries
+        ]
+        with self._connection() as conn:
+            conn.executemany(INSERT_AUDIT_SQL, rows)
+
+    def close(self) -> None:
+        """Close all pooled connections"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
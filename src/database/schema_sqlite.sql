@@ -0,0 +1,74 @@
+-- =====================================================
+-- WellPath Metric Storage - SQLite Reference Schema
+-- =====================================================
+-- SQLite port of schema_unit_conversion.sql used by the reference
+-- storage backend (src/database/metric_storage.py).
+
+PRAGMA journal_mode = WAL;
+
+-- =====================================================
+-- 1. Metric Entries
+-- =====================================================
+-- value is the converted base unit value used by the algorithms;
+-- the original input is kept alongside it for display and audit.
+
+CREATE TABLE IF NOT EXISTS metric_entries (
+    entry_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    metric_id TEXT NOT NULL,
+    value REAL NOT NULL,
+    original_value NUMERIC,
+    original_unit TEXT,
+    base_unit TEXT,
+    conversion_method TEXT DEFAULT 'linear',
+    scores TEXT,                       -- JSON object: config id -> score
+    session_id TEXT,
+    timestamp TEXT NOT NULL,           -- ISO 8601, when the value was recorded
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+-- History queries: one user's metric, newest first, keyset paginated
+CREATE INDEX IF NOT EXISTS idx_metric_entries_user_metric_ts
+ON metric_entries(user_id, metric_id, timestamp DESC, entry_id DESC);
+
+-- =====================================================
+-- 2. User Unit Preferences
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS user_unit_preferences (
+    user_id TEXT NOT NULL,
+    unit_type TEXT NOT NULL,
+    preferred_unit TEXT NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, unit_type)
+);
+
+-- System defaults (can be overridden per user)
+INSERT OR IGNORE INTO user_unit_preferences (user_id, unit_type, preferred_unit) VALUES
+('default', 'volume', 'cup'),
+('default', 'mass', 'pound'),
+('default', 'length', 'feet_inches'),
+('default', 'temperature', 'fahrenheit'),
+('default', 'time', 'minute'),
+('default', 'energy', 'calorie');
+
+-- =====================================================
+-- 3. Conversion Audit Log
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS conversion_audit_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT,
+    metric_id TEXT,
+    original_value NUMERIC,
+    original_unit TEXT,
+    converted_value REAL,
+    base_unit TEXT,
+    conversion_method TEXT,
+    conversion_timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+    session_id TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_audit_user_metric ON conversion_audit_log(user_id, metric_id);
+CREATE INDEX IF NOT EXISTS idx_audit_conversion_timestamp ON conversion_audit_log(conversion_timestamp);
@@ -3,16 +3,38 @@ Recommendation Configuration Generator
 
 Analyzes recommendations and generates appropriate algorithm configurations
 using the units_v3 and metric_types_v3 data for proper metric and unit linking.
+
+Usage (bulk regeneration):
+    python src/recommendation_config_generator.py [recommendations_v2.csv | recommendations_list.json]
+        [-o output_dir] [-w workers] [--only REC_ID ...]
 """
 
+import argparse
 import csv
 import json
+import os
 import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# Single saves append here; compact_master() folds the journal into all_generated_configs.json
+MASTER_JOURNAL_FILE = "all_generated_configs.journal.jsonl"
+MASTER_LOCK_FILE = "all_generated_configs.lock"
+JOURNAL_COMPACT_BYTES = 4 * 1024 * 1024
+
 
 class AlgorithmType(Enum):
     BINARY_THRESHOLD = "binary_threshold"
@@ -28,6 +50,211 @@ class AlgorithmType(Enum):
     SLEEP_COMPOSITE = "sleep_composite"
 
 
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of substrings.
+    
+    match() makes one pass over a text and returns a bitmask of every
+    pattern occurring in it (overlapping and nested occurrences included),
+    which is what repeated `pattern in text` checks would report.
+    """
+    
+    def __init__(self, patterns: List[str]):
+        self.bits = {pattern: 1 << i for i, pattern in enumerate(dict.fromkeys(patterns))}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[int] = [0]
+        
+        for pattern, bit in self.bits.items():
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(0)
+                node = nxt
+            self._out[node] |= bit
+        
+        # Breadth-first so each node's failure link is final before its children use it,
+        # then fold failure links into a full transition table (no backtracking in match)
+        self._delta: List[Dict[str, int]] = [dict(self._goto[0])] + [None] * (len(self._goto) - 1)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            if node:
+                self._delta[node] = {**self._delta[self._fail[node]], **self._goto[node]}
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                self._fail[nxt] = self._delta[self._fail[node]].get(ch, 0) if node else 0
+                self._out[nxt] |= self._out[self._fail[nxt]]
+        
+        self._masks: Dict[Tuple[str, ...], int] = {}
+    
+    def match(self, text: str) -> int:
+        """Bitmask of the patterns found in text."""
+        delta, out = self._delta, self._out
+        node = 0
+        found = 0
+        for ch in text:
+            node = delta[node].get(ch, 0)
+            found |= out[node]
+        return found
+    
+    def contains(self, found: int, pattern: str) -> bool:
+        return bool(found & self.bits[pattern])
+    
+    def count(self, found: int, patterns: Tuple[str, ...]) -> int:
+        """Number of the given patterns present in a match() result."""
+        mask = self._masks.get(patterns)
+        if mask is None:
+            mask = 0
+            for pattern in patterns:
+                mask |= self.bits[pattern]
+            self._masks[patterns] = mask
+        return bin(found & mask).count('1')
+
+
+# Keywords for different algorithm types
+BINARY_KEYWORDS = (
+    "avoid", "eliminate", "stop", "don't", "never", "always", "must", 
+    "complete", "finish", "achieve", "reach", "hit", "yes/no", "true/false",
+    "meet", "exceed", "pass", "fail", "threshold", "minimum"
+)
+
+# High-priority binary patterns (exact matches get bonus weight)
+BINARY_PRIORITY_PATTERNS = (
+    "add one", "take one", "include one", "have one", "consume one", "replace one",
+    "one daily", "one serving", "single serving", "single daily",
+    "as default", "as the default", "eliminate most", "eliminate all",
+    "no more than", "eliminate entirely", "eliminate alcohol", "eliminate"
+)
+
+# Remove "every main meal" from binary patterns - should be proportional
+PROPORTIONAL_PRIORITY_PATTERNS = (
+    "every main meal", "at every meal", "each meal"
+)
+
+PROPORTIONAL_KEYWORDS = (
+    "increase", "decrease", "reduce", "more", "less", "percent", "%", 
+    "ratio", "proportion", "target", "goal", "aim for", "strive for",
+    "grams", "servings", "minutes", "hours", "times", "days", "at least"
+)
+
+ZONE_KEYWORDS = (
+    "optimal", "range", "between", "zone", "tier", "level", "grade",
+    "excellent", "good", "fair", "poor", "low", "medium", "high",
+    "category", "classification"
+)
+
+FREQUENCY_KEYWORDS = (
+    "weekly", "daily", "times per", "days per", "frequency", "often",
+    "regularly", "consistently", "habit", "routine", "schedule"
+)
+
+MINIMUM_FREQUENCY_KEYWORDS = (
+    "at least", "times per week", "days per week", "minimum", "sessions per week",
+    "per week"
+)
+
+COMPOSITE_KEYWORDS = (
+    "overall", "combined", "multiple", "both", "and", "together",
+    "comprehensive", "holistic", "total", "composite", "weighted",
+    "plus", "maintain", "consistent", "schedule", "variation", "variance",
+    "with at least", "different", "sources", "variety"
+)
+
+WEEKLY_ALLOWANCE_KEYWORDS = (
+    "per week", "weekly", "across", "days", "week across", 
+    "drinks per week", "week across 2 days"
+)
+
+TIER_WORDS = ('excellent', 'good', 'fair', 'poor', 'critical')
+
+# Phrases checked individually when picking the evaluation pattern and composite bonus
+ANALYSIS_PHRASES = (
+    "every", "different", "with at least", "sources", "times per week", "days per week",
+    "per week", "weekly", "of 7", "nights", "hours"
+)
+
+ANALYSIS_MATCHER = KeywordMatcher(
+    BINARY_KEYWORDS + BINARY_PRIORITY_PATTERNS + PROPORTIONAL_PRIORITY_PATTERNS
+    + PROPORTIONAL_KEYWORDS + ZONE_KEYWORDS + FREQUENCY_KEYWORDS + MINIMUM_FREQUENCY_KEYWORDS
+    + COMPOSITE_KEYWORDS + WEEKLY_ALLOWANCE_KEYWORDS + TIER_WORDS + ANALYSIS_PHRASES
+)
+
+RANGE_PATTERN = re.compile(r'\d+[-–]\d+\s*(hours?|minutes?|grams?|mg|servings?)')
+
+# Recommendation words that boost metrics whose identifier contains the same word
+METRIC_BOOST_KEYWORDS = ('vegetable', 'protein', 'water', 'step', 'meditation', 'strength', 'hiit')
+POST_MEAL_PHRASES = ('after meal', 'post meal', 'times', 'sessions')
+
+
+class MetricIndex:
+    """
+    Inverted index from text terms to the metrics they score.
+    
+    Terms are metric names (weight 10), description words longer than three
+    characters (1 per occurrence) and identifier parts longer than three
+    characters (2), plus optional boost keywords found in the identifier (5).
+    A term scores when it occurs anywhere in the recommendation text, so
+    one automaton pass finds the present terms and their posting lists
+    give each candidate metric's score.
+    """
+    
+    def __init__(
+        self,
+        metrics: Dict[str, Dict],
+        boost_keywords: Tuple[str, ...] = (),
+        extra_phrases: Tuple[str, ...] = ()
+    ):
+        self.metric_ids = list(metrics)
+        postings: Dict[str, Dict[int, int]] = {}
+        
+        def post(term: str, position: int, weight: int) -> None:
+            metric_weights = postings.setdefault(term, {})
+            metric_weights[position] = metric_weights.get(position, 0) + weight
+        
+        for position, (metric_id, metric_data) in enumerate(metrics.items()):
+            post(metric_data['name'].lower(), position, 10)
+            for word in metric_data.get('description', '').lower().split():
+                if len(word) > 3:
+                    post(word, position, 1)
+            for part in metric_id.replace('_', ' ').split():
+                if len(part) > 3:
+                    post(part, position, 2)
+            for keyword in boost_keywords:
+                if keyword in metric_id:
+                    post(keyword, position, 5)
+        
+        # An empty name is a substring of every text
+        self._always = postings.pop('', {})
+        self._postings = {term: tuple(weights.items()) for term, weights in postings.items()}
+        self.matcher = KeywordMatcher(list(self._postings) + list(extra_phrases))
+    
+    def score(self, text_lower: str) -> Tuple[Dict[int, int], int]:
+        """Scores of metrics matching text (by position) and the raw matcher result."""
+        found = self.matcher.match(text_lower)
+        scores = dict(self._always)
+        for term, bit in self.matcher.bits.items():
+            if found & bit and term in self._postings:
+                for position, weight in self._postings[term]:
+                    scores[position] = scores.get(position, 0) + weight
+        return scores, found
+    
+    def best(self, scores: Dict[int, int], floor: int = 0) -> Tuple[Optional[str], int]:
+        """Earliest metric with the highest score above floor."""
+        best_position, best_score = None, floor
+        for position in sorted(scores):
+            if scores[position] > best_score:
+                best_position, best_score = position, scores[position]
+        if best_position is None:
+            return None, floor
+        return self.metric_ids[best_position], best_score
+
+
 @dataclass
 class RecommendationAnalysis:
     """Analysis of a recommendation to determine best algorithm."""
@@ -41,12 +268,51 @@ class RecommendationAnalysis:
 class RecommendationConfigGenerator:
     """Generates algorithm configurations from recommendations."""
     
-    def __init__(self):
-        self.units_data = self._load_units_data()
-        self.calculated_metrics_data = self._load_calculated_metrics_data()
-        self.metrics_data = self._load_metrics_data()  # Keep as fallback
-        self.source_options_data = self._load_source_options_data()
+    def __init__(self, reference_data: Optional[Dict[str, Dict]] = None):
+        """
+        Args:
+            reference_data: Already-loaded reference tables (see reference_data);
+                loaded from the reference CSVs when omitted
+        """
+        if reference_data is None:
+            self.units_data = self._load_units_data()
+            self.calculated_metrics_data = self._load_calculated_metrics_data()
+            self.metrics_data = self._load_metrics_data()  # Keep as fallback
+            self.source_options_data = self._load_source_options_data()
+        else:
+            self.units_data = reference_data['units_data']
+            self.calculated_metrics_data = reference_data['calculated_metrics_data']
+            self.metrics_data = reference_data['metrics_data']
+            self.source_options_data = reference_data['source_options_data']
+        self._build_metric_indexes()
         self.generated_configs = []
+        self._batch: Optional[List[Dict[str, Any]]] = None
+    
+    def _build_metric_indexes(self) -> None:
+        """Index metric names, descriptions and identifiers for find_related_metric."""
+        self.calculated_metric_index = MetricIndex(
+            self.calculated_metrics_data, METRIC_BOOST_KEYWORDS, POST_MEAL_PHRASES
+        )
+        self.metric_index = MetricIndex(self.metrics_data)
+        self._post_meal_positions = [
+            (position, 'sessions' in metric_id)
+            for position, metric_id in enumerate(self.calculated_metric_index.metric_ids)
+            if 'post_meal_activity' in metric_id
+        ]
+        self._metric_by_recommendation: Dict[str, str] = {}
+        for metric_id, metric_data in self.metrics_data.items():
+            for rec_id in metric_data.get('recommendations_v2', []):
+                self._metric_by_recommendation.setdefault(rec_id, metric_id)
+    
+    @property
+    def reference_data(self) -> Dict[str, Dict]:
+        """Loaded reference tables, for building more generators without re-reading the CSVs."""
+        return {
+            'units_data': self.units_data,
+            'calculated_metrics_data': self.calculated_metrics_data,
+            'metrics_data': self.metrics_data,
+            'source_options_data': self.source_options_data
+        }
     
     def _load_units_data(self) -> Dict[str, Dict]:
         """Load units data from CSV."""
@@ -159,98 +425,47 @@ class RecommendationConfigGenerator:
         
         text_lower = recommendation_text.lower()
         
-        # Keywords for different algorithm types
-        binary_keywords = [
-            "avoid", "eliminate", "stop", "don't", "never", "always", "must", 
-            "complete", "finish", "achieve", "reach", "hit", "yes/no", "true/false",
-            "meet", "exceed", "pass", "fail", "threshold", "minimum"
-        ]
-        
-        # High-priority binary patterns (exact matches get bonus weight)
-        binary_priority_patterns = [
-            "add one", "take one", "include one", "have one", "consume one", "replace one",
-            "one daily", "one serving", "single serving", "single daily",
-            "as default", "as the default", "eliminate most", "eliminate all",
-            "no more than", "eliminate entirely", "eliminate alcohol", "eliminate"
-        ]
-        
-        # Remove "every main meal" from binary patterns - should be proportional
-        proportional_priority_patterns = [
-            "every main meal", "at every meal", "each meal"
-        ]
-        
-        proportional_keywords = [
-            "increase", "decrease", "reduce", "more", "less", "percent", "%", 
-            "ratio", "proportion", "target", "goal", "aim for", "strive for",
-            "grams", "servings", "minutes", "hours", "times", "days", "at least"
-        ]
-        
-        zone_keywords = [
-            "optimal", "range", "between", "zone", "tier", "level", "grade",
-            "excellent", "good", "fair", "poor", "low", "medium", "high",
-            "category", "classification"
-        ]
-        
-        frequency_keywords = [
-            "weekly", "daily", "times per", "days per", "frequency", "often",
-            "regularly", "consistently", "habit", "routine", "schedule"
-        ]
-        
-        minimum_frequency_keywords = [
-            "at least", "times per week", "days per week", "minimum", "sessions per week",
-            "per week"
-        ]
+        found = ANALYSIS_MATCHER.match(text_lower)
         
-        composite_keywords = [
-            "overall", "combined", "multiple", "both", "and", "together",
-            "comprehensive", "holistic", "total", "composite", "weighted",
-            "plus", "maintain", "consistent", "schedule", "variation", "variance",
-            "with at least", "different", "sources", "variety"
-        ]
-        
-        weekly_allowance_keywords = [
-            "per week", "weekly", "across", "days", "week across", 
-            "drinks per week", "week across 2 days"
-        ]
+        def has(pattern: str) -> bool:
+            return ANALYSIS_MATCHER.contains(found, pattern)
         
         # Count keyword matches with priority weighting
-        binary_score = sum(1 for keyword in binary_keywords if keyword in text_lower)
+        binary_score = ANALYSIS_MATCHER.count(found, BINARY_KEYWORDS)
         
         # Check for high-priority binary patterns and add significant weight
-        priority_matches = sum(1 for pattern in binary_priority_patterns if pattern in text_lower)
+        priority_matches = ANALYSIS_MATCHER.count(found, BINARY_PRIORITY_PATTERNS)
         if priority_matches > 0:
             binary_score += priority_matches * 5  # Give 5x weight to priority patterns
         
-        proportional_score = sum(1 for keyword in proportional_keywords if keyword in text_lower)
+        proportional_score = ANALYSIS_MATCHER.count(found, PROPORTIONAL_KEYWORDS)
         
         # Check for proportional priority patterns and add weight
-        prop_priority_matches = sum(1 for pattern in proportional_priority_patterns if pattern in text_lower)
+        prop_priority_matches = ANALYSIS_MATCHER.count(found, PROPORTIONAL_PRIORITY_PATTERNS)
         if prop_priority_matches > 0:
             proportional_score += prop_priority_matches * 3  # Give 3x weight to proportional patterns
         
-        zone_score = sum(1 for keyword in zone_keywords if keyword in text_lower)
-        frequency_score = sum(1 for keyword in frequency_keywords if keyword in text_lower)
-        min_frequency_score = sum(1 for keyword in minimum_frequency_keywords if keyword in text_lower)
-        composite_score = sum(1 for keyword in composite_keywords if keyword in text_lower)
+        zone_score = ANALYSIS_MATCHER.count(found, ZONE_KEYWORDS)
+        frequency_score = ANALYSIS_MATCHER.count(found, FREQUENCY_KEYWORDS)
+        min_frequency_score = ANALYSIS_MATCHER.count(found, MINIMUM_FREQUENCY_KEYWORDS)
+        composite_score = ANALYSIS_MATCHER.count(found, COMPOSITE_KEYWORDS)
         
         # Check for high-priority composite patterns
-        if ("every" in text_lower and "different" in text_lower) or ("with at least" in text_lower and "sources" in text_lower):
+        if (has("every") and has("different")) or (has("with at least") and has("sources")):
             composite_score += 5  # Give high priority to multi-component patterns
         
-        weekly_allowance_score = sum(1 for keyword in weekly_allowance_keywords if keyword in text_lower)
+        weekly_allowance_score = ANALYSIS_MATCHER.count(found, WEEKLY_ALLOWANCE_KEYWORDS)
         
         # Check for range patterns like "7-9 hours", "20-30 minutes" and boost zone score
-        import re
-        range_pattern = r'\d+[-–]\d+\s*(hours?|minutes?|grams?|mg|servings?)'
-        if re.search(range_pattern, text_lower):
+        if RANGE_PATTERN.search(text_lower):
             zone_score += 3  # Give zone scoring high priority for range patterns
         
         # Determine evaluation pattern - check for frequency and weekly patterns
-        if "times per week" in text_lower or "days per week" in text_lower:
+        if has("times per week") or has("days per week"):
             eval_pattern = "frequency"
-        elif "per week" in text_lower or "weekly" in text_lower:
+        elif has("per week") or has("weekly"):
             eval_pattern = "weekly"
-        elif frequency_score > 1 or "of 7" in text_lower or "nights" in text_lower:
+        elif frequency_score > 1 or has("of 7") or has("nights"):
             eval_pattern = "frequency" 
         else:
             eval_pattern = "daily"
@@ -291,7 +506,7 @@ class RecommendationConfigGenerator:
         
         elif scores['zone'] == max_score and zone_score >= 2:
             # Determine tier count based on text - default to 5-tier for sleep ranges
-            if any(tier in text_lower for tier in ['excellent', 'good', 'fair', 'poor', 'critical']) or "hours" in text_lower:
+            if ANALYSIS_MATCHER.count(found, TIER_WORDS) or has("hours"):
                 algorithm_type = AlgorithmType.ZONE_BASED_5TIER
                 tier_count = 5
             else:
@@ -324,86 +539,31 @@ class RecommendationConfigGenerator:
         text_lower = recommendation_text.lower()
         
         # First try calculated_metrics data (our primary source)
-        best_match = None
-        best_score = 0
+        index = self.calculated_metric_index
+        scores, found = index.score(text_lower)
         
-        for metric_id, metric_data in self.calculated_metrics_data.items():
-            score = 0
-            
-            # Check name match
-            if metric_data['name'].lower() in text_lower:
-                score += 10
-            
-            # Check description matches
-            desc_words = metric_data['description'].lower().split()
-            for word in desc_words:
-                if len(word) > 3 and word in text_lower:
-                    score += 1
-            
-            # Check identifier parts
-            id_parts = metric_id.replace('_', ' ').split()
-            for part in id_parts:
-                if len(part) > 3 and part in text_lower:
-                    score += 2
-            
-            # Specific keyword matching for common patterns
-            if 'vegetable' in text_lower and 'vegetable' in metric_id:
-                score += 5
-            if 'protein' in text_lower and 'protein' in metric_id:
-                score += 5
-            if 'water' in text_lower and 'water' in metric_id:
-                score += 5
-            if 'step' in text_lower and 'step' in metric_id:
-                score += 5
-            if 'meditation' in text_lower and 'meditation' in metric_id:
-                score += 5
-            if 'strength' in text_lower and 'strength' in metric_id:
-                score += 5
-            if 'hiit' in text_lower and 'hiit' in metric_id:
-                score += 5
-            if ('after meal' in text_lower or 'post meal' in text_lower) and 'post_meal_activity' in metric_id:
-                score += 10  # High priority match for post-meal activity
-                # Prefer sessions over duration for frequency patterns
-                if ('times' in text_lower or 'sessions' in text_lower) and 'sessions' in metric_id:
-                    score += 5  # Extra boost for sessions when counting frequency
-            
-            if score > best_score:
-                best_score = score
-                best_match = metric_id
+        # Post-meal activity outranks other matches
+        if index.matcher.contains(found, 'after meal') or index.matcher.contains(found, 'post meal'):
+            # Prefer sessions over duration for frequency patterns
+            counts_frequency = index.matcher.contains(found, 'times') or index.matcher.contains(found, 'sessions')
+            for position, is_sessions in self._post_meal_positions:
+                scores[position] = scores.get(position, 0) + 10 + (5 if counts_frequency and is_sessions else 0)
+        
+        best_match, best_score = index.best(scores)
         
         # If we found a good match in calculated_metrics, return it
         if best_match and best_score > 2:
             return best_match
         
         # Fallback to legacy metrics_data if needed
-        if recommendation_id:
-            for metric_id, metric_data in self.metrics_data.items():
-                if recommendation_id in metric_data.get('recommendations_v2', []):
-                    return metric_id
+        if recommendation_id and recommendation_id in self._metric_by_recommendation:
+            return self._metric_by_recommendation[recommendation_id]
         
-        # Legacy keyword matching on metrics_data
-        for metric_id, metric_data in self.metrics_data.items():
-            score = 0
-            
-            # Check name match
-            if metric_data['name'].lower() in text_lower:
-                score += 10
-            
-            # Check description matches
-            desc_words = metric_data.get('description', '').lower().split()
-            for word in desc_words:
-                if len(word) > 3 and word in text_lower:
-                    score += 1
-            
-            # Check identifier parts
-            id_parts = metric_id.replace('_', ' ').split()
-            for part in id_parts:
-                if len(part) > 3 and part in text_lower:
-                    score += 2
-            
-            if score > best_score:
-                best_score = score
-                best_match = metric_id
+        # Legacy keyword matching on metrics_data (must beat the calculated_metrics score)
+        legacy_scores, _ = self.metric_index.score(text_lower)
+        legacy_match, legacy_score = self.metric_index.best(legacy_scores, best_score)
+        if legacy_match is not None:
+            best_match, best_score = legacy_match, legacy_score
         
         return best_match if best_score > 2 else None
     
@@ -1140,12 +1300,14 @@ class RecommendationConfigGenerator:
         return datetime.now().isoformat()
     
     def save_config(self, config: Dict[str, Any], output_dir: str = None) -> str:
-        """Save configuration to file."""
-        if output_dir is None:
-            output_dir = Path(__file__).parent / "generated_configs"
+        """
+        Save configuration to file.
         
-        output_path = Path(output_dir)
-        output_path.mkdir(exist_ok=True)
+        The master list is not rewritten per save: the config is appended to
+        the master journal (or held in memory inside batch()) and folded into
+        all_generated_configs.json by compact_master().
+        """
+        output_path = self._output_path(output_dir)
         
         # Generate filename using recommendation ID + algorithm type
         rec_id = config['metadata'].get('recommendation_id', 'UNKNOWN')
@@ -1163,14 +1325,108 @@ class RecommendationConfigGenerator:
         with open(filepath, 'w') as f:
             json.dump(config, f, indent=2)
         
-        # Also add to master list
-        master_file = output_path / "all_generated_configs.json"
+        if self._batch is not None:
+            self._batch.append(config)
+        else:
+            with _master_lock(output_path):
+                with open(output_path / MASTER_JOURNAL_FILE, 'a') as f:
+                    f.write(json.dumps(config) + '\n')
+                journal_size = (output_path / MASTER_JOURNAL_FILE).stat().st_size
+            if journal_size >= JOURNAL_COMPACT_BYTES:
+                compact_master(output_path)
+        
+        self.generated_configs.append(config)
+        return str(filepath)
+    
+    def save_configs(self, configs: List[Dict[str, Any]], output_dir: str = None) -> List[str]:
+        """Save several configurations, writing the master list once."""
+        with self.batch(output_dir):
+            return [self.save_config(config, output_dir) for config in configs]
+    
+    @contextmanager
+    def batch(self, output_dir: str = None):
+        """Hold master-list updates in memory and merge them once on exit."""
+        if self._batch is not None:
+            # Nested batch: the outermost one writes the master
+            yield self
+            return
+        
+        self._batch = []
+        try:
+            yield self
+        finally:
+            pending, self._batch = self._batch, None
+            compact_master(self._output_path(output_dir), pending)
+    
+    def _output_path(self, output_dir: Optional[str]) -> Path:
+        if output_dir is None:
+            output_dir = Path(__file__).parent / "generated_configs"
+        output_path = Path(output_dir)
+        output_path.mkdir(exist_ok=True)
+        return output_path
+
+
+@contextmanager
+def _master_lock(output_path: Path):
+    """Exclusive lock shared by every generator writing to output_path."""
+    with open(output_path / MASTER_LOCK_FILE, 'a+') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _read_journal(journal_file: Path) -> List[Dict[str, Any]]:
+    if not journal_file.exists():
+        return []
+    configs = []
+    with open(journal_file, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                configs.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Torn final line from an interrupted append
+                continue
+    return configs
+
+
+def compact_master(output_dir: str = None, configs: List[Dict[str, Any]] = None) -> int:
+    """
+    Fold journaled (and any given) configs into all_generated_configs.json.
+    
+    Configs replace existing entries with the same recommendation_id, the
+    list is sorted once and the master is replaced atomically.
+    
+    Returns:
+        Number of configs merged into the master list
+    """
+    if output_dir is None:
+        output_dir = Path(__file__).parent / "generated_configs"
+    output_path = Path(output_dir)
+    master_file = output_path / "all_generated_configs.json"
+    journal_file = output_path / MASTER_JOURNAL_FILE
+    
+    with _master_lock(output_path):
+        pending = _read_journal(journal_file) + list(configs or [])
+        if not pending:
+            return 0
+        
         if master_file.exists():
             with open(master_file, 'r') as f:
                 master_data = json.load(f)
-                all_configs = master_data.get('configurations', [])
         else:
-            all_configs = []
             master_data = {
                 "project_name": "WellPath Recommendation Algorithm Configurations",
                 "description": "Generated algorithm configurations for health recommendations",
@@ -1178,31 +1434,36 @@ class RecommendationConfigGenerator:
             }
         
         # Update or append based on recommendation_id (not config_id)
-        rec_id = config['metadata'].get('recommendation_id')
-        updated = False
-        
-        if rec_id:
-            for i, existing in enumerate(all_configs):
-                if existing.get('metadata', {}).get('recommendation_id') == rec_id:
-                    all_configs[i] = config
-                    updated = True
-                    break
-        
-        if not updated:
-            all_configs.append(config)
-        
-        # Update master data
-        master_data['configurations'] = all_configs
-        master_data['total_configs'] = len(all_configs)
+        all_configs = master_data.get('configurations', [])
+        positions = {}
+        for i, existing in enumerate(all_configs):
+            rec_id = existing.get('metadata', {}).get('recommendation_id')
+            if rec_id:
+                positions.setdefault(rec_id, i)
+        
+        for config in pending:
+            rec_id = config['metadata'].get('recommendation_id')
+            if rec_id and rec_id in positions:
+                all_configs[positions[rec_id]] = config
+            else:
+                if rec_id:
+                    positions[rec_id] = len(all_configs)
+                all_configs.append(config)
         
         # Sort by recommendation_id for consistent ordering
         all_configs.sort(key=lambda x: x.get('metadata', {}).get('recommendation_id', 'ZZZ'))
+        master_data['configurations'] = all_configs
+        master_data['total_configs'] = len(all_configs)
         
-        with open(master_file, 'w') as f:
+        tmp_file = master_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w') as f:
             json.dump(master_data, f, indent=2)
+        os.replace(tmp_file, master_file)
         
-        self.generated_configs.append(config)
-        return str(filepath)
+        if journal_file.exists():
+            journal_file.unlink()
+        
+        return len(pending)
 
 
 def process_recommendation(recommendation_text: str, recommendation_id: str = None) -> Tuple[Dict[str, Any], str]:
@@ -1211,4 +1472,148 @@ def process_recommendation(recommendation_text: str, recommendation_id: str = No
     config = generator.generate_config(recommendation_text, recommendation_id)
     filepath = generator.save_config(config)
     
-    return config, filepath
\ No newline at end of file
+    return config, filepath
+
+def load_recommendations(source_path: str) -> List[Tuple[str, str]]:
+    """
+    Load (recommendation_id, recommendation_text) pairs.
+    
+    Accepts recommendations_v2.csv (ID, level_description) or a
+    recommendations_list.json-style file ({"recommendations": [...]}).
+    Recommendations without any text are skipped.
+    """
+    source = Path(source_path)
+    recommendations = []
+    
+    if source.suffix.lower() == '.json':
+        with open(source, 'r', encoding='utf-8') as f:
+            rows = json.load(f).get('recommendations', [])
+        for row in rows:
+            text = row.get('level_description') or row.get('recommendation_text') or row.get('title')
+            if row.get('id') and text:
+                recommendations.append((row['id'].strip(), text.strip()))
+    else:
+        with open(source, 'r', encoding='utf-8-sig') as f:
+            for row in csv.DictReader(f):
+                text = row.get('level_description') or row.get('Title')
+                if row.get('ID') and text:
+                    recommendations.append((row['ID'].strip(), text.strip()))
+    
+    return recommendations
+
+
+# Per-process generator for the bulk pool, built once from the parent's reference data
+_worker_generator: Optional[RecommendationConfigGenerator] = None
+
+
+def _init_worker(reference_data: Dict[str, Dict]) -> None:
+    global _worker_generator
+    _worker_generator = RecommendationConfigGenerator(reference_data)
+
+
+def _generate_one(item: Tuple[str, str]) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+    rec_id, text = item
+    try:
+        return rec_id, _worker_generator.generate_config(text, rec_id), None
+    except Exception as e:
+        return rec_id, None, str(e)
+
+
+def generate_all(
+    recommendations: List[Tuple[str, str]],
+    output_dir: str = None,
+    workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Generate and save configs for many recommendations.
+    
+    Reference data is loaded once and shipped to each worker process,
+    configs are generated across a process pool and everything is written
+    in one batch (one master list write).
+    
+    Args:
+        recommendations: (recommendation_id, recommendation_text) pairs
+        output_dir: Where to write configs (defaults to generated_configs/)
+        workers: Worker processes (None = CPU count, 1 = no pool)
+    
+    Returns:
+        Summary statistics with per-phase timings in seconds
+    """
+    timings = {}
+    start = time.perf_counter()
+    generator = RecommendationConfigGenerator()
+    timings['load_reference_data'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    if workers == 1 or len(recommendations) < 2:
+        _init_worker(generator.reference_data)
+        results = [_generate_one(item) for item in recommendations]
+    else:
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(recommendations) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(generator.reference_data,)
+        ) as executor:
+            results = list(executor.map(_generate_one, recommendations, chunksize=chunksize))
+    timings['generate'] = time.perf_counter() - start
+    
+    configs = [config for _, config, _ in results if config is not None]
+    failures = {rec_id: error for rec_id, _, error in results if error is not None}
+    
+    start = time.perf_counter()
+    paths = generator.save_configs(configs, output_dir)
+    timings['write'] = time.perf_counter() - start
+    
+    algorithm_counts: Dict[str, int] = {}
+    for config in configs:
+        algorithm_type = config['metadata']['analysis']['algorithm_type']
+        algorithm_counts[algorithm_type] = algorithm_counts.get(algorithm_type, 0) + 1
+    
+    return {
+        'total': len(recommendations),
+        'generated': len(configs),
+        'failed': failures,
+        'paths': paths,
+        'algorithm_counts': algorithm_counts,
+        'workers': workers or 1,
+        'timings': timings
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate algorithm configs for all recommendations")
+    parser.add_argument(
+        'source', nargs='?',
+        default=str(Path(__file__).parent / "ref_csv_files_airtable" / "recommendations_v2.csv"),
+        help='recommendations_v2.csv or recommendations_list.json'
+    )
+    parser.add_argument('-o', '--output-dir', help='Output directory (default: src/generated_configs)')
+    parser.add_argument('-w', '--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--only', nargs='+', metavar='REC_ID', help='Only generate these recommendation IDs')
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    recommendations = load_recommendations(args.source)
+    if args.only:
+        wanted = set(args.only)
+        recommendations = [item for item in recommendations if item[0] in wanted]
+    read_time = time.perf_counter() - start
+    
+    stats = generate_all(recommendations, args.output_dir, args.workers)
+    
+    print(f"✅ Generated {stats['generated']}/{stats['total']} configs with {stats['workers']} worker(s)")
+    for algorithm_type, count in sorted(stats['algorithm_counts'].items()):
+        print(f"   {algorithm_type}: {count}")
+    if stats['failed']:
+        print(f"❌ {len(stats['failed'])} failed:")
+        for rec_id, error in sorted(stats['failed'].items()):
+            print(f"   {rec_id}: {error}")
+    print("⏱️  Timings:")
+    print(f"   read recommendations: {read_time:.3f}s")
+    for phase, seconds in stats['timings'].items():
+        print(f"   {phase.replace('_', ' ')}: {seconds:.3f}s")
+    print(f"   total: {read_time + sum(stats['timings'].values()):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,26 @@
 Algorithm Configuration Validator
 
 Validates algorithm configurations against JSON schemas and business rules.
+
+Schema validators are compiled once per method, results are cached by
+config content hash, and large batches fan out across a process pool.
 """
 
+import copy
+import hashlib
 import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 import jsonschema
-from typing import Dict, Any, List, Union
+from typing import Dict, Any, List, Optional, Union
 from pathlib import Path
 
 
+# Batches smaller than this are validated in-process even when workers are allowed
+PARALLEL_THRESHOLD = 64
+
+
 class AlgorithmValidator:
     """Validates algorithm configurations."""
     
@@ -23,12 +35,38 @@ class AlgorithmValidator:
         if schema_file is None:
             schema_file = Path(__file__).parent.parent / "schemas" / "algorithm_schemas.json"
         
+        self.schema_file = str(schema_file)
         with open(schema_file, 'r') as f:
             self.schemas = json.load(f)
+        
+        # schema_key -> compiled validator, or the SchemaError message if the schema is invalid
+        self._validators: Dict[str, Any] = {}
+        self._result_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.cache_size = 4096
+    
+    def _get_validator(self, schema_key: str) -> Any:
+        """Compile (once) the validator for a method schema."""
+        validator = self._validators.get(schema_key)
+        if validator is None:
+            schema = self.schemas[schema_key]
+            validator_class = jsonschema.validators.validator_for(schema)
+            try:
+                validator_class.check_schema(schema)
+                validator = validator_class(schema)
+            except jsonschema.SchemaError as e:
+                validator = e.message
+            self._validators[schema_key] = validator
+        return validator
+    
+    @staticmethod
+    def config_hash(config: Dict[str, Any]) -> str:
+        """Content hash of a config, independent of key order."""
+        canonical = json.dumps(config, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
     
     def validate_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Validate a single algorithm configuration.
+        Validate a single algorithm configuration, reusing cached results.
         
         Args:
             config: Algorithm configuration dictionary
@@ -36,6 +74,22 @@ class AlgorithmValidator:
         Returns:
             Validation result with errors and warnings
         """
+        key = self.config_hash(config)
+        cached = self._result_cache.get(key)
+        if cached is None:
+            cached = self._validate_uncached(config)
+            self._cache_result(key, cached)
+        else:
+            self._result_cache.move_to_end(key)
+        return copy.deepcopy(cached)
+    
+    def _cache_result(self, key: str, result: Dict[str, Any]) -> None:
+        self._result_cache[key] = result
+        self._result_cache.move_to_end(key)
+        while len(self._result_cache) > self.cache_size:
+            self._result_cache.popitem(last=False)
+    
+    def _validate_uncached(self, config: Dict[str, Any]) -> Dict[str, Any]:
         result = {
             "valid": True,
             "errors": [],
@@ -56,18 +110,17 @@ class AlgorithmValidator:
             result["errors"].append(f"Unknown method: {method}")
             return result
         
-        schema = self.schemas[schema_key]
-        
-        # Validate against JSON schema
-        try:
-            jsonschema.validate(config, schema)
-        except jsonschema.ValidationError as e:
+        validator = self._get_validator(schema_key)
+        if isinstance(validator, str):
             result["valid"] = False
-            result["errors"].append(f"Schema validation error: {e.message}")
+            result["errors"].append(f"Schema error: {validator}")
             return result
-        except jsonschema.SchemaError as e:
+        
+        # Validate against JSON schema (same error selection as jsonschema.validate)
+        error = jsonschema.exceptions.best_match(validator.iter_errors(config))
+        if error is not None:
             result["valid"] = False
-            result["errors"].append(f"Schema error: {e.message}")
+            result["errors"].append(f"Schema validation error: {error.message}")
             return result
         
         # Perform method-specific validation
@@ -81,21 +134,50 @@ class AlgorithmValidator:
         
         return result
     
-    def validate_multiple_configs(self, configs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def validate_multiple_configs(
+        self,
+        configs: List[Dict[str, Any]],
+        workers: Optional[int] = 1
+    ) -> Dict[str, Any]:
         """
         Validate multiple algorithm configurations.
         
+        Identical configs are validated once and cached results are reused.
+        
         Args:
             configs: List of algorithm configuration dictionaries
+            workers: Worker processes for uncached configs (None = CPU count,
+                1 = in-process); batches under PARALLEL_THRESHOLD stay in-process
             
         Returns:
             Overall validation result
         """
+        keys = [self.config_hash(config) for config in configs]
+        known = {key: self._result_cache[key] for key in keys if key in self._result_cache}
+        
+        pending: Dict[str, Dict[str, Any]] = {}
+        for key, config in zip(keys, configs):
+            if key not in known and key not in pending:
+                pending[key] = config
+        
+        if workers != 1 and len(pending) >= PARALLEL_THRESHOLD:
+            workers = workers or os.cpu_count() or 1
+            chunksize = max(1, len(pending) // (workers * 4))
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(self.schema_file,)
+            ) as executor:
+                known.update(zip(pending, executor.map(_validate_in_worker, pending.values(), chunksize=chunksize)))
+        else:
+            known.update((key, self._validate_uncached(config)) for key, config in pending.items())
+        
+        for key in pending:
+            self._cache_result(key, known[key])
+        
         results = []
         overall_valid = True
         
-        for i, config in enumerate(configs):
-            result = self.validate_config(config)
+        for i, key in enumerate(keys):
+            result = copy.deepcopy(known[key])
             result["config_index"] = i
             results.append(result)
             
@@ -260,6 +342,48 @@ class AlgorithmValidator:
         }
 
 
+# Per-process validator for batch validation, built once per worker
+_worker_validator: Optional[AlgorithmValidator] = None
+
+
+def _init_worker(schema_file: str) -> None:
+    global _worker_validator
+    _worker_validator = AlgorithmValidator(schema_file)
+
+
+def _validate_in_worker(config: Dict[str, Any]) -> Dict[str, Any]:
+    return _worker_validator._validate_uncached(config)
+
+
+def validate_generated_configs(config_dir: str = None, workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Validate the configuration_json of every generated config file.
+    
+    Args:
+        config_dir: Directory of generated config JSON files
+        workers: Worker processes (None = CPU count)
+        
+    Returns:
+        Overall validation result, with each result's "file" added
+    """
+    if config_dir is None:
+        config_dir = Path(__file__).parent.parent / "generated_configs"
+    
+    paths = sorted(
+        path for path in Path(config_dir).glob("*.json")
+        if path.name != "all_generated_configs.json"
+    )
+    configs = []
+    for path in paths:
+        with open(path, 'r') as f:
+            configs.append(json.load(f).get("configuration_json", {}))
+    
+    validation = AlgorithmValidator().validate_multiple_configs(configs, workers=workers)
+    for result in validation["results"]:
+        result["file"] = paths[result["config_index"]].name
+    return validation
+
+
 def validate_original_config_file(file_path: str) -> Dict[str, Any]:
     """
     Validate the original rec_config.json file.
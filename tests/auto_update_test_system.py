@@ -17,13 +17,16 @@ Usage:
 
 import sys
 import os
-import glob
 import json
-import hashlib
 from datetime import datetime
 from pathlib import Path
 import argparse
 
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from core_systems.config_fingerprint import FingerprintService, HASH_ALGORITHM, diff_fingerprints
+
 # Import our config-based test generator
 from config_based_verification_test import run_config_based_verification
 
@@ -35,31 +38,21 @@ class AutoUpdateTestSystem:
         self.config_dir = self.test_dir.parent / "src" / "generated_configs"
         self.cache_file = self.test_dir / ".config_cache.json"
         self.output_file = self.test_dir / "config_based_verification_output.txt"
+        # Only files whose mtime/size changed since the last scan are re-hashed
+        self.fingerprints = FingerprintService(
+            self.config_dir, "REC*.json", cache_file=self.test_dir / ".config_fingerprints.json"
+        )
         
     def get_config_fingerprint(self) -> dict:
         """Generate fingerprint of all config files for change detection"""
-        fingerprint = {}
-        
-        pattern = str(self.config_dir / "REC*.json")
-        config_files = glob.glob(pattern)
-        
-        for config_file in sorted(config_files):
-            try:
-                # Get file modification time and content hash
-                stat = os.stat(config_file)
-                with open(config_file, 'rb') as f:
-                    content_hash = hashlib.md5(f.read()).hexdigest()
-                
-                rel_path = os.path.relpath(config_file, self.config_dir)
-                fingerprint[rel_path] = {
-                    'mtime': stat.st_mtime,
-                    'size': stat.st_size,
-                    'hash': content_hash
-                }
-            except Exception as e:
-                print(f"Warning: Could not fingerprint {config_file}: {e}")
-        
-        return fingerprint
+        return {
+            name: {
+                'mtime': entry.mtime_ns / 1e9,
+                'size': entry.size,
+                'hash': entry.hash
+            }
+            for name, entry in self.fingerprints.scan().items()
+        }
     
     def load_cached_fingerprint(self) -> dict:
         """Load previously cached config fingerprint"""
@@ -69,7 +62,10 @@ class AutoUpdateTestSystem:
         try:
             with open(self.cache_file, 'r') as f:
                 cache_data = json.load(f)
-                return cache_data.get('config_fingerprint', {})
+            # Hashes from another algorithm cannot be compared; treat as a first run
+            if cache_data.get('hash_algorithm') != HASH_ALGORITHM:
+                return {}
+            return cache_data.get('config_fingerprint', {})
         except Exception as e:
             print(f"Warning: Could not load cache: {e}")
             return {}
@@ -78,6 +74,7 @@ class AutoUpdateTestSystem:
         """Save config fingerprint to cache"""
         cache_data = {
             'last_update': datetime.now().isoformat(),
+            'hash_algorithm': HASH_ALGORITHM,
             'config_fingerprint': fingerprint,
             'total_configs': len(fingerprint)
         }
@@ -97,21 +94,11 @@ class AutoUpdateTestSystem:
             # First run - all configs are "new"
             return True, list(current_fingerprint.keys()), [], []
         
-        new_configs = []
-        modified_configs = []
-        deleted_configs = []
-        
-        # Find new and modified configs
-        for config_name, current_info in current_fingerprint.items():
-            if config_name not in cached_fingerprint:
-                new_configs.append(config_name)
-            elif current_info != cached_fingerprint[config_name]:
-                modified_configs.append(config_name)
-        
-        # Find deleted configs
-        for config_name in cached_fingerprint:
-            if config_name not in current_fingerprint:
-                deleted_configs.append(config_name)
+        # Compare content only; a touched but unchanged file is not a modification
+        new_configs, modified_configs, deleted_configs = diff_fingerprints(
+            {name: info.get('hash') for name, info in cached_fingerprint.items()},
+            {name: info['hash'] for name, info in current_fingerprint.items()}
+        )
         
         has_changes = bool(new_configs or modified_configs or deleted_configs)
         
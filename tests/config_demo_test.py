@@ -21,6 +21,8 @@ import traceback
 # Add src to path for algorithm imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+from algorithms.config_compiler import build_algorithm
+
 @dataclass
 class ConfigDemo:
     """Demo showing what a config does with sample data"""
@@ -1016,7 +1018,7 @@ class ConfigDemoTester:
         
         # Get algorithm output
         try:
-            algorithm = self._create_algorithm_instance(algorithm_type, schema)
+            algorithm = build_algorithm(algorithm_type, schema)
             daily_scores, weekly_score = self._get_algorithm_output(algorithm, sample_data, algorithm_type)
         except Exception as e:
             daily_scores = [0] * 7
@@ -1043,210 +1045,6 @@ class ConfigDemoTester:
             sleep_composite_data=sleep_composite_data
         )
     
-    def _create_algorithm_instance(self, algorithm_type: str, schema: Dict[str, Any]):
-        """Create algorithm instance - same logic as integration test"""
-        
-        if algorithm_type == 'proportional':
-            from algorithms.proportional import ProportionalAlgorithm, ProportionalConfig
-            from algorithms.binary_threshold import EvaluationPeriod
-            
-            # Map evaluation period from schema
-            evaluation_period = EvaluationPeriod.DAILY
-            schema_period = schema.get('evaluation_period', 'daily')
-            if 'weekly' in schema_period.lower():
-                evaluation_period = EvaluationPeriod.ROLLING_7_DAY
-            
-            config = ProportionalConfig(
-                target=schema.get('target', 1.0),
-                unit=schema.get('unit', 'units'),
-                maximum_cap=schema.get('maximum_cap', 100),
-                minimum_threshold=schema.get('minimum_threshold', 0),
-                evaluation_period=evaluation_period,
-                frequency_requirement=schema.get('frequency_requirement', 'daily')
-            )
-            return ProportionalAlgorithm(config)
-            
-        elif algorithm_type == 'binary_threshold':
-            from algorithms.binary_threshold import BinaryThresholdAlgorithm, BinaryThresholdConfig, ComparisonOperator
-            
-            operator_map = {
-                '>=': ComparisonOperator.GTE, '<=': ComparisonOperator.LTE,
-                '>': ComparisonOperator.GT, '<': ComparisonOperator.LT, '==': ComparisonOperator.EQ
-            }
-            
-            config = BinaryThresholdConfig(
-                threshold=schema.get('threshold', 1.0),
-                success_value=schema.get('success_value', 100),
-                failure_value=schema.get('failure_value', 0),
-                comparison_operator=operator_map.get(schema.get('comparison_operator', '>='), ComparisonOperator.GTE)
-            )
-            return BinaryThresholdAlgorithm(config)
-            
-        elif algorithm_type == 'minimum_frequency':
-            from algorithms.minimum_frequency import MinimumFrequencyAlgorithm, MinimumFrequencyConfig
-            
-            # Convert time string to decimal hours if needed
-            threshold = schema.get('daily_threshold', 1.0)
-            if isinstance(threshold, str) and ':' in threshold:
-                # Convert "14:00" to 14.0
-                hours, minutes = threshold.split(':')
-                threshold = float(hours) + float(minutes) / 60.0
-            
-            config = MinimumFrequencyConfig(
-                daily_threshold=threshold,
-                daily_comparison=schema.get('daily_comparison', '>='),
-                required_days=schema.get('required_days', 3)
-            )
-            return MinimumFrequencyAlgorithm(config)
-            
-        elif algorithm_type == 'weekly_elimination':
-            from algorithms.weekly_elimination import WeeklyEliminationAlgorithm, WeeklyEliminationConfig
-            
-            # Convert time string to decimal hours if needed
-            threshold = schema.get('elimination_threshold', 0)
-            if isinstance(threshold, str) and ':' in threshold:
-                # Convert "14:00" to 14.0
-                hours, minutes = threshold.split(':')
-                threshold = float(hours) + float(minutes) / 60.0
-                
-            config = WeeklyEliminationConfig(
-                elimination_threshold=threshold,
-                elimination_comparison=schema.get('elimination_comparison', '==')
-            )
-            return WeeklyEliminationAlgorithm(config)
-            
-        elif algorithm_type == 'zone_based':
-            from algorithms.zone_based import ZoneBasedAlgorithm, ZoneBasedConfig, Zone
-            
-            zones = schema.get('zones', [])
-            if not zones:
-                zones = [Zone(0, 5, 20, "Poor"), Zone(5, 7, 60, "Fair"), Zone(7, 9, 100, "Good"), Zone(9, 12, 80, "Excessive")]
-            else:
-                zone_objects = []
-                for zone_data in zones:
-                    zone_range = zone_data.get('range', [0, 1])
-                    min_val = zone_range[0] if len(zone_range) > 0 else 0
-                    max_val = zone_range[1] if len(zone_range) > 1 else zone_range[0]
-                    zone_objects.append(Zone(
-                        min_value=min_val, max_value=max_val,
-                        score=zone_data.get('score', 50), label=zone_data.get('label', 'Zone')
-                    ))
-                zones = zone_objects
-            
-            config = ZoneBasedConfig(zones=zones, unit=schema.get('unit', 'units'))
-            return ZoneBasedAlgorithm(config)
-            
-        elif algorithm_type == 'constrained_weekly_allowance':
-            from algorithms.constrained_weekly_allowance import ConstrainedWeeklyAllowanceAlgorithm, ConstrainedWeeklyAllowanceConfig
-            config = ConstrainedWeeklyAllowanceConfig(
-                weekly_allowance=schema.get('weekly_allowance', 2),
-                unit=schema.get('unit', 'units'),
-                penalty_for_overage=schema.get('penalty_per_excess', 25),
-                max_days_per_week=schema.get('max_days_per_week')
-            )
-            return ConstrainedWeeklyAllowanceAlgorithm(config)
-            
-        elif algorithm_type == 'proportional_frequency_hybrid':
-            from algorithms.proportional_frequency_hybrid import ProportionalFrequencyHybridAlgorithm, ProportionalFrequencyHybridConfig
-            config = ProportionalFrequencyHybridConfig(
-                daily_target=schema.get('daily_target', 1.0),
-                required_qualifying_days=schema.get('required_qualifying_days', 2),
-                unit=schema.get('unit', 'units'),
-                daily_minimum_threshold=schema.get('daily_minimum_threshold', 0)
-            )
-            return ProportionalFrequencyHybridAlgorithm(config)
-            
-        elif algorithm_type == 'sleep_composite':
-            from algorithms.sleep_composite import SleepCompositeAlgorithm, SleepCompositeConfig
-            
-            # Extract components from schema
-            components = schema.get('components', {})
-            
-            # Get weights from components
-            duration_weight = components.get('sleep_duration', {}).get('weight', 0.55)
-            sleep_weight = components.get('sleep_time_consistency', {}).get('weight', 0.225)
-            wake_weight = components.get('wake_time_consistency', {}).get('weight', 0.225)
-            
-            # Get zones and thresholds from components
-            duration_zones = components.get('sleep_duration', {}).get('zones', None)
-            variance_thresholds = components.get('sleep_time_consistency', {}).get('variance_thresholds', None)
-            
-            config = SleepCompositeConfig(
-                duration_weight=duration_weight,
-                sleep_consistency_weight=sleep_weight,
-                wake_consistency_weight=wake_weight,
-                duration_zones=duration_zones,
-                variance_thresholds=variance_thresholds
-            )
-            return SleepCompositeAlgorithm(config)
-            
-        elif algorithm_type == 'composite_weighted':
-            from algorithms.composite_weighted import CompositeWeightedAlgorithm, CompositeWeightedConfig, Component
-            
-            # Extract components from schema
-            components_data = schema.get('components', [])
-            components = []
-            
-            if isinstance(components_data, list):
-                # Components stored as list - handle different formats
-                for comp_data in components_data:
-                    # Handle both new format (field_name) and old format (metric)
-                    field_name = comp_data.get('field_name')
-                    if not field_name:
-                        field_name = comp_data.get('metric', 'value')
-                    
-                    # Handle weight as percentage or decimal
-                    weight = comp_data.get('weight', 1.0)
-                    if isinstance(weight, (int, float)) and weight > 10:
-                        weight = weight / 100.0  # Convert percentage to decimal
-                    
-                    component = Component(
-                        name=comp_data.get('name', field_name),
-                        weight=weight,
-                        target=comp_data.get('target', comp_data.get('threshold', 100)),
-                        unit=comp_data.get('unit', 'units'),
-                        scoring_method=comp_data.get('scoring_method', comp_data.get('algorithm', 'proportional')),
-                        field_name=field_name,
-                        parameters=comp_data.get('parameters', {})
-                    )
-                    components.append(component)
-            elif isinstance(components_data, dict):
-                # Components stored as dictionary - convert to Component objects
-                for comp_name, comp_data in components_data.items():
-                    component = Component(
-                        name=comp_name,
-                        weight=comp_data.get('weight', 1.0),
-                        target=comp_data.get('target', 100),
-                        unit=comp_data.get('unit', 'units'),
-                        scoring_method=comp_data.get('scoring_method', 'proportional'),
-                        field_name=comp_data.get('field_name', comp_name),
-                        parameters=comp_data.get('parameters', {})
-                    )
-                    components.append(component)
-            
-            if not components:
-                # Default component if none found
-                components = [Component(
-                    name='Default Component',
-                    weight=1.0,
-                    target=100,
-                    unit=schema.get('unit', 'score'),
-                    scoring_method='proportional',
-                    field_name='value'
-                )]
-            
-            # DEBUG: Print component field names
-            # print(f"DEBUG: Components for composite_weighted: {[c.field_name for c in components]}")
-            
-            config = CompositeWeightedConfig(
-                components=components,
-                minimum_threshold=schema.get('minimum_threshold', 0),
-                maximum_cap=schema.get('maximum_cap', 100)
-            )
-            return CompositeWeightedAlgorithm(config)
-        else:
-            raise ValueError(f"Unsupported algorithm type: {algorithm_type}")
-    
     def _get_algorithm_output(self, algorithm, sample_data: List[float], algorithm_type: str) -> Tuple[List[float], float]:
         """Get daily and weekly scores from algorithm"""
         
@@ -1391,25 +1189,8 @@ class ConfigDemoTester:
     
     def _calculate_individual_day_score(self, algorithm, value, algorithm_type):
         """Calculate individual day pass/fail score for frequency/elimination algorithms."""
-        if algorithm_type == 'minimum_frequency':
-            # Check if this day meets the threshold
-            if algorithm.config.daily_comparison == "<=":
-                day_pass = value <= algorithm.config.daily_threshold
-            elif algorithm.config.daily_comparison == ">=":
-                day_pass = value >= algorithm.config.daily_threshold
-            else:  # "=="
-                day_pass = value == algorithm.config.daily_threshold
-            return 100.0 if day_pass else 0.0
-        
-        elif algorithm_type == 'weekly_elimination':
-            # Check if this day meets the elimination threshold
-            if algorithm.config.elimination_comparison == "<=":
-                day_pass = value <= algorithm.config.elimination_threshold
-            elif algorithm.config.elimination_comparison == ">=":
-                day_pass = value >= algorithm.config.elimination_threshold
-            else:  # "=="
-                day_pass = value == algorithm.config.elimination_threshold
-            return 100.0 if day_pass else 0.0
+        if algorithm_type in ('minimum_frequency', 'weekly_elimination'):
+            return float(algorithm.kernel.daily([value])[0, 0])
         
         return 50.0  # Fallback
 
@@ -17,11 +17,7 @@ from typing import Dict, List, Any, Tuple
 from dataclasses import dataclass
 
 # Import our algorithm implementations
-from algorithms.proportional_frequency_hybrid import create_proportional_frequency_hybrid
-from algorithms.proportional import ProportionalAlgorithm, ProportionalConfig
-from algorithms.binary_threshold import BinaryThresholdAlgorithm, BinaryThresholdConfig, ComparisonOperator
-from algorithms.minimum_frequency import calculate_minimum_frequency_score
-from algorithms.weekly_elimination import calculate_weekly_elimination_score
+from algorithms.config_compiler import build_algorithm
 
 @dataclass
 class TestScenario:
@@ -34,28 +30,6 @@ class TestScenario:
     description: str
     significance: str
 
-def calculate_proportional_score(actual: float, target: float, max_cap: float = 100.0) -> float:
-    """Calculate proportional score for a single day"""
-    if actual <= 0:
-        return 0.0
-    score = (actual / target) * 100
-    return min(score, max_cap)
-
-def calculate_binary_score(actual: float, threshold: float, operator: str = ">=") -> float:
-    """Calculate binary score for a single day"""
-    if operator == ">=":
-        return 100.0 if actual >= threshold else 0.0
-    elif operator == "<=":
-        return 100.0 if actual <= threshold else 0.0
-    elif operator == ">":
-        return 100.0 if actual > threshold else 0.0
-    elif operator == "<":
-        return 100.0 if actual < threshold else 0.0
-    elif operator == "==":
-        return 100.0 if actual == threshold else 0.0
-    else:
-        return 0.0
-
 def run_algorithm_verification_tests():
     """Run comprehensive algorithm verification tests and generate output file"""
     
@@ -146,7 +120,7 @@ def run_algorithm_verification_tests():
             config_data={
                 "threshold": 200.0,
                 "unit": "mg",
-                "operator": "<="
+                "comparison_operator": "<="
             },
             daily_values=[150, 250, 200, 180, 300, 190, 170],
             expected_daily_scores=[100.0, 0.0, 100.0, 100.0, 0.0, 100.0, 100.0],
@@ -161,7 +135,7 @@ def run_algorithm_verification_tests():
             config_data={
                 "threshold": 1.0,
                 "unit": "taken",
-                "operator": ">="
+                "comparison_operator": ">="
             },
             daily_values=[1, 1, 0, 1, 1, 1, 1],
             expected_daily_scores=[100.0, 100.0, 0.0, 100.0, 100.0, 100.0, 100.0],
@@ -204,44 +178,10 @@ def run_algorithm_verification_tests():
         actual_weekly_score = 0.0
         
         try:
-            if scenario.algorithm_type == "proportional_frequency_hybrid":
-                # Use our hybrid algorithm
-                algo = create_proportional_frequency_hybrid(
-                    daily_target=scenario.config_data["daily_target"],
-                    required_qualifying_days=scenario.config_data["required_qualifying_days"],
-                    unit=scenario.config_data["unit"],
-                    daily_minimum_threshold=scenario.config_data.get("daily_minimum_threshold", 0)
-                )
-                
-                # Calculate daily scores
-                for value in scenario.daily_values:
-                    daily_score = algo.calculate_daily_score(value)
-                    actual_daily_scores.append(daily_score)
-                
-                # Calculate weekly score
-                actual_weekly_score = algo.calculate_weekly_score(scenario.daily_values)
-                
-            elif scenario.algorithm_type == "proportional":
-                # Use proportional algorithm
-                target = scenario.config_data["target"]
-                for value in scenario.daily_values:
-                    daily_score = calculate_proportional_score(value, target)
-                    actual_daily_scores.append(daily_score)
-                
-                # Weekly score is average of daily scores
-                actual_weekly_score = sum(actual_daily_scores) / len(actual_daily_scores)
-                
-            elif scenario.algorithm_type == "binary_threshold":
-                # Use binary threshold algorithm
-                threshold = scenario.config_data["threshold"]
-                operator = scenario.config_data.get("operator", ">=")
-                
-                for value in scenario.daily_values:
-                    daily_score = calculate_binary_score(value, threshold, operator)
-                    actual_daily_scores.append(daily_score)
-                
-                # Weekly score is average of daily scores
-                actual_weekly_score = sum(actual_daily_scores) / len(actual_daily_scores)
+            # Score through the same compiled kernel the configs use
+            algo = build_algorithm(scenario.algorithm_type, scenario.config_data)
+            actual_daily_scores = algo.kernel.daily(scenario.daily_values)[0].tolist()
+            actual_weekly_score = float(algo.kernel.weekly(scenario.daily_values)[0])
             
             # Display daily breakdown
             output_lines.append("DAILY TEST DATA:")
@@ -0,0 +1,64 @@
+"""
+Test suite for the categorical filter threshold algorithm.
+
+Tests the category index and the array batch path.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from algorithms import (
+    CategoryFilter,
+    ComparisonOperator,
+    create_daily_categorical_filter
+)
+
+
+def food_source_algorithm(aggregation_method="weighted_average"):
+    filters = [
+        CategoryFilter("plant", ["legumes", "nuts"], threshold=2, weight=2.0),
+        CategoryFilter("processed", ["chips", "soda"], threshold=1,
+                       comparison_operator=ComparisonOperator.LTE, weight=0.5),
+    ]
+    return create_daily_categorical_filter(
+        category_field="food_source", category_filters=filters,
+        default_threshold=1, aggregation_method=aggregation_method
+    )
+
+
+class TestCategoricalFilterIndex:
+    """Test indexed lookups and batch scoring."""
+
+    def test_index_lookup(self):
+        """Test that category values resolve to their filter or the default."""
+        algo = food_source_algorithm()
+
+        assert algo.calculate_score({"food_source": "nuts", "value": 3})["matched_category"] == "plant"
+        assert algo.calculate_score({"food_source": "soda", "value": 2})["score"] == 0
+        assert algo.calculate_score({"food_source": "fish", "value": 1})["score"] == 50
+        assert list(algo.encode_categories(["soda", "fish", "legumes"])) == [1, algo.default_code, 0]
+
+    def test_batch_matches_multi_category(self):
+        """Test every aggregation method against calculate_multi_category_score."""
+        items = [("legumes", 3), ("chips", 0), ("fish", None), ("soda", 4), ("nuts", 1), ("rice", 2)]
+        data = [{"food_source": c, "value": v} for c, v in items]
+        categories = [c for c, _ in items]
+        values = [v for _, v in items]
+
+        for method in ("weighted_average", "simple_average", "minimum", "maximum"):
+            algo = food_source_algorithm(method)
+            expected = algo.calculate_multi_category_score(data)
+            result = algo.calculate_batch_scores(
+                algo.encode_categories(categories), values,
+                include_breakdown=True, category_values=categories
+            )
+
+            assert np.isclose(result["score"], expected["score"])
+            assert list(result["scores"]) == [item["score"] for item in expected["breakdown"]]
+            assert result["breakdown"] == expected["breakdown"]
+            assert "breakdown" not in algo.calculate_batch_scores(algo.encode_categories(categories), values)
@@ -0,0 +1,90 @@
+"""
+Test suite for compiled composite scoring.
+
+Tests batch matrix scoring and missing-component masking for the composite
+weighted and sleep composite algorithms.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from algorithms import Component, create_daily_composite, create_sleep_quality_composite
+from algorithms.sleep_composite import create_sleep_composite
+
+SLEEP_FIELDS = ["sleep_duration", "sleep_time_consistency", "wake_time_consistency"]
+
+
+def nutrition_composite():
+    return create_daily_composite(components=[
+        Component("Protein", 0.5, 120, "grams", "proportional", "protein",
+                  {"minimum_threshold": 10, "maximum_cap": 110}),
+        Component("Fiber", 0.3, 30, "grams", "binary", "fiber",
+                  {"threshold": 25, "comparison_operator": ">", "success_value": 100, "failure_value": 20}),
+        Component("Vegetables", 0.2, 5, "servings", "zone_based", "vegetables",
+                  {"zones": [{"min": 0, "max": 2, "score": 30}, {"min": 2, "max": 5, "score": 100}]}),
+    ])
+
+
+class TestCompositeBatch:
+    """Test the compiled batch path against per-row scoring."""
+
+    def test_batch_matches_rows(self):
+        """Test that matrix scores equal calculate_score for every row."""
+        algo = nutrition_composite()
+        rows = [
+            {"protein": p, "fiber": f, "vegetables": v}
+            for p in (0, 60, 120, 200) for f in (10, 25, 26) for v in (0, 2, 4.5, 7)
+        ]
+        scores = algo.calculate_batch_scores(algo.component_matrix(rows))
+
+        assert list(scores) == [algo.calculate_score(row) for row in rows]
+
+        sleep = create_sleep_quality_composite()
+        matrix = [[4, 30], [7.5, 60], [9, 90], [13, 0]]
+        assert list(sleep.calculate_batch_scores(matrix)) == [
+            sleep.calculate_score({"sleep_duration": d, "schedule_variance": v}) for d, v in matrix
+        ]
+
+    def test_missing_components(self):
+        """Test that missing components raise unless masked out."""
+        algo = nutrition_composite()
+        rows = [{"protein": 120, "vegetables": 3}, {"fiber": 20}, {}]
+
+        with pytest.raises(ValueError, match="fiber"):
+            algo.calculate_score(rows[0])
+        with pytest.raises(ValueError, match="fiber"):
+            algo.calculate_batch_scores(algo.component_matrix(rows))
+
+        masked = algo.calculate_batch_scores(algo.component_matrix(rows), skip_missing=True)
+        assert list(masked) == [algo.calculate_score(row, skip_missing=True) for row in rows]
+        assert masked[0] == 100.0
+        assert masked[1] == 20.0
+        assert masked[2] == 0.0
+
+
+class TestSleepCompositeBatch:
+    """Test sleep composite batch scoring."""
+
+    def test_batch_matches_rows(self):
+        """Test duration zones, the 9 hour edge and variance thresholds."""
+        algo = create_sleep_composite()
+        matrix = [
+            [8.0, 15, 20], [6.5, 45, 75], [5.5, 180, 120], [9.0, 60, 150], [24, 0, 0], [30, 89.5, 90]
+        ]
+        assert list(algo.calculate_batch_scores(matrix)) == [
+            algo.calculate_score(dict(zip(SLEEP_FIELDS, row))) for row in matrix
+        ]
+
+    def test_missing_values(self):
+        """Test that missing values score as 0 unless masked out."""
+        algo = create_sleep_composite()
+        matrix = [[8.0, np.nan, np.nan], [np.nan, np.nan, np.nan]]
+
+        assert algo.calculate_batch_scores(matrix)[0] == algo.calculate_score({"sleep_duration": 8.0})
+        assert list(algo.calculate_batch_scores(matrix, skip_missing=True)) == [100.0, 0.0]
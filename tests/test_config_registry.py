@@ -0,0 +1,356 @@
+"""
+Test suite for the compiled recommendation config registry.
+
+Tests config compilation, validation, metric indexing, hot reloading,
+the packed config bundle and config fingerprinting.
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from core_systems import config_fingerprint
+from core_systems.config_bundle import ConfigBundle, build_config_bundle
+from core_systems.config_fingerprint import FingerprintService, diff_fingerprints
+from core_systems.config_registry import (
+    ConfigRegistry,
+    ConfigWatcher,
+    ComponentScorer,
+    EntryScorer,
+    UnsupportedMethodError,
+    compile_config
+)
+from algorithms import compile_kernel
+
+CONFIG_DIR = Path(__file__).parent.parent / "src" / "generated_configs"
+
+
+def make_config(rec_id, method, metric='water_consumed', **schema):
+    schema.setdefault('unit', 'milliliter')
+    return {
+        'config_id': f"SC-{rec_id}",
+        'scoring_method': method,
+        'configuration_json': {
+            'method': method,
+            'schema': dict(schema, tracked_metrics=[metric])
+        },
+        'metadata': {'recommendation_id': rec_id}
+    }
+
+
+class TestCompileConfig:
+    """Test compiling single configs into scorers."""
+
+    def test_binary_threshold(self):
+        """Test prebound binary threshold scoring."""
+        scorer = compile_config(make_config('REC9000.1', 'binary_threshold', threshold=2000), 'REC9000.1')
+
+        assert scorer.calculate(2500, 'milliliter')['score'] == 100.0
+        assert scorer.calculate(1500, 'milliliter')['score'] == 0.0
+
+    def test_proportional_matches_kernel(self):
+        """Test that proportional entries score against the target through the shared kernel."""
+        scorer = compile_config(make_config('REC9000.6', 'proportional', target=200, maximum_cap=50), 'REC9000.6')
+
+        assert scorer.score(50) == 25.0
+        assert scorer.score(150) == 50.0
+        assert scorer.score(-5) == 0.0
+
+    def test_minimum_frequency_comparison(self):
+        """Test that the comparison operator is resolved at compile time."""
+        config = make_config(
+            'REC9000.2', 'minimum_frequency',
+            daily_threshold=1, daily_comparison='<=', required_days=5
+        )
+        scorer = compile_config(config, 'REC9000.2')
+
+        assert isinstance(scorer, EntryScorer)
+        assert scorer.score(0) == 100.0
+        assert scorer.score(2) == 0.0
+
+    def test_time_thresholds(self):
+        """Test that "HH:MM" thresholds are read as decimal hours, as by the config compiler."""
+        config = make_config(
+            'REC9000.8', 'minimum_frequency',
+            daily_threshold="14:30", daily_comparison='<=', required_days=5
+        )
+        scorer = compile_config(config, 'REC9000.8')
+
+        assert scorer.kernel.daily_threshold == 14.5
+        assert scorer.score(14.5) == 100.0
+        assert scorer.score(15) == 0.0
+
+    def test_evaluation_patterns(self):
+        """Test the engine's per-entry evaluation patterns."""
+        frequency = compile_config(make_config(
+            'REC9000.9', 'proportional', evaluation_pattern='weekly_frequency', daily_threshold=30, required_days=3
+        ), 'REC9000.9')
+        daily = compile_config(make_config(
+            'REC9000.10', 'proportional', evaluation_pattern='daily_achievement', daily_target=2000
+        ), 'REC9000.10')
+        binary = compile_config(make_config(
+            'REC9000.11', 'binary', evaluation_pattern='weekly_frequency', daily_threshold=30
+        ), 'REC9000.11')
+
+        assert (frequency.score(30), frequency.score(29)) == (33.33, 0.0)
+        assert (daily.score(500), daily.score(3000)) == (25.0, 100.0)
+        assert (binary.score(30), binary.score(29)) == (100.0, 20.0)
+
+    def test_unit_mismatch(self):
+        """Test that a base unit mismatch is rejected at score time."""
+        scorer = compile_config(make_config('REC9000.3', 'proportional', maximum_cap=100), 'REC9000.3')
+
+        try:
+            scorer.calculate(50, 'kilogram')
+            assert False, "Should have raised ValueError for unit mismatch"
+        except ValueError as e:
+            assert "Unit mismatch" in str(e)
+
+    def test_invalid_configs(self):
+        """Test that unsupported and invalid configs fail at compile time."""
+        try:
+            compile_config(make_config('REC9000.3', 'binary'), 'REC9000.3')
+            assert False, "Should have raised UnsupportedMethodError"
+        except UnsupportedMethodError:
+            pass
+
+        for config in [
+            make_config('REC9000.4', 'zone_based'),
+            make_config('REC9000.5', 'binary_threshold', threshold=1, comparison_operator='!='),
+            make_config('REC9000.6', 'proportional', target=0),
+            make_config('REC9000.7', 'proportional', target='two')
+        ]:
+            try:
+                compile_config(config, config['metadata']['recommendation_id'])
+                assert False, "Should have raised ValueError"
+            except ValueError:
+                pass
+
+    def test_scorers_are_immutable(self):
+        """Test that compiled scorers cannot be modified."""
+        scorer = compile_config(make_config('REC9000.7', 'proportional'), 'REC9000.7')
+
+        assert isinstance(scorer, EntryScorer)
+        try:
+            scorer.kernel = None
+            assert False, "Should have raised AttributeError"
+        except AttributeError:
+            pass
+
+
+class TestConfigRegistry:
+    """Test the registry over a config directory."""
+
+    def test_generated_configs(self):
+        """Test that the shipped configs load and are indexed by metric."""
+        registry = ConfigRegistry(str(CONFIG_DIR))
+
+        assert 'REC0001.2' in registry.scorers
+        assert all(
+            'daily_fiber_serving' in scorer.tracked_metrics
+            for scorer in registry.scorers_for_metric('daily_fiber_serving')
+        )
+        assert registry.scorers['REC0001.2'] in registry.scorers_for_metric('daily_fiber_serving')
+
+    def test_every_generated_config_is_scorable(self):
+        """Test that every shipped config compiles to the config compiler's kernel."""
+        registry = ConfigRegistry(str(CONFIG_DIR))
+        paths = sorted(path for path in CONFIG_DIR.glob("*.json") if path.name != "all_generated_configs.json")
+
+        assert registry.errors == {}
+        assert len(registry.scorers) == len(paths)
+        for path in paths:
+            with open(path) as f:
+                config = json.load(f)
+            scorer = registry.scorers[config['metadata']['recommendation_id']]
+            kernel = compile_kernel(config)
+            if isinstance(scorer, ComponentScorer):
+                assert type(scorer.kernel) is type(kernel)
+                assert all(scorer not in scorers for scorers in registry.by_metric.values())
+            else:
+                for value in (0, 1, 3.5, 14, 8000):
+                    assert scorer.score(value) == round(kernel.day_score(value), 2), path.name
+
+    def test_reload_on_change(self, tmp_path):
+        """Test that reload only rebuilds when files change."""
+        path = tmp_path / "REC9000.1.json"
+        path.write_text(json.dumps(make_config('REC9000.1', 'binary_threshold', threshold=1)))
+        registry = ConfigRegistry(str(tmp_path))
+
+        assert registry.reload() is False
+
+        (tmp_path / "REC9000.2.json").write_text(
+            json.dumps(make_config('REC9000.2', 'binary_threshold', threshold=2))
+        )
+        assert registry.reload() is True
+        assert set(registry.scorers) == {'REC9000.1', 'REC9000.2'}
+        assert len(registry.scorers_for_metric('water_consumed')) == 2
+
+    def test_incremental_reload_keeps_snapshots(self, tmp_path):
+        """Test that only changed files recompile and old snapshots stay intact."""
+        for i in (1, 2):
+            (tmp_path / f"REC9000.{i}.json").write_text(
+                json.dumps(make_config(f"REC9000.{i}", 'binary_threshold', threshold=i))
+            )
+        registry = ConfigRegistry(str(tmp_path))
+        before = registry.snapshot
+        unchanged = registry.scorers['REC9000.2']
+
+        path = tmp_path / "REC9000.1.json"
+        path.write_text(json.dumps(make_config('REC9000.1', 'binary_threshold', threshold=10)))
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+        (tmp_path / "REC9000.2.json").touch()
+        assert registry.reload() is True
+
+        after = registry.snapshot
+        assert after.version == before.version + 1
+        assert after.scorers['REC9000.2'] is unchanged
+        assert after.scorers['REC9000.1'].kernel.threshold == 10
+        assert before.scorers['REC9000.1'].kernel.threshold == 1
+        assert len(after.scorers_for_metric('water_consumed')) == 2
+
+        (tmp_path / "REC9000.2.json").unlink()
+        registry.reload()
+        assert registry.scorers_for_metric('water_consumed') == (registry.scorers['REC9000.1'],)
+
+    def test_reload_reads_changed_files_once(self, tmp_path, monkeypatch):
+        """Test that reload reads each changed file once and the scan only stats files."""
+        for i in (1, 2):
+            (tmp_path / f"REC9000.{i}.json").write_text(
+                json.dumps(make_config(f"REC9000.{i}", 'binary_threshold', threshold=i))
+            )
+        registry = ConfigRegistry(str(tmp_path))
+        unchanged = registry.scorers['REC9000.2']
+
+        def no_hash(path):
+            raise AssertionError(f"{path} hashed by the fingerprint scan")
+
+        reads = []
+        read = ConfigRegistry._read
+        monkeypatch.setattr(config_fingerprint, 'file_hash', no_hash)
+        monkeypatch.setattr(ConfigRegistry, '_read', lambda self, path: reads.append(path) or read(self, path))
+
+        path = tmp_path / "REC9000.2.json"
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+        registry.reload()
+
+        assert reads == [str(path)]
+        assert registry.scorers['REC9000.2'] is unchanged
+
+    def test_reload_keeps_file_order(self, tmp_path):
+        """Test that a recompiled scorer keeps its place in the metric index."""
+        for i in (1, 2, 3):
+            (tmp_path / f"REC9000.{i}.json").write_text(
+                json.dumps(make_config(f"REC9000.{i}", 'binary_threshold', threshold=i))
+            )
+        registry = ConfigRegistry(str(tmp_path))
+
+        path = tmp_path / "REC9000.1.json"
+        path.write_text(json.dumps(make_config('REC9000.1', 'binary_threshold', threshold=10)))
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+        assert registry.reload() is True
+
+        ordered = [s.recommendation_id for s in registry.scorers_for_metric('water_consumed')]
+        assert ordered == ['REC9000.1', 'REC9000.2', 'REC9000.3']
+
+    def test_watcher(self, tmp_path):
+        """Test that the watcher picks up new config files."""
+        registry = ConfigRegistry(str(tmp_path))
+        watcher = ConfigWatcher(registry, interval=0.01).start()
+        try:
+            (tmp_path / "REC9000.1.json").write_text(
+                json.dumps(make_config('REC9000.1', 'binary_threshold', threshold=1))
+            )
+            deadline = time.time() + 5
+            while 'REC9000.1' not in registry.scorers and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            watcher.stop()
+
+        assert 'REC9000.1' in registry.scorers
+
+
+class TestConfigBundle:
+    """Test packing configs into a memory-mapped bundle."""
+
+    def test_bundle_round_trip(self, tmp_path):
+        """Test that every shipped config survives packing unchanged."""
+        bundle_path = build_config_bundle(str(CONFIG_DIR), str(tmp_path / "configs.bundle"))
+        registry = ConfigRegistry(str(CONFIG_DIR))
+
+        with ConfigBundle(bundle_path) as bundle:
+            assert set(bundle) == set(registry.configs)
+            assert bundle.get('REC0001.2') == registry.configs['REC0001.2']
+            assert 'REC0001.2' in bundle.recommendation_ids_for_metric('daily_fiber_serving')
+            assert json.loads(bytes(bundle.raw('REC0001.2'))) == registry.configs['REC0001.2']
+
+    def test_rejects_non_bundle(self, tmp_path):
+        """Test that arbitrary files are not mistaken for bundles."""
+        path = tmp_path / "not_a.bundle"
+        path.write_bytes(b"{}" * 64)
+        try:
+            ConfigBundle(str(path))
+            assert False, "Should have raised ValueError"
+        except ValueError as e:
+            assert "Not a config bundle" in str(e)
+
+    def test_registry_from_bundle(self, tmp_path):
+        """Test that the registry loads and reloads from a bundle."""
+        config_dir = tmp_path / "configs"
+        config_dir.mkdir()
+        for i in (1, 2):
+            (config_dir / f"REC9000.{i}.json").write_text(
+                json.dumps(make_config(f"REC9000.{i}", 'binary_threshold', threshold=i))
+            )
+        bundle_path = build_config_bundle(str(config_dir))
+        registry = ConfigRegistry(str(config_dir), bundle_path=bundle_path)
+        unchanged = registry.scorers['REC9000.2']
+
+        assert registry.reload() is False
+
+        (config_dir / "REC9000.1.json").write_text(
+            json.dumps(make_config('REC9000.1', 'binary_threshold', threshold=10))
+        )
+        build_config_bundle(str(config_dir))
+        assert registry.reload() is True
+        assert registry.scorers['REC9000.1'].kernel.threshold == 10
+        assert registry.scorers['REC9000.2'] is unchanged
+        assert len(registry.scorers_for_metric('water_consumed')) == 2
+
+
+class TestFingerprintService:
+    """Test incremental config fingerprinting."""
+
+    def test_rehashes_only_changed_files(self, tmp_path):
+        """Test that unchanged files reuse their hash across scans and processes."""
+        cache_file = tmp_path / "fingerprints.json"
+        config_dir = tmp_path / "configs"
+        config_dir.mkdir()
+        for i in (1, 2, 3):
+            (config_dir / f"REC9000.{i}.json").write_text(json.dumps(make_config(f"REC9000.{i}", 'proportional')))
+        (config_dir / "all_generated_configs.json").write_text("{}")
+
+        service = FingerprintService(config_dir, cache_file=cache_file)
+        first = service.hashes()
+        assert sorted(first) == ['REC9000.1.json', 'REC9000.2.json', 'REC9000.3.json']
+        assert service.rehashed == 3
+
+        # A new process picks the index up from the cache file
+        service = FingerprintService(config_dir, cache_file=cache_file)
+        assert service.hashes() == first
+        assert service.rehashed == 0
+
+        path = config_dir / "REC9000.1.json"
+        path.write_text(json.dumps(make_config('REC9000.1', 'binary_threshold', threshold=5)))
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+        (config_dir / "REC9000.2.json").touch()
+        (config_dir / "REC9000.3.json").unlink()
+        second = service.hashes()
+
+        assert service.rehashed == 2
+        assert diff_fingerprints(first, second) == ([], ['REC9000.1.json'], ['REC9000.3.json'])
@@ -0,0 +1,125 @@
+"""
+Test suite for compiled scoring kernels.
+
+Tests compiling every generated config into a kernel and that whole-matrix
+scoring matches the per-user algorithm methods.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from algorithms import (
+    SumLimitKernel,
+    ZoneBasedAlgorithm,
+    ZoneBasedConfig,
+    build_algorithm,
+    compile_kernel,
+    create_proportional_frequency_hybrid,
+    create_sleep_duration_zones
+)
+
+CONFIG_DIR = Path(__file__).parent.parent / "src" / "generated_configs"
+CONFIG_FILES = sorted(path for path in CONFIG_DIR.glob("*.json") if path.name != "all_generated_configs.json")
+
+
+def load_config(name):
+    with open(CONFIG_DIR / name) as f:
+        return json.load(f)
+
+
+def daily_matrix(users=20, days=7, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.integers(0, 10, (users, days)).astype(float)
+    values[:, ::3] += 0.5
+    return values
+
+
+class TestConfigCompiler:
+    """Test compiling generated config JSON."""
+
+    @pytest.mark.parametrize("path", CONFIG_FILES, ids=lambda path: path.stem)
+    def test_every_generated_config_compiles(self, path):
+        """Test that each generated config yields a kernel of the right shapes."""
+        with open(path) as f:
+            config = json.load(f)
+        kernel = compile_kernel(config)
+
+        if kernel.method == "composite_weighted":
+            values = np.ones((4, 7, len(kernel.field_names)))
+        elif kernel.method == "sleep_composite":
+            values = np.tile([7.5, 30.0, 45.0], (4, 7, 1))
+        else:
+            values = daily_matrix(users=4)
+        scores = kernel.score(values)
+
+        assert scores.daily.shape == (4, 7)
+        assert scores.progressive.shape == (4, 7)
+        assert scores.weekly.shape == (4,)
+
+    def test_schema_variants(self):
+        """Test time thresholds, sum limits and zone frequency targets."""
+        elimination = load_config("REC0015.3-WEEKLY-ELIMINATION.json")
+        assert compile_kernel(elimination).elimination_threshold == 14.0
+
+        limit = compile_kernel(load_config("REC0023.2-WEEKLY-ELIMINATION.json"))
+        assert isinstance(limit, SumLimitKernel)
+        assert limit.weekly([[0, 1, 0], [1, 0, 1]]).tolist() == [100.0, 0.0]
+
+        zone = compile_kernel(load_config("REC0004.1-ZONE-BASED-5TIER.json"))
+        assert zone.frequency_target == 5
+
+        with pytest.raises(ValueError, match="Unsupported algorithm type"):
+            build_algorithm("unknown", {})
+
+
+class TestKernelParity:
+    """Test matrix scoring against the per-user class methods."""
+
+    def test_progressive_rows_match(self):
+        """Test that each kernel row equals calculate_progressive_scores."""
+        values = daily_matrix()
+        for name in ("REC0016.1-MINIMUM-FREQUENCY.json", "REC0002.3-WEEKLY-ELIMINATION.json",
+                     "REC0009.2-BINARY-THRESHOLD.json", "REC0005.2-CONSTRAINED-WEEKLY-ALLOWANCE.json"):
+            config = load_config(name)
+            algorithm = build_algorithm(config["configuration_json"]["method"], config["configuration_json"]["schema"])
+            progressive = compile_kernel(config).progressive(values)
+            for row, days in zip(progressive, values.tolist()):
+                assert row.tolist() == algorithm.calculate_progressive_scores(days)
+
+    def test_weekly_rows_match(self):
+        """Test that weekly kernels match the scalar weekly scores."""
+        values = daily_matrix() * 1000
+        hybrid = create_proportional_frequency_hybrid(
+            daily_target=7500, required_qualifying_days=5, unit="steps", daily_minimum_threshold=2000
+        )
+        weekly = hybrid.kernel.weekly(values)
+        for score, days in zip(weekly, values.tolist()):
+            assert score == hybrid.calculate_weekly_score(days)
+
+        zones = ZoneBasedAlgorithm(ZoneBasedConfig(create_sleep_duration_zones(), "hours"), frequency_target=5)
+        hours = daily_matrix() + 3
+        for score, days in zip(zones.kernel.weekly(hours), hours.tolist()):
+            assert score == zones.calculate_weekly_frequency_score(days)
+
+        averaged = ZoneBasedAlgorithm(ZoneBasedConfig(create_sleep_duration_zones(), "hours"))
+        with pytest.raises(ValueError, match="No daily values"):
+            averaged.calculate_weekly_frequency_score([])
+
+    def test_day_score_matches_daily(self):
+        """Test that the scalar day_score path matches the vectorized daily scores."""
+        values = daily_matrix(users=4) - 2
+        for name in CONFIG_FILES:
+            with open(name) as f:
+                kernel = compile_kernel(json.load(f))
+            if kernel.method in ("composite_weighted", "sleep_composite"):
+                continue
+            daily = kernel.daily(values)
+            for row, days in zip(daily, values.tolist()):
+                assert [kernel.day_score(value) for value in days] == row.tolist(), name.stem
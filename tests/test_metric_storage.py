@@ -0,0 +1,204 @@
+"""
+Test suite for the metric storage backends.
+
+Tests the SQLite reference backend: batched entries, keyset history queries,
+unit preferences and the conversion audit log, plus the buffered audit sink
+and the cached preference service built on top of it.
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from database.metric_storage import SQLiteMetricStorage, normalize_timestamp
+from database.audit_sink import BufferedAuditSink, JsonlAuditWriter
+from core_systems.user_preference_service import UserPreferenceService
+
+
+def make_entry(entry_id, day, value=1000.0, user_id='user123'):
+    return {
+        'entry_id': entry_id,
+        'user_id': user_id,
+        'metric_id': 'dietary_water',
+        'base_value': value,
+        'base_unit': 'milliliter',
+        'original_value': value,
+        'original_unit': 'milliliter',
+        'scores': {'REC0020.2': 85.1},
+        'timestamp': f"2024-01-{day:02d}T10:30:00Z"
+    }
+
+
+def make_audit():
+    return {
+        'user_id': 'user123',
+        'metric_id': 'dietary_water',
+        'original_value': 8,
+        'original_unit': 'cup',
+        'converted_value': 1892.704,
+        'base_unit': 'milliliter',
+        'conversion_method': 'linear',
+        'session_id': 'session_456',
+        'timestamp': '2024-01-15T10:30:00'
+    }
+
+
+class TestSQLiteMetricStorage:
+    """Test the SQLite reference backend."""
+
+    def test_batched_entries_newest_first(self):
+        """Test batch insert and newest-first history."""
+        storage = SQLiteMetricStorage(':memory:')
+        ids = storage.store_metric_entries([make_entry(f"e{day}", day) for day in range(1, 6)])
+        storage.store_metric_entry(make_entry('other', 3, user_id='someone_else'))
+
+        entries = storage.get_metric_entries('user123', 'dietary_water', limit=3)
+
+        assert ids == ['e1', 'e2', 'e3', 'e4', 'e5']
+        assert [e['entry_id'] for e in entries] == ['e5', 'e4', 'e3']
+        assert entries[0]['scores'] == {'REC0020.2': 85.1}
+        assert entries[0]['timestamp'] == normalize_timestamp("2024-01-05T10:30:00Z")
+
+    def test_keyset_pagination(self):
+        """Test that 'before' continues strictly after the last returned entry."""
+        storage = SQLiteMetricStorage(':memory:')
+        storage.store_metric_entries([make_entry(f"e{day}", day) for day in range(1, 6)])
+        storage.store_metric_entry(make_entry('e3b', 3))
+
+        first = storage.get_metric_entries('user123', 'dietary_water', limit=3)
+        last = first[-1]
+        second = storage.get_metric_entries(
+            'user123', 'dietary_water', limit=3, before=(last['timestamp'], last['entry_id'])
+        )
+
+        assert [e['entry_id'] for e in first] == ['e5', 'e4', 'e3b']
+        assert [e['entry_id'] for e in second] == ['e3', 'e2', 'e1']
+
+    def test_timestamps_sort_in_time_order(self):
+        """Test that offsets, naive values and whole seconds normalize to one UTC format."""
+        assert normalize_timestamp("2024-01-05T09:00:00-05:00") == "2024-01-05T14:00:00.000000+00:00"
+        assert normalize_timestamp("2024-01-05T14:00:00") == normalize_timestamp("2024-01-05T14:00:00Z")
+
+        storage = SQLiteMetricStorage(':memory:')
+        for entry_id, timestamp in [('a', "2024-01-05T09:00:00-05:00"), ('b', "2024-01-05T10:00:00+00:00"),
+                                    ('c', "2024-01-05T10:00:00.500000Z")]:
+            entry = make_entry(entry_id, 5)
+            entry['timestamp'] = timestamp
+            storage.store_metric_entry(entry)
+
+        entries = storage.get_metric_entries('user123', 'dietary_water', limit=3)
+        assert [e['entry_id'] for e in entries] == ['a', 'c', 'b']
+
+    def test_unit_preferences(self):
+        """Test defaults and user overrides."""
+        storage = SQLiteMetricStorage(':memory:')
+
+        assert storage.get_user_unit_preferences('user123')['volume'] == 'cup'
+
+        updated = storage.save_user_unit_preferences('user123', {'volume': 'liter'})
+        assert updated['volume'] == 'liter'
+        assert updated['mass'] == 'pound'
+        assert storage.get_user_unit_preferences('someone_else')['volume'] == 'cup'
+
+    def test_conversion_audit_log(self):
+        """Test batched audit inserts."""
+        storage = SQLiteMetricStorage(':memory:')
+        storage.log_conversions([make_audit(), make_audit()])
+
+        with storage._connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM conversion_audit_log").fetchone()[0]
+        assert count == 2
+
+    def test_file_database(self, tmp_path):
+        """Test that a file database persists across backend instances."""
+        db_path = str(tmp_path / "metrics.db")
+        storage = SQLiteMetricStorage(db_path)
+        storage.store_metric_entry(make_entry('e1', 1))
+        storage.close()
+
+        reopened = SQLiteMetricStorage(db_path)
+        assert [e['entry_id'] for e in reopened.get_metric_entries('user123', 'dietary_water', 10)] == ['e1']
+
+
+class TestBufferedAuditSink:
+    """Test the background conversion audit sink."""
+
+    def test_flush_to_storage(self):
+        """Test that submitted entries reach the audit table in batches."""
+        storage = SQLiteMetricStorage(':memory:')
+        sink = BufferedAuditSink(storage.log_conversions, batch_size=2, flush_interval=0.05)
+        for _ in range(5):
+            assert sink.submit(make_audit())
+        sink.close()
+
+        with storage._connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM conversion_audit_log").fetchone()[0]
+        stats = sink.stats()
+        assert count == 5
+        assert stats['written'] == 5
+        assert stats['dropped'] == 0
+
+    def test_jsonl_writer(self, tmp_path):
+        """Test flushing to a JSON Lines file."""
+        path = tmp_path / "audit.jsonl"
+        sink = BufferedAuditSink(JsonlAuditWriter(str(path)), flush_interval=0.05)
+        sink.submit(make_audit())
+        sink.submit(make_audit())
+        sink.close()
+
+        assert len(path.read_text().splitlines()) == 2
+
+    def test_drops_when_full(self):
+        """Test that a full buffer drops entries instead of blocking."""
+        release = threading.Event()
+
+        def slow_writer(batch):
+            release.wait(5)
+
+        sink = BufferedAuditSink(slow_writer, max_queue_size=2, batch_size=1, flush_interval=0.01)
+        results = [sink.submit(make_audit()) for _ in range(10)]
+        release.set()
+        sink.close()
+
+        stats = sink.stats()
+        assert False in results
+        assert stats['dropped'] == results.count(False)
+        assert stats['backpressure'] > 0
+
+
+class TestUserPreferenceService:
+    """Test the cached preference service."""
+
+    def test_cache_and_write_through(self):
+        """Test that reads are cached and saves refresh the cache."""
+        storage = SQLiteMetricStorage(':memory:')
+        service = UserPreferenceService(storage)
+
+        assert service.get_preferred_unit('user123', 'volume') == 'cup'
+
+        # Changed behind the service's back: still served from cache
+        storage.save_user_unit_preferences('user123', {'volume': 'liter'})
+        assert service.get_preferred_unit('user123', 'volume') == 'cup'
+
+        service.save_preferences('user123', {'volume': 'gallon'})
+        assert service.get_preferred_unit('user123', 'volume') == 'gallon'
+
+        storage.save_user_unit_preferences('user123', {'volume': 'pint'})
+        service.invalidate('user123')
+        assert service.get_preferred_unit('user123', 'volume') == 'pint'
+
+    def test_ttl_and_lru_eviction(self):
+        """Test expiry and the per-user size bound."""
+        storage = SQLiteMetricStorage(':memory:')
+        service = UserPreferenceService(storage, ttl_seconds=0, max_users=2)
+        service.get_preferences('user123')
+        storage.save_user_unit_preferences('user123', {'mass': 'kilogram'})
+        assert service.get_preferred_unit('user123', 'mass') == 'kilogram'
+
+        service = UserPreferenceService(storage, max_users=2)
+        for user_id in ['a', 'b', 'c']:
+            service.get_preferences(user_id)
+        assert list(service._cache) == ['b', 'c']
@@ -0,0 +1,161 @@
+"""
+Test suite for the recommendation config generator.
+
+Tests saving configs through the master journal, batch saves, compaction
+of all_generated_configs.json, bulk generation and keyword/metric matching.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from recommendation_config_generator import (
+    RecommendationConfigGenerator,
+    KeywordMatcher,
+    MetricIndex,
+    ANALYSIS_MATCHER,
+    compact_master,
+    generate_all,
+    load_recommendations,
+    MASTER_JOURNAL_FILE
+)
+
+RECOMMENDATIONS_CSV = Path(__file__).parent.parent / "src" / "ref_csv_files_airtable" / "recommendations_v2.csv"
+
+
+def make_config(rec_id, threshold=1):
+    return {
+        'config_id': f"SC-{rec_id}",
+        'configuration_json': {'schema': {'threshold': threshold}},
+        'metadata': {
+            'recommendation_id': rec_id,
+            'analysis': {'algorithm_type': 'binary_threshold'}
+        }
+    }
+
+
+def read_master(output_dir):
+    return json.loads((output_dir / "all_generated_configs.json").read_text())
+
+
+class TestKeywordMatcher:
+    """Test the one-pass keyword automaton."""
+
+    def test_overlapping_patterns(self):
+        """Test that nested and overlapping patterns are all reported."""
+        matcher = KeywordMatcher(["eliminate", "eliminate all", "all", "per week", "week across"])
+        found = matcher.match("eliminate all alcohol per week across 2 days")
+
+        assert all(matcher.contains(found, p) for p in matcher.bits)
+        assert matcher.count(found, ("all", "eliminate")) == 2
+        assert matcher.match("nothing here") == 0
+
+    def test_matches_substring_checks(self):
+        """Test agreement with `pattern in text` over the recommendation catalog."""
+        for _, text in load_recommendations(str(RECOMMENDATIONS_CSV)):
+            text_lower = text.lower()
+            found = ANALYSIS_MATCHER.match(text_lower)
+            for pattern in ANALYSIS_MATCHER.bits:
+                assert ANALYSIS_MATCHER.contains(found, pattern) == (pattern in text_lower)
+
+
+class TestMetricIndex:
+    """Test the inverted metric index used by find_related_metric."""
+
+    def test_scores_and_ties(self):
+        """Test weights, repeated terms and earliest-wins ties."""
+        index = MetricIndex({
+            'daily_water_intake': {'name': 'Water', 'description': 'Water water glasses'},
+            'daily_fiber_serving': {'name': 'Fiber', 'description': 'Fiber servings'},
+            'fiber_sources': {'name': 'Fiber', 'description': 'Fiber servings'}
+        }, boost_keywords=('water',))
+
+        scores, _ = index.score("drink 8 glasses of water daily")
+        # name 10 + "water" twice + "glasses" + id parts "daily"/"water" + boost 5
+        assert scores[0] == 10 + 2 + 1 + 2 + 2 + 5
+        assert index.best(scores) == ('daily_water_intake', 22)
+
+        fiber_scores, _ = index.score("add fiber servings")
+        assert index.best(fiber_scores) == ('daily_fiber_serving', 16)
+        assert index.best(fiber_scores, floor=20) == (None, 20)
+
+    def test_related_metric_for_catalog(self):
+        """Test that shipped recommendations resolve to known metrics."""
+        generator = RecommendationConfigGenerator()
+
+        assert generator.find_related_metric("Drink 8 cups of water daily") in generator.calculated_metrics_data
+        assert generator.find_related_metric("zzzz") is None
+
+
+class TestMasterConfigUpdates:
+    """Test journaled and batched master list updates."""
+
+    def test_single_save_is_journaled(self, tmp_path):
+        """Test that single saves append to the journal until compaction."""
+        generator = RecommendationConfigGenerator()
+        path = generator.save_config(make_config('REC0002.1'), str(tmp_path))
+        generator.save_config(make_config('REC0001.1'), str(tmp_path))
+        generator.save_config(make_config('REC0002.1', threshold=5), str(tmp_path))
+
+        assert Path(path).name == "REC0002.1-BINARY-THRESHOLD.json"
+        assert not (tmp_path / "all_generated_configs.json").exists()
+        assert len((tmp_path / MASTER_JOURNAL_FILE).read_text().splitlines()) == 3
+
+        assert compact_master(str(tmp_path)) == 3
+        master = read_master(tmp_path)
+        assert [c['metadata']['recommendation_id'] for c in master['configurations']] == ['REC0001.1', 'REC0002.1']
+        assert master['configurations'][1]['configuration_json']['schema']['threshold'] == 5
+        assert master['total_configs'] == 2
+        assert not (tmp_path / MASTER_JOURNAL_FILE).exists()
+
+    def test_batch_writes_master_once(self, tmp_path):
+        """Test that a batch merges into an existing master in one write."""
+        generator = RecommendationConfigGenerator()
+        generator.save_config(make_config('REC0003.1'), str(tmp_path))
+        compact_master(str(tmp_path))
+
+        paths = generator.save_configs(
+            [make_config('REC0001.1'), make_config('REC0003.1', threshold=9)], str(tmp_path)
+        )
+
+        master = read_master(tmp_path)
+        assert len(paths) == 2
+        assert [c['metadata']['recommendation_id'] for c in master['configurations']] == ['REC0001.1', 'REC0003.1']
+        assert master['configurations'][1]['configuration_json']['schema']['threshold'] == 9
+        assert not (tmp_path / MASTER_JOURNAL_FILE).exists()
+
+
+class TestBulkGeneration:
+    """Test bulk config generation."""
+
+    def test_load_recommendations(self, tmp_path):
+        """Test reading recommendations from the CSV and JSON sources."""
+        from_csv = load_recommendations(str(RECOMMENDATIONS_CSV))
+        assert from_csv[0] == ('REC0001.1', 'Add one daily serving of fiber-rich food (e.g., oats or beans)')
+
+        path = tmp_path / "recommendations.json"
+        path.write_text(json.dumps({'recommendations': [
+            {'id': 'REC0001.1', 'title': 'Increase Fiber Intake'},
+            {'id': 'REC0001.2'}
+        ]}))
+        assert load_recommendations(str(path)) == [('REC0001.1', 'Increase Fiber Intake')]
+
+    def test_pool_matches_single_generator(self, tmp_path):
+        """Test that pooled generation matches generating one at a time."""
+        recommendations = load_recommendations(str(RECOMMENDATIONS_CSV))[:6]
+        stats = generate_all(recommendations, str(tmp_path), workers=2)
+
+        assert stats['generated'] == 6
+        assert not stats['failed']
+        master = read_master(tmp_path)
+        assert master['total_configs'] == 6
+
+        generator = RecommendationConfigGenerator()
+        for (rec_id, text), config in zip(recommendations, master['configurations']):
+            expected = generator.generate_config(text, rec_id)
+            expected['metadata'].pop('generated_at')
+            config['metadata'].pop('generated_at')
+            assert config == expected
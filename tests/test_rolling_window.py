@@ -0,0 +1,84 @@
+"""
+Test suite for the rolling window adherence evaluator.
+
+Tests that every rolling window score matches the weekly scorer applied to
+that slice of the history.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from algorithms import (
+    ProportionalFrequencyHybridAlgorithm,
+    ProportionalFrequencyHybridConfig,
+    calculate_minimum_frequency_score,
+    calculate_weekly_elimination_score,
+    calculate_weekly_limit_score,
+    calculate_rolling_minimum_frequency_scores,
+    calculate_rolling_elimination_scores,
+    calculate_rolling_limit_scores,
+    calculate_progressive_scores_by_period
+)
+from algorithms.minimum_frequency import MinimumFrequencyAlgorithm, MinimumFrequencyConfig
+from algorithms.rolling_window import sliding_max
+
+
+def year_of_values(seed=7):
+    rng = random.Random(seed)
+    return [rng.choice([0, 0, 1, 2, 3, 5, 8, 10, 2.5]) for _ in range(365)]
+
+
+def weekly_slices(values, window=7):
+    return [values[i:i + window] for i in range(len(values) - window + 1)]
+
+
+class TestRollingWindowScores:
+    """Test rolling scores against the single-window scorers."""
+
+    def test_minimum_frequency_and_elimination(self):
+        """Test frequency, elimination and weekly limit windows."""
+        values = year_of_values()
+
+        assert calculate_rolling_minimum_frequency_scores(values, 3, ">=", 4) == [
+            calculate_minimum_frequency_score(week, 3, ">=", 4)["score"] for week in weekly_slices(values)
+        ]
+        assert calculate_rolling_elimination_scores(values, 2, "<=") == [
+            calculate_weekly_elimination_score(week, 2, "<=")["score"] for week in weekly_slices(values)
+        ]
+        counts = [int(v) for v in values]
+        assert calculate_rolling_limit_scores(counts, 20) == [
+            calculate_weekly_limit_score(week, 20)["score"] for week in weekly_slices(counts)
+        ]
+        assert len(calculate_rolling_elimination_scores(values[:6])) == 0
+
+    def test_hybrid(self):
+        """Test top-1 (sliding max) and top-N hybrid windows."""
+        values = year_of_values(seed=11)
+        for required in (1, 3, 7):
+            algorithm = ProportionalFrequencyHybridAlgorithm(ProportionalFrequencyHybridConfig(
+                daily_target=8, required_qualifying_days=required, unit="servings",
+                daily_minimum_threshold=1, minimum_threshold=5
+            ))
+            assert algorithm.calculate_rolling_scores(values) == [
+                algorithm.calculate_weekly_score(week) for week in weekly_slices(values)
+            ]
+
+    def test_sliding_max(self):
+        """Test the monotonic deque maximum with a wider window."""
+        values = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5]
+        assert sliding_max(values, 3) == [max(values[i:i + 3]) for i in range(len(values) - 2)]
+
+    def test_progressive_by_period(self):
+        """Test that progressive scores restart each period and skip a partial one."""
+        algorithm = MinimumFrequencyAlgorithm(MinimumFrequencyConfig(
+            daily_threshold=5, daily_comparison=">=", required_days=5
+        ))
+        values = year_of_values()[:17]
+        scores = calculate_progressive_scores_by_period(algorithm, values)
+
+        assert len(scores) == 14
+        assert scores[7:] == algorithm.calculate_progressive_scores(values[7:14])
@@ -0,0 +1,87 @@
+"""
+Test suite for streaming sleep consistency.
+
+Tests circular statistics across midnight, rolling window eviction and
+feeding the sleep composite.
+"""
+
+import math
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from algorithms.sleep_composite import create_sleep_composite
+from algorithms.sleep_consistency import (
+    RollingCircularStats,
+    SleepConsistencyTracker,
+    circular_difference,
+    clock_minutes
+)
+
+
+def circular_std(minutes):
+    angles = [2 * math.pi * m / 1440 for m in minutes]
+    r = math.hypot(sum(map(math.cos, angles)) / len(angles), sum(map(math.sin, angles)) / len(angles))
+    return math.sqrt(-2 * math.log(min(r, 1.0))) * 1440 / (2 * math.pi)
+
+
+class TestRollingCircularStats:
+    """Test the incremental circular mean and spread."""
+
+    def test_midnight_wrap(self):
+        """Test that times either side of midnight average to midnight."""
+        stats = RollingCircularStats(window=7)
+        for value in ("23:30", "00:30", "23:45", "00:15"):
+            stats.add(clock_minutes(value))
+
+        assert abs(circular_difference(stats.mean, 0)) < 1e-6
+        # Tightly grouped times: close to the ordinary standard deviation (23.72)
+        assert abs(stats.std_minutes - math.sqrt(562.5)) < 0.1
+        assert circular_difference(30, 1410) == 60
+        assert circular_difference(1410, 30) == -60
+
+    def test_window_eviction(self):
+        """Test that the rolling spread matches a recomputation of each window."""
+        rng = random.Random(9)
+        values = [(1380 + rng.gauss(0, 40)) % 1440 for _ in range(200)]
+        stats = RollingCircularStats(window=5)
+        for i, value in enumerate(values):
+            stats.add(value)
+            window = values[max(0, i - 4):i + 1]
+            assert len(stats) == len(window)
+            assert abs(stats.std_minutes - circular_std(window)) < 1e-6
+
+
+class TestSleepConsistencyTracker:
+    """Test per-user tracking and composite scoring."""
+
+    def test_feeds_composite(self):
+        """Test nightly updates, durations and batch rows."""
+        tracker = SleepConsistencyTracker(window_nights=7)
+        algorithm = create_sleep_composite()
+        start = datetime(2024, 3, 1, 23, 0)
+
+        for night in range(10):
+            bedtime = start + timedelta(days=night, minutes=(-20 if night % 2 else 20))
+            data = tracker.add_night("u1", bedtime, bedtime + timedelta(hours=8))
+        tracker.add_night("u2", "01:30", "06:00")
+
+        assert data["sleep_duration"] == 8.0
+        assert abs(data["sleep_time_consistency"] - 20) < 0.2
+        assert abs(data["sleep_time_deviation"]) > 19
+        assert algorithm.calculate_score(data) == 100.0
+
+        u2 = tracker.sleep_data("u2")
+        assert u2["sleep_duration"] == 4.5 and u2["wake_time_consistency"] == 0.0
+        assert tracker.sleep_data("u3") == {}
+
+        scores = algorithm.calculate_batch_scores(tracker.sleep_matrix(["u1", "u2", "u3"]), skip_missing=True)
+        assert list(scores[:2]) == [algorithm.calculate_score(tracker.sleep_data(u)) for u in ("u1", "u2")]
+        assert scores[2] == 0.0
+
+        tracker.remove_user("u1")
+        assert tracker.users() == ["u2"]
@@ -0,0 +1,399 @@
+"""
+Test suite for the vectorized survey scoring kernels.
+
+Tests multi-select encoding and the population-wide versions of the survey
+runner's custom scorers.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add scripts to path for imports
+sys.path.append(str(Path(__file__).parent.parent / "scripts"))
+
+from survey_kernels import (
+    encode_multi_select,
+    popcount64,
+    score_sleep_issues_population,
+    score_sleep_protocols_population,
+    score_cognitive_activities_population,
+    coping_score_population,
+    resolve_as_of_date,
+    load_screening_rules,
+    screening_windows,
+    score_screening_dates_population,
+    lookup_scores,
+    score_movement_population,
+    score_substances_population,
+)
+
+SCREENING_RULES_FILE = Path(__file__).parent.parent / "src" / "ref_csv_files_airtable" / "screening_compliance_rules.csv"
+
+SLEEP_ISSUES = [
+    ("Difficulty falling asleep", "4.13", {"Sleep": 5}),
+    ("Snoring", "4.18", {"Sleep": 4, "CoreCare": 2}),
+]
+SLEEP_FREQ_MAP = {"Always": 0.2, "Frequently": 0.4, "Occasionally": 0.6, "Rarely": 0.8, "": 1.0}
+MOVEMENT_QUESTIONS = {
+    "Cardio": {"freq_q": "3.04", "dur_q": "3.08", "pillar_weights": {"Movement": 16}},
+    "Flexibility": {"freq_q": "3.06", "dur_q": "3.10", "pillar_weights": {"Movement": 13, "CoreCare": 2}},
+}
+FREQ_SCORES = {"": 0.0, "Rarely": 0.4, "Occasionally": 0.6, "Regularly": 0.8, "Frequently": 1.0}
+DUR_SCORES = {"": 0.0, "Short": 0.6, "Brief": 0.7, "Medium": 0.8, "Long": 1.0}
+COPING_WEIGHTS = {"Exercise or physical activity": 1.0, "Journaling or writing": 0.5, "None": 0.0}
+SUBSTANCE_QUESTIONS = {
+    "Alcohol": {
+        "current_band": "8.05", "current_years": "8.06", "current_trend": "8.07",
+        "former_band": "8.25", "former_years": "8.24", "time_since_quit": "8.26",
+        "current_in_which": "Alcohol", "former_in_which": "Alcohol",
+    },
+    "Tobacco": {
+        "current_band": "8.09", "current_years": "8.10", "current_trend": "8.11",
+        "former_band": "8.29", "former_years": "8.28", "time_since_quit": "8.30",
+        "current_in_which": "Tobacco", "former_in_which": "Tobacco",
+    },
+}
+SUBSTANCE_WEIGHTS = {"Alcohol": 10, "Tobacco": 15}
+USE_BAND_SCORES = {"Heavy": 0.0, "Moderate": 0.25, "Light": 0.5, "Minimal": 0.75, "Occasional": 1.0}
+DURATION_SCORES = {"Less than 1 year": 1.0, "1-2 years": 0.8, "3-5 years": 0.6, "More than 20 years": 0.0}
+QUIT_TIME_BONUS = {"Less than 1 year": 0.05, "3-5 years": 0.1, "More than 10 years": 0.25}
+USAGE_TRENDS = ["I currently use more than I used to", "I currently use less than I used to"]
+
+
+# Per-row scorers as the survey runner applied them before vectorizing
+
+
+def score_movement_pillar(row, movement_questions):
+    movement_scores = {}
+    for move_type, cfg in movement_questions.items():
+        freq = FREQ_SCORES.get(row.get(cfg["freq_q"], ""), 0.0)
+        dur = DUR_SCORES.get(row.get(cfg["dur_q"], ""), 0.0)
+        for pillar, weight in cfg["pillar_weights"].items():
+            if freq == 0 and dur == 0:
+                movement_scores[(move_type, pillar)] = 0
+            elif freq + dur >= 1.6:
+                movement_scores[(move_type, pillar)] = weight
+            else:
+                movement_scores[(move_type, pillar)] = (freq + dur) * (weight / 2)
+    return movement_scores
+
+
+def score_sleep_issues(patient_answers):
+    reported = [x.strip() for x in str(patient_answers.get("4.12", "")).split("|") if x.strip()]
+    if not reported or any("none" in s.lower() for s in reported):
+        pillar_totals = {}
+        for _, _, pillar_wts in SLEEP_ISSUES:
+            for p, w in pillar_wts.items():
+                pillar_totals[p] = pillar_totals.get(p, 0.0) + w
+        return pillar_totals
+
+    pillar_scores = {}
+    for issue, freq_qid, pillar_wts in SLEEP_ISSUES:
+        if issue in reported:
+            mult = SLEEP_FREQ_MAP.get(str(patient_answers.get(freq_qid, "")).strip(), 0.2)
+        else:
+            mult = 1.0
+        for p, w in pillar_wts.items():
+            pillar_scores[p] = pillar_scores.get(p, 0.0) + (w * mult)
+    return pillar_scores
+
+
+def score_sleep_protocols(answer_str):
+    n = len([x.strip() for x in (answer_str or "").split("|") if x.strip()])
+    score = 1.0 if n >= 7 else 0.8 if n >= 5 else 0.6 if n >= 3 else 0.4 if n >= 1 else 0.2
+    return round(score * 9.0, 2)
+
+
+def coping_score(answer_str, coping_weights, stress_level_ans, freq_ans):
+    responses = [r.strip() for r in str(answer_str or "").split("|") if r.strip()]
+    has_none = any("none" in r.lower() for r in responses)
+    high_stress = (str(stress_level_ans).strip() in ["High stress", "Extreme stress"] or
+                   str(freq_ans).strip() in ["Frequently", "Always"])
+    if has_none or not responses:
+        return 0.0 if high_stress else 5.5
+    total_weight = sum(coping_weights.get(response, 0.5) for response in responses)
+    if not high_stress:
+        return min(5.5 + total_weight, 7.0)
+    return min(total_weight * 3.5, 7.0)
+
+
+def score_cognitive_activities(answer_str):
+    n = len([x.strip() for x in (answer_str or "").split("|") if x.strip()])
+    score = 1.0 if n >= 5 else 0.8 if n == 4 else 0.6 if n == 3 else 0.4 if n == 2 else 0.2 if n == 1 else 0.0
+    return round(score * 8.0, 2)
+
+
+def score_substance_use(use_band, years_band, is_current, usage_trend=None, time_since_quit=None):
+    band_level = use_band.split(":")[0].strip() if use_band else "Heavy"
+    base_score = min(USE_BAND_SCORES.get(band_level, 0.0), DURATION_SCORES.get(years_band, 0.0))
+    if not is_current:
+        quit_bonus = QUIT_TIME_BONUS.get(time_since_quit, 0.15) if time_since_quit else 0.15
+        base_score = min(base_score + quit_bonus, 1.0)
+    if is_current and usage_trend:
+        if usage_trend == USAGE_TRENDS[0]:
+            base_score = max(base_score - 0.1, 0.0)
+        elif usage_trend == USAGE_TRENDS[1]:
+            base_score = min(base_score + 0.1, 1.0)
+    return base_score
+
+
+def get_substance_score(patient_answers):
+    substance_scores = {}
+    for sub, qmap in SUBSTANCE_QUESTIONS.items():
+        current_list = [x.strip() for x in str(patient_answers.get("8.01", "")).split("|")]
+        former_list = [x.strip() for x in str(patient_answers.get("8.20", "")).split("|")]
+        is_current = qmap["current_in_which"] in current_list
+        is_former = (not is_current) and (qmap["former_in_which"] in former_list)
+        score = 1.0
+        if is_current:
+            score = score_substance_use(
+                patient_answers.get(qmap["current_band"], ""), patient_answers.get(qmap["current_years"], ""),
+                True, patient_answers.get(qmap["current_trend"], "")
+            )
+        elif is_former:
+            score = score_substance_use(
+                patient_answers.get(qmap["former_band"], ""), patient_answers.get(qmap["former_years"], ""),
+                False, time_since_quit=patient_answers.get(qmap["time_since_quit"], "")
+            )
+        substance_scores[sub] = score * SUBSTANCE_WEIGHTS[sub]
+    return substance_scores
+
+
+def random_survey(rows=300, seed=0):
+    """Random answers, including blanks, unknown answers and NaN."""
+    rng = np.random.default_rng(seed)
+
+    def pick(options):
+        return [options[i] for i in rng.integers(0, len(options), rows)]
+
+    def multi(options):
+        return ["|".join(rng.choice(options, rng.integers(0, len(options) + 1), replace=False)) for _ in range(rows)]
+
+    survey = pd.DataFrame({
+        "4.12": multi(["Difficulty falling asleep", "Snoring", "None", "Something else"]),
+        "4.07": multi([f"protocol {i}" for i in range(9)]),
+        "5.08": multi([f"activity {i}" for i in range(7)]),
+        "8.01": multi(list(SUBSTANCE_QUESTIONS) + ["Other"]),
+        "8.20": multi(list(SUBSTANCE_QUESTIONS) + ["Other"]),
+        "6.07": multi(list(COPING_WEIGHTS) + ["Other"]),
+        "6.01": pick(["Low stress", "High stress", "Extreme stress", ""]),
+        "6.02": pick(["Rarely", "Frequently", "Always", ""]),
+    })
+    for qid in ("4.13", "4.18"):
+        survey[qid] = pick(list(SLEEP_FREQ_MAP) + ["Unknown", " Rarely", np.nan])
+    for qid in ("3.04", "3.06"):
+        survey[qid] = pick(list(FREQ_SCORES) + ["Unknown", np.nan])
+    for qid in ("3.08", "3.10"):
+        survey[qid] = pick(list(DUR_SCORES) + ["Unknown", np.nan])
+    # The row scorer splits band answers, so those are blank rather than NaN
+    bands = [f"{level}: detail" for level in USE_BAND_SCORES] + ["Occasional", "", "Unknown"]
+    for qmap in SUBSTANCE_QUESTIONS.values():
+        survey[qmap["current_band"]] = pick(bands)
+        survey[qmap["former_band"]] = pick(bands)
+        survey[qmap["current_years"]] = pick(list(DURATION_SCORES) + ["", "Unknown", np.nan])
+        survey[qmap["former_years"]] = pick(list(DURATION_SCORES) + ["", np.nan])
+        survey[qmap["current_trend"]] = pick(USAGE_TRENDS + ["", "About the same", np.nan])
+        survey[qmap["time_since_quit"]] = pick(list(QUIT_TIME_BONUS) + ["", "Unknown", np.nan])
+    for qid in ("4.12", "6.07", "5.08", "8.01", "8.20"):
+        survey.loc[rng.random(rows) < 0.05, qid] = np.nan
+    return survey
+
+
+class TestMultiSelectEncoding:
+    """Test encoding pipe-delimited answers into bitsets."""
+
+    def test_bitsets(self):
+        """Test vocabulary order, counts and membership."""
+        column = encode_multi_select(
+            pd.Series(["b | a", "", np.nan, "c|a|b"]), vocabulary=("a", "b")
+        )
+
+        assert column.vocabulary == ("a", "b", "c")
+        assert list(column.bits) == [0b011, 0, 0, 0b111]
+        assert list(column.counts()) == [2, 0, 0, 3]
+        assert list(column.missing) == [False, False, True, False]
+        assert list(column.selected("c")) == [False, False, False, True]
+        assert list(column.weighted_sum({"a": 1.0, "c": 2.0}, default=0.5)) == [1.5, 0.0, 0.0, 3.5]
+
+    def test_wide_vocabulary_uses_matrix(self):
+        """Test that more than 64 options fall back to a boolean matrix."""
+        options = [f"option {i}" for i in range(70)]
+        column = encode_multi_select(pd.Series(["|".join(options), "option 69"]))
+
+        assert column.bits is None
+        assert list(column.counts()) == [70, 1]
+        assert list(column.selected("option 69")) == [True, True]
+
+    def test_popcount(self):
+        """Test popcount on full-width values."""
+        bits = np.array([0, 1, 0xFFFFFFFFFFFFFFFF, 0b1011], dtype=np.uint64)
+        assert list(popcount64(bits)) == [0, 1, 64, 3]
+
+
+class TestMultiSelectScorers:
+    """Test the population multi-select scorers."""
+
+    def test_sleep_issues(self):
+        """Test full credit, frequency scaling and unknown frequencies."""
+        survey = pd.DataFrame({
+            "4.12": ["None", np.nan, "Snoring", "Snoring|Difficulty falling asleep"],
+            "4.13": ["", "", "", "Always"],
+            "4.18": ["", "", "Rarely", np.nan],
+        })
+        column = encode_multi_select(survey["4.12"], [issue for issue, _, _ in SLEEP_ISSUES])
+        scores = score_sleep_issues_population(survey, column, SLEEP_ISSUES, SLEEP_FREQ_MAP)
+
+        assert np.allclose(scores["Sleep"], [9, 9, 5 + 4 * 0.8, 5 * 0.2 + 4 * 0.2])
+        assert np.allclose(scores["CoreCare"], [2, 2, 2 * 0.8, 2 * 0.2])
+
+    def test_count_scores(self):
+        """Test the selection-count tables for 4.07 and 5.08."""
+        answers = pd.Series(["", "a", "a|b|c", "|".join("abcdefgh")])
+        column = encode_multi_select(answers)
+
+        assert list(score_sleep_protocols_population(column)) == [1.8, 3.6, 5.4, 9.0]
+        assert list(score_cognitive_activities_population(column)) == [0.0, 1.6, 4.8, 8.0]
+
+    def test_coping(self):
+        """Test coping scores by stress level."""
+        weights = {"Exercise or physical activity": 1.0, "Journaling or writing": 0.5, "None": 0.0}
+        column = encode_multi_select(
+            pd.Series(["Exercise or physical activity|Journaling or writing", "None", "Exercise or physical activity", np.nan]),
+            tuple(weights)
+        )
+        scores = coping_score_population(
+            column, weights,
+            pd.Series(["Low stress", "High stress", "High stress", "Low stress"]),
+            pd.Series(["Rarely", "Rarely", "Rarely", "Rarely"])
+        )
+
+        assert np.allclose(scores, [7.0, 0.0, 3.5, 6.0])
+
+
+class TestScreeningDates:
+    """Test column-wise screening date scoring."""
+
+    def test_month_windows(self):
+        """Test window boundaries, the 1.5x band and unparseable answers."""
+        survey = pd.DataFrame({
+            "10.01": ["2025-01-31", "2024-10-01", "2024-09-30", "2024-07-15", "01/05/2025", np.nan, ""],
+        })
+        scores = score_screening_dates_population(survey, {"10.01": 6}, as_of="2025-07-01")
+
+        # 6 months, 9 months (int(6 * 1.5)), 10 months, 12 months
+        assert list(scores["10.01"]) == [1.0, 0.6, 0.2, 0.2, 0.0, 0.0, 0.0]
+        assert resolve_as_of_date("2025-07-01 13:45") == pd.Timestamp("2025-07-01")
+
+    def test_as_of_from_environment(self, monkeypatch):
+        """Test that WELLPATH_AS_OF_DATE pins the reference date."""
+        monkeypatch.setenv("WELLPATH_AS_OF_DATE", "2030-01-15")
+        survey = pd.DataFrame({"10.03": ["2029-06-01"]})
+
+        assert resolve_as_of_date() == pd.Timestamp("2030-01-15")
+        assert list(score_screening_dates_population(survey, {"10.03": 6})["10.03"]) == [0.6]
+
+    def test_windows_from_rules(self):
+        """Test per-patient windows by age and sex, with fallbacks."""
+        rules = load_screening_rules(SCREENING_RULES_FILE)
+        windows = screening_windows(
+            rules, {"10.04": 120, "10.05": 12, "10.07": 36, "10.08": 36},
+            ages=[40, 55, 62.5, 30], sexes=["female", "Female", "male", "M"]
+        )
+
+        assert list(windows["10.05"]) == [24, 12, 12, 12]
+        assert list(windows["10.04"]) == [120, 120, 120, 120]
+        assert list(windows["10.07"]) == [36, 36, 36, 36]
+        assert list(windows["10.08"]) == [36, 36, 36, 36]
+        assert "skin_check_male_female_all_ages_high" not in set(rules["screening_type"])
+
+
+class TestMovementAndSubstances:
+    """Test the table-driven movement and substance scorers."""
+
+    def test_movement(self):
+        """Test full credit, partial credit and unanswered questions."""
+        freq_scores = {"": 0.0, "Rarely": 0.4, "Frequently": 1.0}
+        dur_scores = {"": 0.0, "Short": 0.6, "Long": 1.0}
+        survey = pd.DataFrame({"3.04": ["Frequently", "Rarely", np.nan, "Unknown"],
+                               "3.08": ["Short", "Short", np.nan, "Long"]})
+        scores = score_movement_population(
+            survey, {"Cardio": {"freq_q": "3.04", "dur_q": "3.08", "pillar_weights": {"Movement": 16}}},
+            freq_scores, dur_scores
+        )
+
+        assert np.allclose(scores[("Cardio", "Movement")], [16, 8.0, 0, 8.0])
+        assert list(lookup_scores(["a", None, "c"], {"a": 1.0, "b": 2.0}, default=-1)) == [1.0, -1.0, -1.0]
+
+    def test_substances(self):
+        """Test current, former and never-used scoring."""
+        questions = {"Alcohol": {
+            "current_band": "8.05", "current_years": "8.06", "current_trend": "8.07",
+            "former_band": "8.25", "former_years": "8.24", "time_since_quit": "8.26",
+            "current_in_which": "Alcohol", "former_in_which": "Alcohol",
+        }}
+        survey = pd.DataFrame({
+            "8.01": ["Alcohol", "Alcohol", "", "", np.nan],
+            "8.20": ["", "", "Alcohol", "Alcohol", np.nan],
+            "8.05": ["Light: 1-2 drinks", "", "", "", ""],
+            "8.06": ["1-2 years", "Less than 1 year", "", "", ""],
+            "8.07": ["I currently use less than I used to", "I currently use more than I used to", "", "", ""],
+            "8.25": ["", "", "Moderate: weekly", "Occasional", ""],
+            "8.24": ["", "", "Less than 1 year", "Less than 1 year", ""],
+            "8.26": ["", "", "3-5 years", np.nan, ""],
+        })
+        current = encode_multi_select(survey["8.01"], ("Alcohol",))
+        former = encode_multi_select(survey["8.20"], ("Alcohol",))
+        scores = score_substances_population(
+            survey, current, former, questions, {"Alcohol": 10},
+            use_band_scores={"Heavy": 0.0, "Moderate": 0.25, "Light": 0.5, "Occasional": 1.0},
+            duration_scores={"Less than 1 year": 1.0, "1-2 years": 0.8},
+            quit_time_bonus={"3-5 years": 0.1}
+        )
+
+        # Light (0.5) + less use; missing band reads as Heavy; former + bonus; capped; never used
+        assert np.allclose(scores["Alcohol"], [6.0, 0.0, 3.5, 10.0, 10.0])
+
+
+class TestRowScorerParity:
+    """Test the population kernels against the per-row scorers on random surveys."""
+
+    def test_matches_row_scorers(self):
+        """Test that every row scores the same through both paths."""
+        survey = random_survey()
+        rows = survey.to_dict("records")
+
+        movement = score_movement_population(survey, MOVEMENT_QUESTIONS, FREQ_SCORES, DUR_SCORES)
+        for key, scores in movement.items():
+            assert np.allclose(scores, [score_movement_pillar(row, MOVEMENT_QUESTIONS)[key] for row in rows])
+
+        issues = encode_multi_select(survey["4.12"], [issue for issue, _, _ in SLEEP_ISSUES])
+        sleep = score_sleep_issues_population(survey, issues, SLEEP_ISSUES, SLEEP_FREQ_MAP)
+        for pillar, scores in sleep.items():
+            assert np.allclose(scores, [score_sleep_issues(row)[pillar] for row in rows])
+
+        protocols = score_sleep_protocols_population(encode_multi_select(survey["4.07"]))
+        assert list(protocols) == [score_sleep_protocols(row["4.07"]) for row in rows]
+
+        coping = coping_score_population(
+            encode_multi_select(survey["6.07"], tuple(COPING_WEIGHTS)), COPING_WEIGHTS,
+            survey["6.01"], survey["6.02"]
+        )
+        expected = [coping_score(row["6.07"], COPING_WEIGHTS, row["6.01"], row["6.02"]) for row in rows]
+        assert np.allclose(coping, expected)
+
+        cognitive = score_cognitive_activities_population(encode_multi_select(survey["5.08"]))
+        assert list(cognitive) == [
+            score_cognitive_activities(row["5.08"] if isinstance(row["5.08"], str) else "") for row in rows
+        ]
+
+        substances = score_substances_population(
+            survey,
+            encode_multi_select(survey["8.01"], tuple(SUBSTANCE_QUESTIONS)),
+            encode_multi_select(survey["8.20"], tuple(SUBSTANCE_QUESTIONS)),
+            SUBSTANCE_QUESTIONS, SUBSTANCE_WEIGHTS, USE_BAND_SCORES, DURATION_SCORES, QUIT_TIME_BONUS
+        )
+        for sub, scores in substances.items():
+            assert np.allclose(scores, [get_substance_score(row)[sub] for row in rows])
@@ -0,0 +1,154 @@
+"""
+Test suite for the unit conversion service.
+
+Tests the compiled unit table, scalar and array conversions and display formatting.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from core_systems.unit_conversion_service import (
+    UnitConversionService,
+    load_unit_table
+)
+
+UNITS_CSV = str(Path(__file__).parent.parent / "src" / "ref_csv_files_airtable" / "unit_standardization.csv")
+
+
+class TestCompiledUnitTable:
+    """Test the precomputed unit lookup tables."""
+
+    def test_base_units_by_type(self):
+        """Test unit type to base unit mapping."""
+        table = load_unit_table(UNITS_CSV)
+
+        assert table.base_units['volume'] == 'milliliter'
+        assert table.base_units['mass'] == 'kilogram'
+        assert table.base_units['temperature'] == 'celsius'
+
+    def test_factor_pairs(self):
+        """Test any-to-any linear factors within a unit type."""
+        table = load_unit_table(UNITS_CSV)
+
+        assert table.factor_pairs[('cup', 'milliliter')] == 236.588
+        assert abs(table.factor_pairs[('liter', 'cup')] - 1000 / 236.588) < 1e-12
+        assert ('cup', 'kilogram') not in table.factor_pairs
+        assert ('fahrenheit', 'celsius') not in table.factor_pairs
+
+    def test_table_is_shared(self):
+        """Test that services reuse one compiled table per CSV."""
+        assert UnitConversionService(UNITS_CSV).unit_table is UnitConversionService(UNITS_CSV).unit_table
+
+
+class TestScalarConversion:
+    """Test scalar conversions to and from base units."""
+
+    def test_linear_round_trip(self):
+        """Test linear conversion to base and back for display."""
+        converter = UnitConversionService(UNITS_CSV)
+
+        result = converter.convert_to_base(8, 'cup')
+        assert result['converted_value'] == 1892.704
+        assert result['base_unit'] == 'milliliter'
+        assert result['conversion_method'] == 'linear'
+
+        display = converter.convert_from_base(result['converted_value'], 'milliliter', 'cup')
+        assert display['value'] == 8.0
+        assert display['formatted_display'] == "8.0 cup"
+
+    def test_special_conversions(self):
+        """Test temperature and compound height conversions."""
+        converter = UnitConversionService(UNITS_CSV)
+
+        assert converter.convert_to_base(98.6, 'fahrenheit')['converted_value'] == 37.0
+        assert converter.convert_to_base("5'10\"", 'feet_inches')['converted_value'] == 177.8
+        assert converter.convert_from_base(177.8, 'centimeter', 'feet_inches')['value'] == "5'10\""
+
+    def test_convert_linear(self):
+        """Test direct conversion between two non-base units."""
+        converter = UnitConversionService(UNITS_CSV)
+
+        assert abs(converter.convert_linear(1, 'gallon', 'liter') - 3.78541) < 1e-9
+        assert converter.get_conversion_factor('celsius', 'fahrenheit') is None
+
+        try:
+            converter.convert_linear(1, 'cup', 'pound')
+            assert False, "Should have raised ValueError for incompatible units"
+        except ValueError:
+            pass
+
+    def test_unknown_unit(self):
+        """Test that unknown units are rejected."""
+        converter = UnitConversionService(UNITS_CSV)
+
+        try:
+            converter.convert_to_base(1, 'furlong')
+            assert False, "Should have raised ValueError for unknown unit"
+        except ValueError as e:
+            assert "Unknown unit" in str(e)
+
+
+class TestArrayConversion:
+    """Test vectorized array conversions."""
+
+    def test_linear_arrays_match_scalar(self):
+        """Test that array conversion agrees with the scalar path."""
+        converter = UnitConversionService(UNITS_CSV)
+        values = [8, 1.5, 0, 12]
+
+        base = converter.convert_array_to_base(values, 'cup', decimals=6)
+        expected = [converter.convert_to_base(v, 'cup')['converted_value'] for v in values]
+        assert base.tolist() == expected
+
+        display = converter.convert_array_from_base(base, 'milliliter', 'cup', decimals=2)
+        assert display.tolist() == [converter.convert_from_base(v, 'milliliter', 'cup')['value'] for v in base]
+
+    def test_temperature_arrays(self):
+        """Test vectorized temperature formulas."""
+        converter = UnitConversionService(UNITS_CSV)
+
+        celsius = converter.convert_array_to_base(np.array([98.6, 32.0]), 'fahrenheit', decimals=6)
+        assert celsius.tolist() == [37.0, 0.0]
+
+        fahrenheit = converter.convert_array_from_base(celsius, 'celsius', 'fahrenheit', decimals=2)
+        assert fahrenheit.tolist() == [98.6, 32.0]
+
+    def test_compound_height_arrays(self):
+        """Test bulk parsing and formatting of compound heights."""
+        converter = UnitConversionService(UNITS_CSV)
+
+        parsed = converter.convert_array_to_base(["5'10\"", "70", "5.5"], 'feet_inches', decimals=6)
+        assert parsed.tolist() == [177.8, 177.8, 167.64]
+
+        numeric = converter.convert_array_to_base(np.array([70, 5.5]), 'feet_inches', decimals=6)
+        assert numeric.tolist() == [177.8, 167.64]
+
+        heights = converter.convert_array_from_base([177.8, 167.64], 'centimeter', 'feet_inches')
+        assert heights.tolist() == ["5'10\"", "5'6\""]
+
+    def test_formatting_on_request(self):
+        """Test that formatted strings are produced only by format_display_array."""
+        converter = UnitConversionService(UNITS_CSV)
+
+        display = converter.convert_array_from_base([1892.704], 'milliliter', 'cup')
+        assert display.dtype == float
+        assert converter.format_display_array(display, 'cup') == ["8.0 cup"]
+
+    def test_display_plan(self):
+        """Test that a display plan reproduces convert_from_base for many values."""
+        converter = UnitConversionService(UNITS_CSV)
+
+        plan = converter.build_display_plan('celsius', 'fahrenheit')
+        assert (plan.factor, plan.offset, plan.symbol) == (9/5, 32.0, '°F')
+
+        plan = converter.build_display_plan('milliliter', 'fluid_ounce')
+        base_values = [250.0, 500.0, 1000.0]
+        display = plan.apply(base_values, decimals=2)
+        expected = [converter.convert_from_base(v, 'milliliter', 'fluid_ounce') for v in base_values]
+        assert display.tolist() == [e['value'] for e in expected]
+        assert plan.format(display) == [e['formatted_display'] for e in expected]
@@ -0,0 +1,108 @@
+"""
+Test suite for the unit conversion API endpoints.
+
+Tests metric history paging through the Flask test client: cursor round
+trips, rejected cursors and limits, and streamed responses.
+"""
+
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add the repository root to path so the API package resolves its relative imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.api.unit_conversion_endpoints import HISTORY_STREAM_THRESHOLD, create_app
+
+
+def make_entry(entry_id, minute):
+    timestamp = datetime(2024, 1, 1, 10, 0) + timedelta(minutes=minute)
+    return {
+        'entry_id': entry_id,
+        'user_id': 'user123',
+        'metric_id': 'dietary_water',
+        'base_value': 1000.0,
+        'base_unit': 'milliliter',
+        'original_value': 1000.0,
+        'original_unit': 'milliliter',
+        'scores': {},
+        'timestamp': timestamp.isoformat() + 'Z'
+    }
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app(metrics_db=str(tmp_path / "metrics.db"), config_poll_seconds=0)
+    yield app
+    app.extensions['wellpath'].close()
+
+
+def store_entries(app, count):
+    app.extensions['wellpath'].storage.store_metric_entries(
+        [make_entry(f"e{i:05d}", i) for i in range(count)]
+    )
+
+
+def history_url(**params):
+    query = '&'.join(f"{key}={value}" for key, value in params.items())
+    return f"/api/metrics/history/user123/dietary_water?display_unit=milliliter&{query}"
+
+
+class TestMetricHistoryEndpoint:
+    """Test paging metric history over HTTP."""
+
+    def test_cursor_round_trip(self, app):
+        """Test that following next_cursor walks every entry once, newest first."""
+        store_entries(app, 5)
+        client = app.test_client()
+
+        first = client.get(history_url(limit=2))
+        assert 'Content-Length' in first.headers
+
+        pages = []
+        response = first.get_json()
+        pages.append([entry['entry_id'] for entry in response['entries']])
+        while response['next_cursor'] is not None:
+            response = client.get(history_url(limit=2, cursor=response['next_cursor'])).get_json()
+            pages.append([entry['entry_id'] for entry in response['entries']])
+
+        assert pages == [['e00004', 'e00003'], ['e00002', 'e00001'], ['e00000']]
+
+    def test_invalid_cursor(self, app):
+        """Test that a malformed cursor is rejected."""
+        response = app.test_client().get(history_url(cursor='not-a-cursor'))
+
+        assert response.status_code == 400
+        assert 'Invalid cursor' in response.get_json()['error']
+
+    @pytest.mark.parametrize("limit", ["0", "-5", "ten"])
+    def test_invalid_limit(self, app, limit):
+        """Test that limits other than positive integers are rejected."""
+        store_entries(app, 3)
+        response = app.test_client().get(history_url(limit=limit))
+
+        assert response.status_code == 400
+        assert 'limit must be a positive integer' in response.get_json()['error']
+
+    def test_streamed_history(self, app):
+        """Test that a limit above HISTORY_STREAM_THRESHOLD streams a complete JSON body."""
+        limit = HISTORY_STREAM_THRESHOLD + 100
+        store_entries(app, limit + 5)
+        client = app.test_client()
+
+        response = client.get(history_url(limit=limit))
+        body = json.loads(response.get_data(as_text=True))
+
+        # Streamed bodies are sent without a Content-Length
+        assert 'Content-Length' not in response.headers
+        assert len(body['entries']) == limit
+        assert body['entries'][0]['entry_id'] == f"e{limit + 4:05d}"
+        assert body['entries'][0]['display_value'] == 1000
+
+        rest = client.get(history_url(limit=limit, cursor=body['next_cursor']))
+        rest_body = json.loads(rest.get_data(as_text=True))
+        assert [entry['entry_id'] for entry in rest_body['entries']] == [f"e{i:05d}" for i in range(4, -1, -1)]
+        assert rest_body['next_cursor'] is None
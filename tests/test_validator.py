@@ -0,0 +1,67 @@
+"""
+Test suite for the algorithm configuration validator.
+
+Tests compiled schema validation, the content-hash result cache and batch
+validation.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+jsonschema = pytest.importorskip("jsonschema")
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from validation.validator import AlgorithmValidator
+
+
+def make_config(threshold=2000, **schema):
+    return {
+        "method": "binary_threshold",
+        "schema": dict(schema, threshold=threshold, success_value=100, failure_value=0)
+    }
+
+
+class TestAlgorithmValidator:
+    """Test schema and business-rule validation."""
+
+    def test_schema_errors(self):
+        """Test that schema violations match jsonschema.validate."""
+        validator = AlgorithmValidator()
+        config = make_config(threshold="lots")
+
+        result = validator.validate_config(config)
+        with pytest.raises(jsonschema.ValidationError) as expected:
+            jsonschema.validate(config, validator.schemas["binary_threshold_schema"])
+
+        assert result["valid"] is False
+        assert result["errors"] == [f"Schema validation error: {expected.value.message}"]
+        assert validator.validate_config({"schema": {}})["errors"] == ["Missing 'method' field"]
+
+    def test_cached_results_are_copies(self):
+        """Test that equal configs share a cache entry without sharing results."""
+        validator = AlgorithmValidator()
+        first = validator.validate_config(make_config(measurement_type="binary"))
+        first["warnings"].append("changed by caller")
+
+        second = validator.validate_config({"schema": dict(make_config(measurement_type="binary")["schema"]),
+                                            "method": "binary_threshold"})
+
+        assert len(validator._result_cache) == 1
+        assert second["warnings"] == ["Binary measurement type should use boolean threshold"]
+
+    def test_batch_matches_single(self):
+        """Test that pooled batch validation matches validating one by one."""
+        configs = [make_config(threshold=i) for i in range(70)] + [make_config(threshold="x")]
+        batch = AlgorithmValidator().validate_multiple_configs(configs, workers=2)
+
+        validator = AlgorithmValidator()
+        assert batch["valid"] is False
+        assert batch["summary"]["invalid_configs"] == 1
+        for i, (config, result) in enumerate(zip(configs, batch["results"])):
+            expected = validator.validate_config(config)
+            expected["config_index"] = i
+            assert result == expected
@@ -0,0 +1,86 @@
+"""
+Test suite for the shared weekly allowance history.
+
+Tests ISO week numbering, bounded retention and multi-user rollover.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from algorithms import (
+    ConstrainedWeeklyAllowanceAlgorithm,
+    ConstrainedWeeklyAllowanceConfig,
+    WeeklyHistoryStore,
+    WeekRecord,
+    evaluate_weekly_allowances
+)
+from algorithms.weekly_history import iso_week_number, iso_week_identifier
+
+
+def rollover_config():
+    return ConstrainedWeeklyAllowanceConfig(
+        weekly_allowance=4, unit="drinks", rollover_enabled=True,
+        max_rollover_percentage=50.0, penalty_for_overage=25.0
+    )
+
+
+class TestWeeklyHistoryStore:
+    """Test week numbering and retention."""
+
+    def test_week_numbers(self):
+        """Test that consecutive ISO weeks are consecutive across years."""
+        assert iso_week_number("2025-W01") - iso_week_number("2024-W52") == 1
+        assert iso_week_number("2021-W01") - iso_week_number("2020-W53") == 1
+        assert iso_week_identifier(iso_week_number("2020-W53")) == "2020-W53"
+
+        algorithm = ConstrainedWeeklyAllowanceAlgorithm(rollover_config())
+        assert algorithm._get_previous_week_id("2025-W01") == "2024-W52"
+        assert algorithm._get_previous_week_id("not a week") == "unknown"
+
+    def test_retention(self):
+        """Test that old weeks are dropped per user and trends stay ordered."""
+        store = WeeklyHistoryStore(retention_weeks=3)
+        for week in (5, 1, 3, 4, 2):
+            store.put("a", f"2024-W{week:02d}", WeekRecord(week, 4, 0, 100))
+        store.put("b", "2024-W01", WeekRecord(1, 4, 0, 100))
+
+        assert [record.usage for _, record in store.recent("a", 10)] == [3, 4, 5]
+        assert store.get("a", "2024-W02") is None
+        assert store.get("b", "2024-W01") is not None
+        assert len(store) == 4
+
+        store.remove_user("a")
+        assert store.weeks("a") == [] and len(store) == 1
+
+
+class TestBatchAllowance:
+    """Test batch evaluation against a shared store."""
+
+    def test_batch_matches_per_user_instances(self):
+        """Test that batch rollover matches one algorithm per user."""
+        config = rollover_config()
+        weeks = {
+            "2024-W52": {"u1": [1, 0, 0, 0, 0, 0, 0], "u2": 6, "u3": [2, 2, 2, 0, 0, 0, 0]},
+            "2025-W01": {"u1": 6, "u2": [0, 0, 0, 0, 0, 0, 0], "u3": 5},
+        }
+
+        store = WeeklyHistoryStore()
+        per_user = {user: ConstrainedWeeklyAllowanceAlgorithm(config) for user in ("u1", "u2", "u3")}
+        for week, usage_by_user in weeks.items():
+            batch = evaluate_weekly_allowances(config, store, week, usage_by_user)
+            for user, usage in usage_by_user.items():
+                if isinstance(usage, list):
+                    expected = per_user[user].calculate_score(daily_values=usage, week_identifier=week)
+                else:
+                    expected = per_user[user].calculate_score(weekly_usage=usage, week_identifier=week)
+                assert batch[user] == expected
+
+        # u1 rolled over 2 unused drinks (capped at 50% of 4) into 2025-W01
+        assert batch["u1"]["available_allowance"] == 6
+        assert batch["u1"]["score"] == 100.0
+
+        shared = ConstrainedWeeklyAllowanceAlgorithm(config, history=store, user_id="u3")
+        assert [entry["week"] for entry in shared.get_usage_trend()] == ["2024-W52", "2025-W01"]
@@ -0,0 +1,51 @@
+"""
+Test suite for compiled zone lookup tables.
+
+Tests that table lookups keep the boundary semantics of the linear zone scans.
+"""
+
+import math
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from algorithms import create_daily_zone_based, create_sleep_duration_zones, ZoneBasedAlgorithm, ZoneBasedConfig
+from algorithms.sleep_composite import SleepCompositeAlgorithm, SleepCompositeConfig
+from algorithms.zone_table import ZoneTable
+
+
+class TestZoneTable:
+    """Test compiled zone lookups."""
+
+    def test_first_match_semantics(self):
+        """Test shared boundaries, gaps, overlaps and half-open zones."""
+        closed = ZoneTable([(0, 5, "low"), (5, 8, "mid"), (8.05, 10, "high"), (2, 9, "wide")], default="none")
+        assert [closed.score(v) for v in (5, 7.99, 8, 8.02, 9.5, 10.5, math.nan)] == [
+            "low", "mid", "mid", "wide", "high", "none", "none"
+        ]
+
+        half_open = ZoneTable([(0, 5, 1.0), (5, 8, 2.0)], include_max=False, default=None)
+        assert [half_open.score(v) for v in (0, 4.999, 5, 8)] == [1.0, 1.0, 2.0, None]
+        assert list(half_open.indices([0, 5, 8, math.nan, -1])) == [0, 1, -1, -1, -1]
+
+    def test_zone_algorithm_batch_matches_scalar(self):
+        """Test array scoring, including graduated zones, against calculate_score."""
+        values = [x / 4 for x in range(-4, 56)]
+        plain = create_daily_zone_based(zones=create_sleep_duration_zones(), unit="hours")
+        graduated = ZoneBasedAlgorithm(ZoneBasedConfig(
+            zones=create_sleep_duration_zones(), unit="hours", grace_range=True, boundary_handling="graduated"
+        ))
+
+        for algo in (plain, graduated):
+            assert algo.calculate_scores(values) == [algo.calculate_score(v) for v in values]
+        # Shared boundaries still belong to the lower zone
+        assert plain.calculate_score(7) == 60
+
+    def test_sleep_duration_fallbacks(self):
+        """Test half-open duration zones and the out-of-range fallbacks."""
+        algo = SleepCompositeAlgorithm(SleepCompositeConfig())
+        assert [algo._calculate_duration_score(h) for h in (6, 8.5, 9, 10, 24, 30)] == [
+            50.0, 100.0, 75.0, 25.0, 25.0, 25.0
+        ]